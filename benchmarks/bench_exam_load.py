@@ -0,0 +1,329 @@
+"""
+Load test: many students logging in and taking an exam at the same time.
+
+Builds a throwaway database with `--students` accounts and one exam, then
+runs every student through the real managers headlessly: AuthManager.login,
+ExamManager.get_exam_questions, a full take_exam driven by scripted answers
+(each answer checkpointed through the write-behind writer) and grading.
+Students run concurrently on threads (one shared process, like the exam
+server) or on processes (one engine each, like separate terminals).
+
+Reports p50/p95/p99 latency per operation and overall throughput, and can
+save them as JSON and compare against an earlier run.
+
+Usage:
+    python benchmarks/bench_exam_load.py [--students 50] [--questions 20]
+        [--mode threads|processes] [--concurrency 8] [--hash-cost 12]
+        [--output results.json] [--compare baseline.json]
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from src.auth.auth_manager import AuthManager
+from src.auth.password_hasher import PasswordHasher
+from src.auth.session_manager import SessionManager
+from src.exams.answer_writer import AnswerWriter
+from src.exams.exam_manager import ExamManager
+from src.exams.exam_session import ExamSessionManager
+from src.exams.exam_snapshot import SnapshotStore
+from src.exams.grading import AnswerKey, grade
+from src.exams.question import Question
+from src.storage.database_manager import DatabaseManager
+from src.user.user_manager import UserManager
+from src.utils.database_setup import apply_migrations
+
+EXAM_ID = 1
+PASSWORD = "correct horse battery staple"
+OPTIONS = ["a", "b", "c", "d"]
+OPERATIONS = ("login", "questions", "answer", "grade", "exam")
+
+
+class QuietLogger:
+    """Stands in for the file logger so the benchmark measures the managers."""
+
+    def debug(self, message, user=None): ...
+    def info(self, message, user=None): ...
+    def warning(self, message, user=None): ...
+    def error(self, message, user=None): ...
+
+
+class ScriptedUI:
+    """
+    Plays the terminal: `ask_input` returns the student's next scripted
+    answer, every display call is a no-op.
+    """
+
+    def __init__(self, answers: list[str]) -> None:
+        self._answers = iter(answers)
+
+    def ask_input(self, prompt: str) -> str:
+        return next(self._answers)
+
+    def confirm_action(self, message: str) -> bool:
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def build_database(directory: str, students: int, questions: int, hash_cost: int) -> str:
+    db_path = os.path.join(directory, "load.db")
+    hasher = PasswordHasher("scrypt", hash_cost, workers=os.cpu_count() or 1)
+    stored = hasher.hash(PASSWORD)
+    hasher.shutdown()
+
+    conn = sqlite3.connect(db_path)
+    apply_migrations(conn)
+    conn.executemany(
+        "INSERT INTO users (username, password, role) VALUES (?, ?, 'student')",
+        ((f"student{i}", stored) for i in range(students)),
+    )
+    conn.execute(
+        "INSERT INTO exams VALUES (?, 'Load test', '2025-01-01', 60, ?, 'admin')",
+        (EXAM_ID, questions),
+    )
+    options_json, options_packed = json.dumps(OPTIONS), Question.pack_options(OPTIONS)
+    conn.executemany(
+        "INSERT INTO questions "
+        "(question_id, text, options, options_packed, correct_answer, points, exam_id) "
+        "VALUES (?, ?, ?, ?, ?, 1, ?)",
+        (
+            (q, f"Question {q}", options_json, options_packed, q % len(OPTIONS), EXAM_ID)
+            for q in range(1, questions + 1)
+        ),
+    )
+    conn.execute(
+        "UPDATE id_sequences SET next_id = ? WHERE name = 'questions'", (questions + 1,)
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+class Harness:
+    """One engine: what a single application process would hold."""
+
+    def __init__(self, directory: str, db_path: str, hash_cost: int, workers: int) -> None:
+        self.directory = directory
+        self.logger = QuietLogger()
+        self.database_manager = DatabaseManager(database_path=db_path)
+        self.hasher = PasswordHasher("scrypt", hash_cost, workers)
+        self.user_manager = UserManager(None, self.database_manager, self.logger)
+        self.sessions = SessionManager(self.user_manager, self.database_manager)
+        self.writer = AnswerWriter(
+            self.database_manager,
+            os.path.join(directory, "answers.spool"),
+            fsync="never",
+        )
+        self.snapshots = SnapshotStore(os.path.join(directory, "snapshots"))
+        self.exam_manager = None
+        # Holds the question cache and ID allocator every student shares
+        self.exam_manager = self._exam_manager(None, None)
+        self.question_count = len(self.exam_manager.get_exam_questions(EXAM_ID))
+
+    def student(self, index: int) -> dict:
+        """Run one student through login and the exam; returns timings in seconds."""
+        timings: dict = {}
+        ui = ScriptedUI(
+            [str(random.randint(1, len(OPTIONS))) for _ in range(self.question_count)]
+        )
+
+        auth_manager = AuthManager(
+            ui, self.user_manager, self.logger, self.hasher, self.sessions
+        )
+        started = time.perf_counter()
+        if not auth_manager.login(f"student{index}", PASSWORD):
+            raise RuntimeError(f"Login failed for student{index}")
+        timings["login"] = time.perf_counter() - started
+
+        exam_manager = self._exam_manager(ui, auth_manager)
+        started = time.perf_counter()
+        questions = exam_manager.get_exam_questions(EXAM_ID)
+        timings["questions"] = time.perf_counter() - started
+
+        # Time each checkpointed answer as it goes through take_exam
+        answer_times = timings["answer"] = []
+        save_answer = exam_manager._save_answer
+
+        def timed_save(session, answer):
+            saved = time.perf_counter()
+            save_answer(session, answer)
+            answer_times.append(time.perf_counter() - saved)
+
+        exam_manager._save_answer = timed_save
+        graded = []
+        exam_manager._show_exam_results = lambda exam, qs, given: graded.append(given)
+        started = time.perf_counter()
+        exam_manager.take_exam(EXAM_ID)
+        timings["exam"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        grade(AnswerKey.from_questions(questions), [[a.user_answer for a in graded[0]]])
+        timings["grade"] = time.perf_counter() - started
+        return timings
+
+    def _exam_manager(self, ui, auth_manager) -> ExamManager:
+        exam_manager = ExamManager(
+            ui, None, self.user_manager, self.database_manager, self.logger, auth_manager
+        )
+        exam_manager.ui = ui
+        # Share the engine-wide pieces, as one process would
+        shared = self.exam_manager
+        if shared is not None:
+            exam_manager.question_cache = shared.question_cache
+            exam_manager.id_allocator = shared.id_allocator
+        exam_manager.snapshots = self.snapshots
+        exam_manager.answer_writer = self.writer
+        exam_manager.exam_sessions = ExamSessionManager(
+            self.database_manager, self.writer, exam_manager.id_allocator, exam_manager.analytics
+        )
+        return exam_manager
+
+    def close(self) -> None:
+        self.writer.close()
+        self.hasher.shutdown()
+        self.database_manager.close()
+
+
+# Per-process harness for --mode processes
+_harness = None
+
+
+def _init_process(directory: str, db_path: str, hash_cost: int) -> None:
+    global _harness
+    _harness = Harness(directory, db_path, hash_cost, workers=1)
+
+
+def _process_student(index: int) -> dict:
+    timings = _harness.student(index)
+    _harness.writer.flush()
+    return timings
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(runs: list[dict]) -> dict:
+    summary = {}
+    for operation in OPERATIONS:
+        values = []
+        for timings in runs:
+            value = timings[operation]
+            values.extend(value if isinstance(value, list) else [value])
+        values.sort()
+        summary[operation] = {
+            "count": len(values),
+            "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+        }
+    return summary
+
+
+def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = build_database(directory, args.students, args.questions, args.hash_cost)
+        started = time.perf_counter()
+        if args.mode == "threads":
+            harness = Harness(directory, db_path, args.hash_cost, args.concurrency)
+            try:
+                with ThreadPoolExecutor(args.concurrency) as pool:
+                    runs = list(pool.map(harness.student, range(args.students)))
+                harness.writer.flush()
+            finally:
+                harness.close()
+        else:
+            with ProcessPoolExecutor(
+                args.concurrency,
+                initializer=_init_process,
+                initargs=(directory, db_path, args.hash_cost),
+            ) as pool:
+                runs = list(pool.map(_process_student, range(args.students)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "benchmark": "exam_load",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "students": args.students,
+            "questions": args.questions,
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "hash_cost": args.hash_cost,
+        },
+        "elapsed_s": elapsed,
+        "throughput": {
+            "students_per_s": args.students / elapsed,
+            "answers_per_s": args.students * args.questions / elapsed,
+        },
+        "operations": summarize(runs),
+    }
+
+
+def report(results: dict, baseline: dict | None = None) -> None:
+    config = results["config"]
+    print(
+        f"{config['students']} students x {config['questions']} questions, "
+        f"{config['mode']} x {config['concurrency']}, scrypt cost {config['hash_cost']}"
+    )
+    header = f"{'operation':<12}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header + ("  p95 vs baseline" if baseline else ""))
+    for operation, stats in results["operations"].items():
+        line = (
+            f"{operation:<12}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+        before = (baseline or {}).get("operations", {}).get(operation)
+        if before and before["p95_ms"]:
+            line += f"  {(stats['p95_ms'] / before['p95_ms'] - 1) * 100:+.1f}%"
+        print(line)
+    throughput = results["throughput"]
+    print(
+        f"Throughput: {throughput['students_per_s']:.1f} students/s, "
+        f"{throughput['answers_per_s']:.0f} answers/s ({results['elapsed_s']:.2f}s total)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--mode", choices=("threads", "processes"), default="threads")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--hash-cost", type=int, default=12)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier results JSON to compare p95 against")
+    args = parser.parse_args()
+
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+    report(results, baseline)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
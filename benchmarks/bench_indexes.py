@@ -0,0 +1,121 @@
+"""
+Query latency before and after the secondary-index migration.
+
+Builds a throwaway database at schema version 1 (tables only), fills it with
+synthetic exams, questions and answers, times the hot lookups, then applies
+the remaining migrations and times them again.
+
+Usage:
+    python benchmarks/bench_indexes.py [--answers 1000000] [--repeat 200]
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+
+from src.utils.database_setup import apply_migrations
+
+EXAMS = 1000
+QUESTIONS_PER_EXAM = 50
+USERS = 20000
+
+QUERIES = {
+    "questions by exam": (
+        "SELECT * FROM questions WHERE exam_id = ?",
+        lambda: (random.randint(1, EXAMS),),
+    ),
+    "answers by user and exam": (
+        "SELECT * FROM answers WHERE user_id = ? AND exam_id = ?",
+        lambda: (f"user{random.randrange(USERS)}", random.randint(1, EXAMS)),
+    ),
+    "answers by exam and question": (
+        "SELECT COUNT(*) FROM answers WHERE exam_id = ? AND question_id = ?",
+        lambda: _exam_question(),
+    ),
+}
+
+
+def _exam_question() -> tuple[int, int]:
+    exam_id = random.randint(1, EXAMS)
+    return exam_id, (exam_id - 1) * QUESTIONS_PER_EXAM + random.randint(1, QUESTIONS_PER_EXAM)
+
+
+def populate(conn: sqlite3.Connection, answers: int) -> None:
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT INTO exams VALUES (?, ?, '2025-01-01', 60, ?, 'admin')",
+        ((i, f"Exam {i}", QUESTIONS_PER_EXAM) for i in range(1, EXAMS + 1)),
+    )
+    cursor.executemany(
+        "INSERT INTO questions VALUES (?, 'Question', '[\"a\", \"b\", \"c\", \"d\"]', 0, 1, ?)",
+        (
+            (q, (q - 1) // QUESTIONS_PER_EXAM + 1)
+            for q in range(1, EXAMS * QUESTIONS_PER_EXAM + 1)
+        ),
+    )
+    rng = random.Random(42)
+
+    def rows():
+        for answer_id in range(1, answers + 1):
+            question_id = rng.randint(1, EXAMS * QUESTIONS_PER_EXAM)
+            choice = rng.randrange(4)
+            yield (
+                answer_id,
+                question_id,
+                choice,
+                choice == 0,
+                (question_id - 1) // QUESTIONS_PER_EXAM + 1,
+                f"user{rng.randrange(USERS)}",
+                "2025-01-01T00:00:00",
+            )
+
+    cursor.executemany("INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+    conn.commit()
+
+
+def time_queries(conn: sqlite3.Connection, repeat: int) -> dict[str, float]:
+    """Return the mean latency in milliseconds for each query."""
+    results = {}
+    for name, (query, params) in QUERIES.items():
+        random.seed(7)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(query, params()).fetchall()
+        results[name] = (time.perf_counter() - started) / repeat * 1000
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--answers", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = sqlite3.connect(os.path.join(tmpdir, "bench.db"))
+        apply_migrations(conn, target=1)
+        print(f"Populating {args.answers:,} answer rows...")
+        populate(conn, args.answers)
+
+        before = time_queries(conn, args.repeat)
+        apply_migrations(conn)
+        after = time_queries(conn, args.repeat)
+        conn.close()
+
+    print(f"{'query':<32}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in QUERIES:
+        print(
+            f"{name:<32}{before[name]:>14.3f}{after[name]:>14.3f}"
+            f"{before[name] / after[name]:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Login throughput of the password hasher at different cost settings.
+
+For each cost, hashes one password and then verifies it `--logins` times
+through the hasher's worker pool, as a burst of simultaneous logins would.
+
+Usage:
+    python benchmarks/bench_password_hashing.py [--scheme scrypt] [--costs 12 13 14]
+        [--workers 4] [--logins 64] [--calibrate 0.1]
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import time
+
+from src.auth.password_hasher import SCHEMES, PasswordHasher
+
+
+def logins_per_second(scheme: str, cost: int, workers: int, logins: int) -> float:
+    hasher = PasswordHasher(scheme, cost, workers)
+    try:
+        stored = hasher.hash("correct horse battery staple")
+        started = time.perf_counter()
+        futures = [
+            hasher.submit_verify("correct horse battery staple", stored)
+            for _ in range(logins)
+        ]
+        if not all(future.result() for future in futures):
+            raise RuntimeError("Verification failed")
+        return logins / (time.perf_counter() - started)
+    finally:
+        hasher.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scheme", choices=SCHEMES, default="scrypt")
+    parser.add_argument("--costs", type=int, nargs="+", default=[12, 13, 14, 15])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument(
+        "--calibrate",
+        type=float,
+        metavar="SECONDS",
+        help="also report the lowest cost taking at least this long per hash",
+    )
+    args = parser.parse_args()
+
+    print(f"scheme={args.scheme} workers={args.workers} logins={args.logins}")
+    print(f"{'cost':>10}{'logins/sec':>14}{'ms/login':>12}")
+    for cost in args.costs:
+        rate = logins_per_second(args.scheme, cost, args.workers, args.logins)
+        print(f"{cost:>10}{rate:>14.1f}{1000 / rate:>12.1f}")
+
+    if args.calibrate:
+        cost = PasswordHasher.calibrate(args.scheme, args.calibrate)
+        print(f"Calibrated cost for {args.calibrate * 1000:.0f} ms per hash: {cost}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Question load time for one exam across option encodings.
+
+Loads every question of a single exam, the query behind exam start, with
+options stored as a JSON array (the original `options` column), as the
+packed `options_packed` column, and in a normalized one-row-per-option
+table joined back to the questions.
+
+Usage:
+    python benchmarks/bench_question_options.py [--questions 500] [--options 4] [--repeat 200]
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from itertools import groupby
+
+from src.exams.question import Question
+from src.utils.database_setup import apply_migrations
+
+NORMALIZED_TABLE = """
+CREATE TABLE question_options (
+    question_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (question_id, position)
+) WITHOUT ROWID
+"""
+
+
+def populate(conn: sqlite3.Connection, questions: int, options: int) -> None:
+    conn.execute("INSERT INTO exams VALUES (1, 'Exam', '2025-01-01', 60, ?, 'admin')", (questions,))
+    rows = [
+        (
+            q,
+            f"Question {q}: which of these is right?",
+            [f"Answer {o} to question {q}" for o in range(options)],
+        )
+        for q in range(1, questions + 1)
+    ]
+    conn.executemany(
+        "INSERT INTO questions "
+        "(question_id, text, options, options_packed, correct_answer, points, exam_id) "
+        "VALUES (?, ?, ?, ?, 0, 1, 1)",
+        ((q, text, json.dumps(opts), Question.pack_options(opts)) for q, text, opts in rows),
+    )
+    conn.execute(NORMALIZED_TABLE)
+    conn.executemany(
+        "INSERT INTO question_options VALUES (?, ?, ?)",
+        ((q, position, text) for q, _, opts in rows for position, text in enumerate(opts)),
+    )
+    conn.commit()
+
+
+def load_json(conn: sqlite3.Connection) -> list:
+    rows = conn.execute("SELECT question_id, text, options FROM questions WHERE exam_id = 1")
+    return [(q, text, json.loads(options)) for q, text, options in rows]
+
+
+def load_packed(conn: sqlite3.Connection) -> list:
+    rows = conn.execute(
+        "SELECT question_id, text, options_packed, options FROM questions WHERE exam_id = 1"
+    )
+    return [(q, text, Question.unpack_options(packed, options)) for q, text, packed, options in rows]
+
+
+def load_normalized(conn: sqlite3.Connection) -> list:
+    rows = conn.execute(
+        "SELECT q.question_id, q.text, o.text FROM questions q "
+        "JOIN question_options o ON o.question_id = q.question_id "
+        "WHERE q.exam_id = 1 ORDER BY q.question_id, o.position"
+    )
+    return [
+        (q, text, [row[2] for row in group])
+        for (q, text), group in groupby(rows, key=lambda row: (row[0], row[1]))
+    ]
+
+
+ENCODINGS = {"json": load_json, "packed": load_packed, "normalized": load_normalized}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=500)
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = sqlite3.connect(os.path.join(tmpdir, "bench.db"))
+        apply_migrations(conn)
+        populate(conn, args.questions, args.options)
+
+        expected = load_json(conn)
+        print(f"{args.questions} questions x {args.options} options, best of {args.repeat} loads")
+        for name, load in ENCODINGS.items():
+            assert load(conn) == expected, name
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                load(conn)
+                best = min(best, time.perf_counter() - started)
+            print(f"  {name:<12}{best * 1000:8.3f} ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,25 @@
-from src.interface.navigation import Navigation
-from src.utils.database_setup import setup_database
+import sys
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Scripted use: run one command without the interactive UI
+        from src.interface.cli import main as cli_main
+
+        return cli_main(argv)
+
+    from src.interface.navigation import Navigation
+    from src.utils.database_setup import setup_database
+
     # Set up the database if needed
     setup_database()
 
     # Initialize the Navigation class
     navigation = Navigation()
     navigation.start()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,14 +1,17 @@
 from src.user.user import User
+from src.auth.password_hasher import PasswordHasher
 import hashlib
 
 class Auth:
-    def __init__(self, user: User, password: str) -> None:
+    def __init__(self, user: User, password: str, hasher: PasswordHasher) -> None:
         self.user: User = user
-        self._password_hash: str = self._hash_password(password)
+        self._password: str = password
+        self._hasher: PasswordHasher = hasher
 
     def check_password(self, stored_hash: str) -> bool:
-        return self._password_hash == stored_hash
-    
+        return self._hasher.verify(self._password, stored_hash)
+
     @staticmethod
     def _hash_password(password: str) -> str:
-        return hashlib.sha256(password.encode()).hexdigest()
\ No newline at end of file
+        """Legacy unsalted SHA-256, still accepted by PasswordHasher.verify."""
+        return hashlib.sha256(password.encode()).hexdigest()
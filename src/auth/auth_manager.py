@@ -1,43 +1,119 @@
 from src.user.user import User
 from src.auth.auth import Auth
+from src.auth.password_hasher import PasswordHasher
+from src.auth.session_manager import Session, SessionManager
 from src.user.user_manager import UserManager
+from src.utils.config import get_config
 from src.utils.logger import Logger
 from src.interface.ui_manager import UIManager
 
 
 class AuthManager:
-    def __init__(self, ui_manager: UIManager, user_manager: UserManager, logger: Logger) -> None:
+    def __init__(
+        self,
+        ui_manager: UIManager,
+        user_manager: UserManager,
+        logger: Logger,
+        password_hasher: PasswordHasher | None = None,
+        session_manager: SessionManager | None = None,
+    ) -> None:
         self._ui_manager: UIManager = ui_manager
         self._user_manager: UserManager = user_manager
         self._logger: Logger = logger
+        self._hasher: PasswordHasher = password_hasher or PasswordHasher.from_settings(
+            get_config().section("AUTH")
+        )
+        self._sessions: SessionManager = session_manager or SessionManager(
+            user_manager,
+            user_manager.database,
+            **get_config().section("SESSIONS"),
+        )
+        self._session: Session | None = None
         self._current_user: User | None = None
         self._is_authenticated: bool = False
         self._logger.debug("AuthManager initialized")
 
     def login(self, username: str, password: str) -> bool:
         self._logger.debug(f"Attempting to fetch user: {username}")
-        user: User | None = self._user_manager.get_user(username)
+        # Another process may have changed the password or removed the user
+        user: User | None = self._sessions.get_user(username, cached=False)
         if not user:
             self._logger.warning(f"User not found: {username}")
             return False
 
-        auth = Auth(user, password)
+        auth = Auth(user, password, self._hasher)
         if auth.check_password(user._password_hash):
+            if self._hasher.needs_rehash(user._password_hash):
+                self._upgrade_password_hash(user, password)
             self._current_user = user
             self._is_authenticated = True
+            self._session = self._sessions.create(user)
             self._logger.info(f"User authenticated: {username}")
             return True
 
         self._logger.warning(f"Invalid password for user: {username}")
         return False
 
+    def _upgrade_password_hash(self, user: User, password: str) -> None:
+        """Re-hash a verified password with the current scheme and cost."""
+        try:
+            new_hash = self._hasher.hash(password)
+            self._user_manager.update_user(user.username, password=new_hash)
+            user._password_hash = new_hash
+            self._logger.info(f"Upgraded password hash for user: {user.username}")
+        except Exception as e:
+            # The login itself succeeded; try again next time
+            self._logger.error(f"Could not upgrade password hash for {user.username}: {e}")
+
+    def resume_session(self, token: str) -> bool:
+        """Log in with the token of an existing session instead of a password."""
+        session = self._sessions.resume(token)
+        user = self._sessions.get_user(session.username) if session else None
+        if not user:
+            self._logger.warning("Session token rejected")
+            return False
+        self._session = session
+        self._current_user = user
+        self._is_authenticated = True
+        self._logger.info(f"Session resumed: {user.username}")
+        return True
+
+    @property
+    def session_token(self) -> str | None:
+        """Token of the current session, for handing to another process."""
+        return self._session.token if self._session else None
+
+    def has_role(self, role: str) -> bool:
+        """
+        Checks the current user's role against the session's cached user.
+
+        Free while the cache is warm; picks up role changes once UserManager
+        invalidates the user, and fails once the session expires or the user
+        is deleted.
+        """
+        if not self._session:
+            return False
+        user = self._sessions.user_for(self._session.token)
+        if user is None:
+            self._current_user = None
+            self._session = None
+            self._is_authenticated = False
+            return False
+        self._current_user = user
+        return user.role == role
+
     def get_current_user(self) -> User | None:
         """Returns the currently logged-in user."""
         return self._current_user
 
     def logout(self):
         """Logs out the current user."""
+        if self._session:
+            self._sessions.revoke(self._session.token)
+            self._session = None
         self._current_user = None
         self._is_authenticated = False
         self._logger.info("User logged out")
-        self.ui_manager.show_success_notification("You have logged out.")
+        # Server connections have no terminal to notify
+        if self._ui_manager is not None:
+            self._ui_manager.show_success_notification("You have logged out.")
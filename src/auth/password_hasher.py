@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+SCHEMES = ("scrypt", "pbkdf2_sha256")
+SALT_BYTES = 16
+
+
+class PasswordHasher:
+    """
+    Salted, tunable password hashing on a bounded worker pool.
+
+    Hashes are stored as ``scheme$cost$salt$digest`` (hex salt and digest).
+    For scrypt the cost is log2(N) with r=8, p=1; for pbkdf2_sha256 it is the
+    iteration count. Bare 64-character hex strings are treated as the legacy
+    unsalted SHA-256 format so existing accounts can still log in and be
+    upgraded with `needs_rehash`.
+
+    hashlib runs scrypt and PBKDF2 without holding the GIL, so a thread pool
+    spreads hashes over all cores; `workers` caps how many run at once, which
+    keeps a login storm from exhausting memory with scrypt.
+    """
+
+    def __init__(self, scheme: str = "scrypt", cost: int = 14, workers: int = 4) -> None:
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password hashing scheme: {scheme}")
+        self.scheme = scheme
+        self.cost = cost
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+
+    @classmethod
+    def from_settings(cls, settings: dict):
+        return cls(settings["scheme"], settings["cost"], settings["workers"])
+
+    # ----- Pooled API -----
+    def submit_hash(self, password: str) -> Future:
+        return self._executor.submit(self._hash_now, password)
+
+    def submit_verify(self, password: str, stored_hash: str) -> Future:
+        return self._executor.submit(self._verify_now, password, stored_hash)
+
+    def hash(self, password: str) -> str:
+        """Hash a password with a fresh salt at the configured cost."""
+        return self.submit_hash(password).result()
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        """Check a password against any supported stored hash format."""
+        return self.submit_verify(password, stored_hash).result()
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """True if the stored hash is legacy or uses a different scheme/cost."""
+        parts = stored_hash.split("$")
+        return len(parts) != 4 or parts[0] != self.scheme or parts[1] != str(self.cost)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    # ----- Tuning -----
+    @classmethod
+    def calibrate(cls, scheme: str = "scrypt", target_seconds: float = 0.1) -> int:
+        """Return the lowest cost whose single hash takes at least target_seconds."""
+        cost = 10 if scheme == "scrypt" else 10_000
+        while True:
+            started = time.perf_counter()
+            _derive(scheme, cost, "calibration", os.urandom(SALT_BYTES))
+            if time.perf_counter() - started >= target_seconds:
+                return cost
+            cost = cost + 1 if scheme == "scrypt" else cost * 2
+
+    # ----- Workers -----
+    def _hash_now(self, password: str) -> str:
+        salt = os.urandom(SALT_BYTES)
+        digest = _derive(self.scheme, self.cost, password, salt)
+        return f"{self.scheme}${self.cost}${salt.hex()}${digest.hex()}"
+
+    @staticmethod
+    def _verify_now(password: str, stored_hash: str) -> bool:
+        parts = stored_hash.split("$")
+        if len(parts) == 1:
+            # Legacy unsalted SHA-256
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(candidate.encode(), stored_hash.encode())
+        if len(parts) != 4 or parts[0] not in SCHEMES:
+            return False
+        scheme, cost, salt, digest = parts
+        try:
+            candidate = _derive(scheme, int(cost), password, bytes.fromhex(salt))
+        except (ValueError, OverflowError, MemoryError):
+            # A corrupt stored hash fails the login rather than crashing it
+            return False
+        return hmac.compare_digest(candidate.hex().encode(), digest.encode())
+
+
+def _derive(scheme: str, cost: int, password: str, salt: bytes) -> bytes:
+    if scheme == "scrypt":
+        n, r = 2**cost, 8
+        return hashlib.scrypt(
+            password.encode(), salt=salt, n=n, r=r, p=1, maxmem=256 * n * r, dklen=32
+        )
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, cost)
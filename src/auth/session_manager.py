@@ -0,0 +1,181 @@
+import hashlib
+import secrets
+import threading
+import time
+from datetime import datetime
+
+from src.user.user import User
+from src.user.user_manager import UserManager
+from src.storage.database_manager import DatabaseManager
+
+
+class Session:
+    """An authenticated login, identified by an opaque token."""
+
+    __slots__ = ("token", "username", "expires_at")
+
+    def __init__(self, token: str, username: str, expires_at: float) -> None:
+        self.token = token
+        self.username = username
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return f"Session({self.username}, expires {datetime.fromtimestamp(self.expires_at)})"
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class SessionManager:
+    """
+    Issues session tokens and caches the users behind them.
+
+    Users (and so their roles) are cached in memory for `user_cache_ttl`
+    seconds, so repeated lookups and role checks don't touch the database.
+    UserManager notifies the manager when a user is updated or deleted, which
+    drops the cached copy and, on deletion, revokes that user's sessions.
+    Those notifications only reach this process, so logins read the user
+    with `cached=False` and always check the stored password hash.
+
+    With `persist` enabled, sessions are also written to the `sessions` table
+    (tokens are stored as SHA-256 digests), so another process can resume
+    them with `resume`.
+    """
+
+    def __init__(
+        self,
+        user_manager: UserManager,
+        database_manager: DatabaseManager,
+        ttl: float = 3600,
+        user_cache_ttl: float = 300,
+        persist: bool = True,
+    ) -> None:
+        self._user_manager = user_manager
+        self._database_manager = database_manager
+        self.ttl = ttl
+        self.user_cache_ttl = user_cache_ttl
+        self.persist = persist
+        self._sessions: dict[str, Session] = {}
+        # username -> (user, time cached)
+        self._users: dict[str, tuple[User, float]] = {}
+        self._lock = threading.Lock()
+        self.user_cache_hits = 0
+        self.user_cache_misses = 0
+        user_manager.add_change_listener(self._on_user_changed)
+
+    # ----- Users -----
+    def get_user(self, username: str, cached: bool = True) -> User | None:
+        """
+        Return a user, from the cache when it is fresh enough.
+
+        Args:
+            username: The user to look up
+            cached: False to read the database and refresh the cached copy
+        """
+        with self._lock:
+            entry = self._users.get(username)
+            if (
+                cached
+                and entry is not None
+                and time.monotonic() - entry[1] < self.user_cache_ttl
+            ):
+                self.user_cache_hits += 1
+                return entry[0]
+            self.user_cache_misses += 1
+
+        user = self._user_manager.get_user(username)
+        with self._lock:
+            if user is not None:
+                self._users[username] = (user, time.monotonic())
+            else:
+                self._users.pop(username, None)
+        return user
+
+    def invalidate_user(self, username: str) -> None:
+        with self._lock:
+            self._users.pop(username, None)
+
+    # ----- Sessions -----
+    def create(self, user: User) -> Session:
+        """Start a session for an authenticated user."""
+        session = Session(secrets.token_urlsafe(32), user.username, time.time() + self.ttl)
+        with self._lock:
+            self._sessions[session.token] = session
+            self._users[user.username] = (user, time.monotonic())
+        if self.persist:
+            with self._database_manager as db:
+                # Sweep sessions nobody came back for
+                db.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+                db.execute(
+                    "INSERT INTO sessions (token_hash, username, expires_at) VALUES (?, ?, ?)",
+                    (self._digest(session.token), session.username, session.expires_at),
+                )
+        return session
+
+    def get(self, token: str) -> Session | None:
+        """Return the live session for a token, or None if unknown or expired."""
+        with self._lock:
+            session = self._sessions.get(token)
+        if session is None:
+            return None
+        if session.expired:
+            self.revoke(token)
+            return None
+        return session
+
+    def resume(self, token: str) -> Session | None:
+        """Pick up a session created by another (possibly restarted) process."""
+        session = self.get(token)
+        if session is not None or not self.persist:
+            return session
+
+        with self._database_manager as db:
+            db.execute(
+                "SELECT username, expires_at FROM sessions WHERE token_hash = ?",
+                (self._digest(token),),
+            )
+            row = db.fetchone()
+        if row is None:
+            return None
+        session = Session(token, row[0], row[1])
+        if session.expired:
+            self.revoke(token)
+            return None
+        with self._lock:
+            self._sessions[token] = session
+        return session
+
+    def revoke(self, token: str) -> None:
+        with self._lock:
+            self._sessions.pop(token, None)
+        if self.persist:
+            with self._database_manager as db:
+                db.execute(
+                    "DELETE FROM sessions WHERE token_hash = ?", (self._digest(token),)
+                )
+
+    def revoke_user(self, username: str) -> None:
+        """End every session belonging to a user."""
+        with self._lock:
+            for token in [t for t, s in self._sessions.items() if s.username == username]:
+                del self._sessions[token]
+        if self.persist:
+            with self._database_manager as db:
+                db.execute("DELETE FROM sessions WHERE username = ?", (username,))
+
+    def user_for(self, token: str) -> User | None:
+        """The (cached) user behind a live session."""
+        session = self.get(token)
+        if session is None:
+            return None
+        return self.get_user(session.username)
+
+    def _on_user_changed(self, username: str, deleted: bool) -> None:
+        self.invalidate_user(username)
+        if deleted:
+            self.revoke_user(username)
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
@@ -1,4 +1,5 @@
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional, Union
 from datetime import datetime
 
 
@@ -13,8 +14,23 @@ class Answer:
         is_correct (bool): Whether the answer is correct
         timestamp (datetime): When the answer was submitted
         user_id (str): Username of the user who submitted the answer
+        session_id (int): Exam session (attempt) the answer belongs to, if any
+
+    The timestamp is kept as a POSIX float until it is first read, so
+    recording an answer doesn't have to build a datetime.
     """
 
+    __slots__ = (
+        "answer_id",
+        "question_id",
+        "user_answer",
+        "is_correct",
+        "exam_id",
+        "user_id",
+        "session_id",
+        "_timestamp",
+    )
+
     def __init__(
         self,
         answer_id: int,
@@ -23,7 +39,8 @@ class Answer:
         is_correct: bool,
         exam_id: int,
         user_id: str,
-        timestamp: datetime = None,
+        timestamp: Union[datetime, float, None] = None,
+        session_id: Optional[int] = None,
     ) -> None:
         self.answer_id = answer_id
         self.question_id = question_id
@@ -31,7 +48,25 @@ class Answer:
         self.is_correct = is_correct
         self.exam_id = exam_id
         self.user_id = user_id
-        self.timestamp = timestamp or datetime.now()
+        self.session_id = session_id
+        self._timestamp = timestamp if timestamp is not None else time.time()
+
+    @property
+    def timestamp(self) -> datetime:
+        if not isinstance(self._timestamp, datetime):
+            self._timestamp = datetime.fromtimestamp(self._timestamp)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: Union[datetime, float]) -> None:
+        self._timestamp = value
+
+    @property
+    def epoch(self) -> float:
+        """The timestamp as a POSIX float, without building a datetime."""
+        if isinstance(self._timestamp, datetime):
+            return self._timestamp.timestamp()
+        return self._timestamp
 
     def __repr__(self) -> str:
         return f"Answer({self.answer_id}, Q:{self.question_id}, {'✓' if self.is_correct else '✗'})"
@@ -52,6 +87,7 @@ class Answer:
             exam_id=data["exam_id"],
             user_id=data["user_id"],
             timestamp=timestamp,
+            session_id=data.get("session_id"),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -64,4 +100,5 @@ class Answer:
             "exam_id": self.exam_id,
             "user_id": self.user_id,
             "timestamp": self.timestamp.isoformat(),
+            "session_id": self.session_id,
         }
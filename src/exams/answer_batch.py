@@ -0,0 +1,194 @@
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+from .answer import Answer
+from .attempts import AttemptTracker
+
+# Stored in the session_ids column for answers saved before sessions existed
+NO_SESSION = -1
+
+
+class AnswerBatch:
+    """
+    Columnar store for many answers, e.g. a whole exam cohort held for scoring.
+
+    Each field lives in its own typed `array` instead of one Python object per
+    answer. Usernames are interned in a lookup table and stored as indexes.
+    Rows can still be read back as `Answer` objects when needed.
+
+    Regrading and the results aggregates load an exam's answers with
+    `add_rows` and group them into attempts with `attempts`.
+    """
+
+    __slots__ = (
+        "answer_ids",
+        "question_ids",
+        "user_answers",
+        "is_correct",
+        "exam_ids",
+        "user_indexes",
+        "timestamps",
+        "session_ids",
+        "users",
+        "_user_lookup",
+    )
+
+    def __init__(self, answers: Optional[Iterable[Answer]] = None) -> None:
+        self.answer_ids = array("q")
+        self.question_ids = array("q")
+        self.user_answers = array("h")
+        self.is_correct = array("b")
+        self.exam_ids = array("q")
+        self.user_indexes = array("l")
+        self.timestamps = array("d")
+        self.session_ids = array("q")
+        self.users: list[str] = []
+        self._user_lookup: dict[str, int] = {}
+        if answers is not None:
+            self.extend(answers)
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def __getitem__(self, index: int) -> Answer:
+        return Answer(
+            answer_id=self.answer_ids[index],
+            question_id=self.question_ids[index],
+            user_answer=self.user_answers[index],
+            is_correct=bool(self.is_correct[index]),
+            exam_id=self.exam_ids[index],
+            user_id=self.users[self.user_indexes[index]],
+            timestamp=self.timestamps[index],
+            session_id=self.session_id(index),
+        )
+
+    def __iter__(self) -> Iterator[Answer]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def session_id(self, index: int) -> Optional[int]:
+        session_id = self.session_ids[index]
+        return None if session_id == NO_SESSION else session_id
+
+    def add(
+        self,
+        answer_id: int,
+        question_id: int,
+        user_answer: int,
+        is_correct: bool,
+        exam_id: int,
+        user_id: str,
+        timestamp: Union[float, str],
+        session_id: Optional[int] = None,
+    ) -> None:
+        """Append one answer given as plain values (e.g. a database row)."""
+        if isinstance(timestamp, str):
+            # As stored in the answers table
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        user_index = self._user_lookup.get(user_id)
+        if user_index is None:
+            user_index = len(self.users)
+            self.users.append(user_id)
+            self._user_lookup[user_id] = user_index
+        self.answer_ids.append(answer_id)
+        self.question_ids.append(question_id)
+        self.user_answers.append(user_answer)
+        self.is_correct.append(bool(is_correct))
+        self.exam_ids.append(exam_id)
+        self.user_indexes.append(user_index)
+        self.timestamps.append(timestamp)
+        self.session_ids.append(NO_SESSION if session_id is None else session_id)
+
+    def append(self, answer: Answer) -> None:
+        self.add(
+            answer.answer_id,
+            answer.question_id,
+            answer.user_answer,
+            answer.is_correct,
+            answer.exam_id,
+            answer.user_id,
+            answer.epoch,
+            answer.session_id,
+        )
+
+    def extend(self, answers: Iterable[Answer]) -> None:
+        for answer in answers:
+            self.append(answer)
+
+    def add_rows(self, rows: Iterable[Sequence]) -> None:
+        """
+        Append answers table rows.
+
+        Args:
+            rows: (answer_id, question_id, user_answer, is_correct, exam_id,
+                user_id, timestamp, session_id) per answer, the column order
+                the answer writer inserts
+        """
+        for row in rows:
+            self.add(*row)
+
+    def attempts(self, include: Optional[Sequence[bool]] = None) -> tuple[array, list[int]]:
+        """
+        Group the rows into attempts as `AttemptTracker` defines them.
+
+        Each user's session-less rows must be in the order they were saved.
+
+        Args:
+            include: Per row, whether it counts; excluded rows belong to no attempt
+
+        Returns:
+            (attempt number of each row, or -1 if excluded; first row of each attempt)
+        """
+        tracker = AttemptTracker()
+        numbers: dict[tuple, int] = {}
+        attempt_of = array("l")
+        first_rows: list[int] = []
+        for index in range(len(self)):
+            if include is not None and not include[index]:
+                attempt_of.append(-1)
+                continue
+            key = tracker.key(
+                self.users[self.user_indexes[index]],
+                self.session_id(index),
+                self.question_ids[index],
+            )
+            number = numbers.get(key)
+            if number is None:
+                number = numbers[key] = len(first_rows)
+                first_rows.append(index)
+            attempt_of.append(number)
+        return attempt_of, first_rows
+
+    def correct_count(self) -> int:
+        return sum(self.is_correct)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Creates an AnswerBatch from the column lists produced by to_dict."""
+        batch = cls()
+        for row in zip(
+            data["answer_id"],
+            data["question_id"],
+            data["user_answer"],
+            data["is_correct"],
+            data["exam_id"],
+            data["user_id"],
+            data["timestamp"],
+            data.get("session_id") or [None] * len(data["answer_id"]),
+        ):
+            batch.add(*row)
+        return batch
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the batch to a dictionary of column lists."""
+        return {
+            "answer_id": self.answer_ids.tolist(),
+            "question_id": self.question_ids.tolist(),
+            "user_answer": self.user_answers.tolist(),
+            "is_correct": [bool(flag) for flag in self.is_correct],
+            "exam_id": self.exam_ids.tolist(),
+            "user_id": [self.users[index] for index in self.user_indexes],
+            "timestamp": self.timestamps.tolist(),
+            "session_id": [self.session_id(index) for index in range(len(self))],
+        }
@@ -0,0 +1,423 @@
+import atexit
+import collections
+import glob
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .answer import Answer
+from src.storage.database_manager import DatabaseManager
+from src.utils.logger import Logger
+
+INSERT_ANSWER = (
+    "INSERT OR IGNORE INTO answers "
+    "(answer_id, question_id, user_answer, is_correct, exam_id, user_id, timestamp, session_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Recounting rather than incrementing keeps replayed rows from counting twice
+UPDATE_SESSION_PROGRESS = (
+    "UPDATE exam_sessions SET updated_at = ?, "
+    "answered = (SELECT COUNT(*) FROM answers WHERE session_id = exam_sessions.session_id) "
+    "WHERE session_id = ?"
+)
+_SESSION_COLUMN = 7
+
+# Queued by flush() to cut the writer's linger short
+_FLUSH = object()
+
+# When the spool is fsynced: after every answer, at most once per
+# flush_interval, or never (left to the OS)
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# Longest wait between retries of a batch while the database is locked
+MAX_BACKOFF = 2.0
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed commit may succeed later: another connection holds a lock."""
+    return isinstance(error, sqlite3.OperationalError) and (
+        error.sqlite_errorcode & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    )
+
+
+def _try_lock(file) -> bool:
+    """Take an exclusive lock on an open file without blocking; False if it is held."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _still_linked(file, path: str) -> bool:
+    """Whether `path` still names the open file (another process may have claimed it)."""
+    try:
+        return os.path.samestat(os.fstat(file.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+class AnswerWriter:
+    """
+    Write-behind persistence for answers.
+
+    `submit` appends the answer to an append-only spool file and queues it;
+    a background thread drains the queue and commits answers in batches of
+    up to `batch_size`, collected for at most `flush_interval` seconds, so
+    callers never wait on SQLite. The same transaction updates the progress
+    of the exam sessions the answers belong to.
+
+    Every writer spools to its own file next to `spool_path` (for
+    data/answers.spool, data/answers-<pid>-<id>.spool) and holds an
+    exclusive lock on it while it runs. Answers commit in spool order, so
+    after each commit the committed lines are a prefix of the file; it is
+    cut off once it is at least as large as the rest. If the process dies,
+    the lock goes with it, and the next writer to start claims the orphaned
+    spool and replays it; spools still locked belong to live processes and
+    are left alone. Answer IDs are primary keys and inserts are INSERT OR
+    IGNORE, so replaying rows that did commit is harmless.
+
+    A batch that fails because the database is locked or busy is retried
+    with backoff, up to `max_retries` times. Rows that cannot be committed
+    otherwise are written with the error to a dead-letter file beside the
+    spools (answers.rejected for answers.spool) and logged, so one bad
+    answer never stalls the others.
+    """
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        spool_path: str,
+        batch_size: int = 200,
+        flush_interval: float = 0.05,
+        fsync: str = "always",
+        max_retries: int = 8,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy must be one of {', '.join(FSYNC_POLICIES)}")
+        self.database_manager = database_manager
+        # Where spools live and how they are named; this writer's own is spool_file
+        self.spool_path = spool_path
+        self.spool_file: Optional[str] = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_retries = max_retries
+        self._last_fsync = 0.0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._spool = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Guards the spool file and the pending count
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        # Byte size of each queued line, in spool order, and the committed prefix
+        self._line_sizes: collections.deque[int] = collections.deque()
+        self._committed_bytes = 0
+        # Rows not committed yet, by exam session, for readers that cannot wait
+        self._unsaved: dict[int, dict[int, tuple]] = {}
+        # Metrics
+        self.committed = 0
+        self.batches = 0
+        self.errors = 0
+        self.rejected = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @classmethod
+    def from_settings(cls, database_manager: DatabaseManager, settings: dict) -> "AnswerWriter":
+        return cls(
+            database_manager,
+            settings["spool_path"],
+            batch_size=int(settings["batch_size"]),
+            flush_interval=float(settings["flush_interval"]),
+            fsync=settings["fsync"],
+        )
+
+    def start(self) -> None:
+        """Replay spools orphaned by processes that died and start the writer thread."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self._closed:
+                raise RuntimeError("AnswerWriter is closed")
+            os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+            self._recover()
+            self._spool = self._create_spool()
+            self._thread = threading.Thread(
+                target=self._run, name="answer-writer", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, answer: Answer) -> None:
+        """Durably queue an answer; returns once it is in the spool."""
+        if self._thread is None:
+            self.start()
+        row = (
+            answer.answer_id,
+            answer.question_id,
+            answer.user_answer,
+            answer.is_correct,
+            answer.exam_id,
+            answer.user_id,
+            answer.timestamp.isoformat(),
+            answer.session_id,
+        )
+        line = (json.dumps(row) + "\n").encode("utf-8")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AnswerWriter is closed")
+            self._spool.write(line)
+            self._spool.flush()
+            if self.fsync == "always" or (
+                self.fsync == "interval"
+                and time.monotonic() - self._last_fsync >= self.flush_interval
+            ):
+                os.fsync(self._spool.fileno())
+                self._last_fsync = time.monotonic()
+            self._pending += 1
+            self._line_sizes.append(len(line))
+            if answer.session_id is not None:
+                self._unsaved.setdefault(answer.session_id, {})[answer.answer_id] = row
+            # Queued under the lock so answers commit in spool order
+            self._queue.put(row)
+
+    def unsaved(self, session_id: int) -> list[tuple]:
+        """Answer rows of an exam session that are spooled but not committed yet."""
+        with self._lock:
+            return list(self._unsaved.get(session_id, {}).values())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted answer is committed or rejected; False on timeout."""
+        if self._thread is not None:
+            self._queue.put(_FLUSH)
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Commit what is queued and stop the writer thread.
+
+        If that does not finish within `timeout` the spool is kept, and the
+        next writer to start replays it.
+        """
+        if self._thread is None or self._closed:
+            self._closed = True
+            return
+        finished = self.flush(timeout)
+        with self._lock:
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        with self._lock:
+            spool, self._spool = self._spool, None
+            spool.close()
+            if finished and self._pending == 0:
+                # Everything spooled is committed
+                os.remove(self.spool_file)
+        atexit.unregister(self.close)
+
+    def metrics(self) -> dict:
+        """Queue depth and commit latency counters."""
+        return {
+            "queue_depth": self._pending,
+            "committed": self.committed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "avg_flush_ms": self._total_flush_ms / self.batches if self.batches else 0.0,
+        }
+
+    def _run(self) -> None:
+        while True:
+            row = self._queue.get()
+            if row is None:
+                return
+            if row is _FLUSH:
+                continue
+            # Linger briefly so answers arriving together share a transaction
+            batch = [row]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    row = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                if row is _FLUSH:
+                    break
+                batch.append(row)
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: list[tuple]) -> None:
+        started = time.perf_counter()
+        # Rows _persist could not commit are counted in `rejected`
+        committed = self._persist(batch)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.last_flush_ms = elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+        self._total_flush_ms += elapsed
+        self.batches += 1
+        self.committed += committed
+        with self._idle:
+            self._pending -= len(batch)
+            for row in batch:
+                self._committed_bytes += self._line_sizes.popleft()
+                session_rows = self._unsaved.get(row[_SESSION_COLUMN])
+                if session_rows is not None:
+                    session_rows.pop(row[0], None)
+                    if not session_rows:
+                        del self._unsaved[row[_SESSION_COLUMN]]
+            # After a close that timed out the spool is left for recovery
+            if self._spool is not None:
+                self._trim_spool()
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _trim_spool(self) -> None:
+        """Drop the committed prefix of the spool; called with the lock held."""
+        if self._pending == 0:
+            self._spool.truncate(0)
+            self._committed_bytes = 0
+            return
+        size = os.fstat(self._spool.fileno()).st_size
+        if self._committed_bytes < size - self._committed_bytes:
+            # Rewriting now would copy more than it saves
+            return
+        # Copy the uncommitted lines to a new locked file and swap it in, so a
+        # crash part way leaves either the old spool or the new one intact
+        with open(self.spool_file, "rb") as spool:
+            spool.seek(self._committed_bytes)
+            rest = spool.read()
+        replacement_path = self.spool_file + ".tmp"
+        replacement = open(replacement_path, "ab")
+        _try_lock(replacement)
+        replacement.write(rest)
+        replacement.flush()
+        if self.fsync != "never":
+            os.fsync(replacement.fileno())
+        try:
+            os.replace(replacement_path, self.spool_file)
+        except OSError:
+            # Open files cannot be replaced on Windows; keep the longer spool
+            replacement.close()
+            os.remove(replacement_path)
+            return
+        self._spool.close()
+        self._spool = replacement
+        self._committed_bytes = 0
+
+    def _create_spool(self):
+        """Create and lock this writer's own spool file."""
+        stem, extension = os.path.splitext(self.spool_path)
+        while True:
+            self.spool_file = f"{stem}-{os.getpid()}-{uuid.uuid4().hex[:8]}{extension}"
+            fd = os.open(self.spool_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND)
+            spool = os.fdopen(fd, "ab")
+            # A writer recovering at this moment may have claimed the empty file
+            if _try_lock(spool) and _still_linked(spool, self.spool_file):
+                return spool
+            spool.close()
+
+    def _persist(self, rows: list[tuple]) -> int:
+        """Commit rows, retrying while the database is locked; returns how many committed."""
+        delay = self.flush_interval
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._commit(rows)
+                return len(rows)
+            except Exception as e:
+                self.errors += 1
+                error = e
+                if not _is_transient(e):
+                    break
+                if attempt < self.max_retries:
+                    time.sleep(delay)
+                    delay = min(delay * 2, MAX_BACKOFF)
+        if len(rows) > 1 and not _is_transient(error):
+            # Commit the rows one by one so only the faulty ones are rejected
+            return sum(self._persist([row]) for row in rows)
+        self._reject(rows, error)
+        return 0
+
+    def _reject(self, rows: list[tuple], error: Exception) -> None:
+        """Append rows that could not be committed to the dead-letter file."""
+        path = os.path.splitext(self.spool_path)[0] + ".rejected"
+        with open(path, "a", encoding="utf-8") as rejected:
+            for row in rows:
+                rejected.write(json.dumps({"row": row, "error": str(error)}) + "\n")
+            rejected.flush()
+            os.fsync(rejected.fileno())
+        self.rejected += len(rows)
+        Logger().error(f"{len(rows)} answer(s) could not be saved ({error}); kept in {path}")
+
+    def _commit(self, rows: list[tuple]) -> None:
+        sessions = {row[_SESSION_COLUMN] for row in rows} - {None}
+        with self.database_manager as db:
+            db.executemany(INSERT_ANSWER, rows)
+            if sessions:
+                now = time.time()
+                db.executemany(
+                    UPDATE_SESSION_PROGRESS, ((now, session_id) for session_id in sessions)
+                )
+
+    def _orphaned_spools(self) -> list[str]:
+        stem, extension = os.path.splitext(self.spool_path)
+        pattern = f"{glob.escape(stem)}-*{extension}"
+        # spool_path itself is where writers before per-process spools wrote
+        paths = sorted(glob.glob(pattern) + glob.glob(pattern + ".tmp"))
+        return [self.spool_path] + paths
+
+    def _recover(self) -> int:
+        """Commit answers left in spools by processes that died."""
+        recovered = 0
+        for path in self._orphaned_spools():
+            try:
+                spool = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with spool:
+                # Locked spools belong to live writers; an unlinked one was just claimed
+                if not _try_lock(spool) or not _still_linked(spool, path):
+                    continue
+                rows = []
+                for line in spool:
+                    try:
+                        rows.append(tuple(json.loads(line)))
+                    except ValueError:
+                        # A line torn by the crash was never acknowledged
+                        continue
+                # A leftover .tmp is a rewrite that never replaced its spool,
+                # which still holds the same rows
+                if rows and not path.endswith(".tmp"):
+                    recovered += self._persist(rows)
+                if fcntl is None:
+                    # Windows cannot remove an open file
+                    spool.close()
+                os.remove(path)
+        return recovered
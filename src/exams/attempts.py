@@ -0,0 +1,48 @@
+"""
+Which attempt a stored answer belongs to.
+
+Answers saved during an exam session belong to that session. Answers saved
+before sessions were tracked have no session_id; they are split per user
+into runs, and a run ends when the user answers a question that is already
+in it. Regrading, the results aggregates and item analysis all use this
+rule, so they count the same attempts.
+"""
+
+from typing import Optional
+
+
+class AttemptTracker:
+    """
+    Assigns one exam's answers to attempts as they are read.
+
+    A user's session-less answers must be fed in the order they were saved
+    (timestamp, then answer_id); answers of different users or sessions may
+    be interleaved freely.
+    """
+
+    __slots__ = ("_runs",)
+
+    def __init__(self) -> None:
+        # User -> (run number, questions answered in the current run)
+        self._runs: dict[str, tuple[int, set[int]]] = {}
+
+    def key(self, user_id: str, session_id: Optional[int], question_id: int) -> tuple:
+        """
+        Identify the attempt an answer belongs to.
+
+        Args:
+            user_id: The user who gave the answer
+            session_id: Its exam session, or None for answers saved before sessions
+            question_id: The question it answers
+
+        Returns:
+            A hashable key, equal for every answer of the same attempt
+        """
+        if session_id is not None:
+            return ("session", session_id)
+        number, answered = self._runs.get(user_id, (0, set()))
+        if question_id in answered:
+            number, answered = number + 1, set()
+        answered.add(question_id)
+        self._runs[user_id] = (number, answered)
+        return ("user", user_id, number)
@@ -3,6 +3,8 @@ from src.user.user import User
 
 
 class Exam:
+    __slots__ = ("exam_id", "name", "date", "duration", "questions_count", "created_by")
+
     def __init__(
         self,
         exam_id: int,
@@ -0,0 +1,520 @@
+"""
+Streaming import and export of exam banks.
+
+A bank is a flat sequence of records: an exam record followed by the
+question records that belong to it, then the next exam, and so on. Two
+encodings are supported:
+
+- JSONL: one JSON object per line, with "type" set to "exam" or "question"
+- Binary (.pxb): a compact length-prefixed format, see `write_binary`
+
+Both are read with generators, so a bank is never loaded into memory
+whole. Imports validate every record, give exams and questions fresh IDs
+and write them in one transaction per chunk.
+"""
+
+import argparse
+import json
+import re
+import struct
+import time
+from datetime import datetime
+from typing import IO, Iterable, Iterator, Optional, Sequence
+
+from src.exams.question import OPTION_SEPARATOR, Question
+from src.storage.database_manager import DatabaseManager
+from src.storage.id_allocator import IdAllocator
+from src.utils.config import get_config
+
+Record = tuple[str, dict]
+
+# Kind of the record readers yield for a line or block they cannot decode;
+# its data holds the reason, with the line number or byte offset, and the
+# record type when it can still be told
+UNREADABLE = "unreadable"
+_TYPE_FIELD = re.compile(r'"type"\s*:\s*"(exam|question)"')
+
+BINARY_MAGIC = b"PXEB\x01"
+# tag, name length, date length, created_by length, duration
+_EXAM = struct.Struct("<cHHHI")
+# tag, text length, options blob length, option count, correct answer, points
+_QUESTION = struct.Struct("<cIIBBH")
+# Options are stored as one blob, separated by NUL
+_OPTION_SEPARATOR = "\x00"
+# Largest UTF-8 size of an exam's name, date and created_by in _EXAM
+MAX_EXAM_FIELD_BYTES = 0xFFFF
+
+
+# ----- Validation -----
+def validate_exam(data: dict) -> dict:
+    """Return a clean exam record or raise ValueError."""
+    name = data.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("exam needs a name")
+    if len(name.encode()) > MAX_EXAM_FIELD_BYTES:
+        raise ValueError(f"exam name must be at most {MAX_EXAM_FIELD_BYTES} bytes")
+    date = data.get("date")
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise ValueError(f"exam date must be YYYY-MM-DD, got {date!r}")
+    duration = data.get("duration")
+    if not isinstance(duration, int) or not 0 < duration < 2**32:
+        raise ValueError("exam duration must be a positive number of minutes")
+    created_by = data.get("created_by")
+    if not isinstance(created_by, str) or not created_by:
+        raise ValueError("exam needs created_by")
+    if len(created_by.encode()) > MAX_EXAM_FIELD_BYTES:
+        raise ValueError(f"exam created_by must be at most {MAX_EXAM_FIELD_BYTES} bytes")
+    return {"name": name, "date": date, "duration": duration, "created_by": created_by}
+
+
+def validate_question(data: dict) -> dict:
+    """Return a clean question record or raise ValueError."""
+    text = data.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("question needs text")
+    options = data.get("options")
+    if (
+        not isinstance(options, list)
+        or not 2 <= len(options) <= 255
+        or not all(
+            isinstance(o, str) and _OPTION_SEPARATOR not in o and OPTION_SEPARATOR not in o
+            for o in options
+        )
+    ):
+        raise ValueError("question needs 2-255 text options")
+    correct = data.get("correct_answer")
+    if not isinstance(correct, int) or not 0 <= correct < len(options):
+        raise ValueError("correct_answer must index one of the options")
+    points = data.get("points", 1)
+    if not isinstance(points, int) or not 0 < points < 65536:
+        raise ValueError("points must be a positive integer")
+    return {"text": text, "options": options, "correct_answer": correct, "points": points}
+
+
+# ----- JSONL -----
+def read_jsonl(file: IO[str]) -> Iterator[Record]:
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            match = _TYPE_FIELD.search(line)
+            yield UNREADABLE, {
+                "reason": f"line {number}: invalid JSON ({e})",
+                "type": match.group(1) if match else None,
+            }
+            continue
+        if not isinstance(data, dict):
+            yield UNREADABLE, {"reason": f"line {number}: expected a JSON object"}
+            continue
+        yield data.pop("type", None), data
+
+
+def write_jsonl(records: Iterable[Record], file: IO[str]) -> int:
+    written = 0
+    for kind, data in records:
+        file.write(json.dumps({"type": kind, **data}, ensure_ascii=False))
+        file.write("\n")
+        written += 1
+    return written
+
+
+# ----- Binary -----
+def write_binary(records: Iterable[Record], file: IO[bytes]) -> int:
+    """
+    Write records in the compact binary format.
+
+    Layout: the magic bytes, then per record a fixed-size struct header
+    (tag b"E" or b"Q" plus lengths and small integers) followed by the UTF-8
+    string data, so a reader needs two reads per record and no parsing.
+    A record whose lengths or numbers do not fit the header raises
+    ValueError.
+    """
+    file.write(BINARY_MAGIC)
+    written = 0
+    for kind, data in records:
+        try:
+            if kind == "exam":
+                name, date, created_by = (
+                    data[key].encode() for key in ("name", "date", "created_by")
+                )
+                header = _EXAM.pack(
+                    b"E", len(name), len(date), len(created_by), data["duration"]
+                )
+                body = name + date + created_by
+            else:
+                text = data["text"].encode()
+                options = _OPTION_SEPARATOR.join(data["options"]).encode()
+                header = _QUESTION.pack(
+                    b"Q",
+                    len(text),
+                    len(options),
+                    len(data["options"]),
+                    data["correct_answer"],
+                    data["points"],
+                )
+                body = text + options
+        except struct.error as e:
+            # Records from the database were never checked against the layout
+            raise ValueError(
+                f"record {written + 1} ({kind}) does not fit the binary format: {e}"
+            ) from None
+        file.write(header)
+        file.write(body)
+        written += 1
+    return written
+
+
+def _read_exactly(file: IO[bytes], size: int) -> Optional[bytes]:
+    data = file.read(size)
+    return data if len(data) == size else None
+
+
+def read_binary(file: IO[bytes]) -> Iterator[Record]:
+    """
+    Yield records from a binary bank. A record that cannot be decoded is
+    yielded as UNREADABLE; a truncated file or an unknown tag ends the
+    stream there, as the records after it cannot be located.
+    """
+    if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValueError("Not a PyExam binary exam bank")
+    offset = len(BINARY_MAGIC)
+    while tag := file.read(1):
+        layout = {b"E": _EXAM, b"Q": _QUESTION}.get(tag)
+        if layout is None:
+            yield UNREADABLE, {"reason": f"offset {offset}: unknown record tag {tag!r}"}
+            return
+        truncated = (UNREADABLE, {"reason": f"offset {offset}: file ends inside a record"})
+        header = _read_exactly(file, layout.size - 1)
+        if header is None:
+            yield truncated
+            return
+        fields = layout.unpack(tag + header)
+        # The string lengths follow the tag in both headers
+        lengths = fields[1:4] if tag == b"E" else fields[1:3]
+        body = _read_exactly(file, sum(lengths))
+        if body is None:
+            yield truncated
+            return
+        try:
+            if tag == b"E":
+                name_len, date_len, _ = lengths
+                yield "exam", {
+                    "name": body[:name_len].decode(),
+                    "date": body[name_len : name_len + date_len].decode(),
+                    "duration": fields[4],
+                    "created_by": body[name_len + date_len :].decode(),
+                }
+            else:
+                text_len, _ = lengths
+                yield "question", {
+                    "text": body[:text_len].decode(),
+                    "options": body[text_len:].decode().split(_OPTION_SEPARATOR),
+                    "correct_answer": fields[4],
+                    "points": fields[5],
+                }
+        except UnicodeDecodeError as e:
+            yield UNREADABLE, {
+                "reason": f"offset {offset}: {e}",
+                "type": "exam" if tag == b"E" else "question",
+            }
+        offset += layout.size + len(body)
+
+
+def detect_format(path: str) -> str:
+    return "binary" if path.endswith(".pxb") else "jsonl"
+
+
+def read_bank(path: str, file_format: Optional[str] = None) -> Iterator[Record]:
+    """Yield (kind, data) records from a .jsonl or .pxb exam bank."""
+    file_format = file_format or detect_format(path)
+    if file_format == "binary":
+        with open(path, "rb") as file:
+            yield from read_binary(file)
+    elif file_format == "jsonl":
+        with open(path, "r", encoding="utf-8") as file:
+            yield from read_jsonl(file)
+    else:
+        raise ValueError(f"Unsupported exam bank format: {file_format}")
+
+
+def write_bank(records: Iterable[Record], path: str, file_format: Optional[str] = None) -> int:
+    file_format = file_format or detect_format(path)
+    if file_format == "binary":
+        with open(path, "wb") as file:
+            return write_binary(records, file)
+    if file_format == "jsonl":
+        with open(path, "w", encoding="utf-8") as file:
+            return write_jsonl(records, file)
+    raise ValueError(f"Unsupported exam bank format: {file_format}")
+
+
+class BankReport:
+    """Outcome of an exam bank import."""
+
+    __slots__ = ("exams", "questions", "invalid", "elapsed")
+
+    def __init__(self) -> None:
+        self.exams: int = 0
+        self.questions: int = 0
+        # (record number, reason)
+        self.invalid: list[tuple[int, str]] = []
+        self.elapsed: float = 0.0
+
+    @property
+    def questions_per_second(self) -> float:
+        return self.questions / self.elapsed if self.elapsed else 0.0
+
+
+class _PendingExam:
+    __slots__ = ("exam_id", "data", "new_questions")
+
+    def __init__(self, data: dict) -> None:
+        self.exam_id: Optional[int] = None
+        self.data = data
+        self.new_questions = 0
+
+
+class ExamBank:
+    """Bulk loads exam banks into the database and streams them back out."""
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        id_allocator: IdAllocator,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        self.database_manager = database_manager
+        self.id_allocator = id_allocator
+        self.chunk_size = chunk_size or database_manager.batch_size
+
+    def import_records(
+        self, records: Iterable[Record], created_by: Optional[str] = None, on_chunk=None
+    ) -> BankReport:
+        """
+        Validate and insert a stream of exam and question records.
+
+        Args:
+            records: (kind, data) pairs, each exam followed by its questions
+            created_by: Owner for every imported exam, overriding the records
+            on_chunk: Optional callback(report) run after every chunk
+
+        Returns:
+            A BankReport; an invalid or unreadable exam is skipped together
+            with its questions
+        """
+        report = BankReport()
+        started = time.perf_counter()
+        exam: Optional[_PendingExam] = None
+        # Why questions are skipped: they follow an exam that was not imported
+        skipping: Optional[str] = None
+        exams: list[_PendingExam] = []
+        questions: list[tuple[_PendingExam, dict]] = []
+        # Valid records collected since the last flush
+        pending = 0
+
+        for number, (kind, data) in enumerate(records, start=1):
+            try:
+                if kind == "exam":
+                    if created_by is not None:
+                        data = {**data, "created_by": created_by}
+                    exam, skipping = _PendingExam(validate_exam(data)), None
+                    exams.append(exam)
+                    pending += 1
+                elif kind == "question":
+                    if skipping:
+                        raise ValueError(skipping)
+                    if exam is None:
+                        raise ValueError("question before any exam")
+                    questions.append((exam, validate_question(data)))
+                    exam.new_questions += 1
+                    pending += 1
+                elif kind == UNREADABLE:
+                    raise ValueError(data["reason"])
+                else:
+                    raise ValueError(f"unknown record type {kind!r}")
+            except ValueError as error:
+                report.invalid.append((number, str(error)))
+                if kind == "exam":
+                    exam, skipping = None, "question of an invalid exam"
+                elif kind == UNREADABLE and data.get("type") != "question":
+                    # It may have been an exam: its questions must not join the one before
+                    exam, skipping = None, "question after an unreadable record"
+                continue
+
+            # Counting exams too bounds a run of exams without questions
+            if pending >= self.chunk_size:
+                self._flush(exams, questions, report)
+                pending = 0
+                # The open exam keeps collecting questions into the next chunk
+                exams = [exam] if exam is not None else []
+                report.elapsed = time.perf_counter() - started
+                if on_chunk:
+                    on_chunk(report)
+
+        if exams or questions:
+            self._flush(exams, questions, report)
+        report.elapsed = time.perf_counter() - started
+        if on_chunk:
+            on_chunk(report)
+        return report
+
+    def _flush(
+        self,
+        exams: list[_PendingExam],
+        questions: list[tuple[_PendingExam, dict]],
+        report: BankReport,
+    ) -> None:
+        new_exams = [exam for exam in exams if exam.exam_id is None]
+        # Reserve every ID up front; the allocator commits on its own
+        exam_ids = self.id_allocator.reserve_range("exams", len(new_exams))
+        for exam, exam_id in zip(new_exams, exam_ids):
+            exam.exam_id = exam_id
+        question_ids = self.id_allocator.reserve_range("questions", len(questions))
+
+        with self.database_manager as db:
+            db.executemany(
+                "INSERT INTO exams (exam_id, name, date, duration, questions_count, created_by) "
+                "VALUES (?, ?, ?, ?, 0, ?)",
+                (
+                    (e.exam_id, e.data["name"], e.data["date"], e.data["duration"], e.data["created_by"])
+                    for e in new_exams
+                ),
+            )
+            db.executemany(
+                "INSERT INTO questions "
+                "(question_id, text, options, options_packed, correct_answer, points, exam_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        question_id,
+                        question["text"],
+                        json.dumps(question["options"]),
+                        Question.pack_options(question["options"]),
+                        question["correct_answer"],
+                        question["points"],
+                        exam.exam_id,
+                    )
+                    for question_id, (exam, question) in zip(question_ids, questions)
+                ),
+            )
+            db.executemany(
+                "UPDATE exams SET questions_count = questions_count + ? WHERE exam_id = ?",
+                ((e.new_questions, e.exam_id) for e in exams if e.new_questions),
+            )
+
+        report.exams += len(new_exams)
+        report.questions += len(questions)
+        for exam in exams:
+            exam.new_questions = 0
+        questions.clear()
+
+    def import_file(
+        self,
+        path: str,
+        file_format: Optional[str] = None,
+        created_by: Optional[str] = None,
+        on_chunk=None,
+    ) -> BankReport:
+        return self.import_records(read_bank(path, file_format), created_by, on_chunk)
+
+    def export_records(self, exam_ids: Optional[Sequence[int]] = None) -> Iterator[Record]:
+        """
+        Stream exams and their questions as records, ordered by ID.
+
+        One joined query is read in `chunk_size` batches, so exporting a
+        large bank never holds more than a chunk of rows in memory.
+        """
+        query = (
+            "SELECT e.exam_id, e.name, e.date, e.duration, e.created_by, "
+            "q.text, q.options_packed, q.options, q.correct_answer, q.points "
+            "FROM exams e LEFT JOIN questions q ON q.exam_id = e.exam_id"
+        )
+        params: tuple = ()
+        if exam_ids:
+            query += f" WHERE e.exam_id IN ({', '.join('?' * len(exam_ids))})"
+            params = tuple(exam_ids)
+        query += " ORDER BY e.exam_id, q.question_id"
+
+        current = None
+        with self.database_manager as db:
+            db.execute(query, params)
+            while rows := db.fetchmany(self.chunk_size):
+                for (
+                    exam_id, name, date, duration, creator, text, packed, options, correct, points
+                ) in rows:
+                    if exam_id != current:
+                        current = exam_id
+                        yield "exam", {
+                            "name": name,
+                            "date": date,
+                            "duration": duration,
+                            "created_by": creator,
+                        }
+                    if text is not None:
+                        yield "question", {
+                            "text": text,
+                            "options": Question.unpack_options(packed, options),
+                            "correct_answer": correct,
+                            "points": points,
+                        }
+
+    def export_file(
+        self,
+        path: str,
+        file_format: Optional[str] = None,
+        exam_ids: Optional[Sequence[int]] = None,
+    ) -> int:
+        """Write exams to a .jsonl or .pxb file; returns the number of records."""
+        return write_bank(self.export_records(exam_ids), path, file_format)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import or export exam banks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Load exams from a bank file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=("jsonl", "binary"))
+    import_parser.add_argument("--created-by", help="Owner for every imported exam")
+    import_parser.add_argument("--chunk-size", type=int)
+
+    export_parser = commands.add_parser("export", help="Write exams to a bank file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=("jsonl", "binary"))
+    export_parser.add_argument("--exam", type=int, action="append", dest="exam_ids")
+    args = parser.parse_args(argv)
+
+    database_manager = DatabaseManager()
+    bank = ExamBank(
+        database_manager,
+        IdAllocator(
+            database_manager,
+            get_config().get("DATABASE", "id_block_size"),
+        ),
+        getattr(args, "chunk_size", None),
+    )
+    try:
+        if args.command == "export":
+            written = bank.export_file(args.path, args.format, args.exam_ids)
+            print(f"Exported {written:,} records to {args.path}")
+            return 0
+
+        report = bank.import_file(args.path, args.format, args.created_by)
+    finally:
+        database_manager.close()
+
+    print(
+        f"Imported {report.exams:,} exams and {report.questions:,} questions in "
+        f"{report.elapsed:.1f}s ({report.questions_per_second:,.0f} questions/s)"
+    )
+    for number, reason in report.invalid:
+        print(f"Record {number}: {reason}")
+    return 1 if report.invalid else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+from typing import Iterator, Optional
+
+from .exam import Exam
+
+
+class ExamCatalog:
+    """
+    In-memory index of exams.
+
+    Exams are keyed by exam_id, with secondary indexes by creator and by
+    date. Iteration yields exams in insertion order. The catalog only holds
+    exams that have been loaded; it is not a complete view of the database.
+    """
+
+    def __init__(self, exams: Optional[list[Exam]] = None) -> None:
+        self._by_id: dict[int, Exam] = {}
+        self._by_creator: dict[str, dict[int, Exam]] = {}
+        self._by_date: dict[str, dict[int, Exam]] = {}
+        for exam in exams or []:
+            self.add(exam)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Exam]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, exam_id: int) -> bool:
+        return exam_id in self._by_id
+
+    def add(self, exam: Exam) -> None:
+        """Add or replace an exam, keeping every index in step."""
+        if exam.exam_id in self._by_id:
+            self.remove(exam.exam_id)
+        self._by_id[exam.exam_id] = exam
+        self._by_creator.setdefault(self._creator_key(exam), {})[exam.exam_id] = exam
+        self._by_date.setdefault(exam.date, {})[exam.exam_id] = exam
+
+    def remove(self, exam_id: int) -> Optional[Exam]:
+        """Remove an exam by ID and return it, or None if it isn't indexed."""
+        exam = self._by_id.pop(exam_id, None)
+        if exam is None:
+            return None
+        self._discard(self._by_creator, self._creator_key(exam), exam_id)
+        self._discard(self._by_date, exam.date, exam_id)
+        return exam
+
+    def get(self, exam_id: int) -> Optional[Exam]:
+        return self._by_id.get(exam_id)
+
+    def by_creator(self, username: str) -> list[Exam]:
+        return list(self._by_creator.get(username, {}).values())
+
+    def by_date(self, date: str) -> list[Exam]:
+        return list(self._by_date.get(date, {}).values())
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_creator.clear()
+        self._by_date.clear()
+
+    @staticmethod
+    def _creator_key(exam: Exam) -> str:
+        # created_by may be a User or a plain username
+        return getattr(exam.created_by, "username", exam.created_by)
+
+    @staticmethod
+    def _discard(index: dict[str, dict[int, Exam]], key: str, exam_id: int) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(exam_id, None)
+        if not bucket:
+            del index[key]
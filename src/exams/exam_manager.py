@@ -1,13 +1,21 @@
 import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional
 
 from .exam import Exam
+from .exam_catalog import ExamCatalog
+from .exam_snapshot import SnapshotStore, publish_exam, refresh_snapshot
 from .question import Question
+from .question_cache import QuestionCache
 from .answer import Answer
+from .answer_writer import AnswerWriter
+from .exam_session import ExamSession, ExamSessionManager
+from .grading import AnswerKey, grade
+from .results_analytics import ResultsAnalytics
+from src.utils.config import get_config
 from src.utils.logger import Logger
 from src.interface.ui_manager import UIManager  
 from src.storage.database_manager import DatabaseManager
+from src.storage.id_allocator import IdAllocator
 from src.user.user_manager import UserManager
 from src.interface.input_handler import InputHandler
 from src.auth.auth_manager import AuthManager
@@ -29,8 +37,45 @@ class ExamManager:
         self.database_manager: DatabaseManager = database_manager
         self._logger: Logger = logger
         self.auth_manager: AuthManager = auth_manager
-        self.exams: list[Exam] = []
-        self.load_exams()
+        self.exams: ExamCatalog = ExamCatalog()
+        config = get_config()
+        self.id_allocator: IdAllocator = IdAllocator(
+            database_manager, block_size=config.get("DATABASE", "id_block_size")
+        )
+        cache_settings = config.section("QUESTION_CACHE")
+        self.question_cache: QuestionCache = QuestionCache(
+            max_entries=cache_settings["max_entries"],
+            max_bytes=cache_settings["max_bytes"],
+            ttl=cache_settings["ttl"],
+        )
+        # Exams are fetched on demand; self.exams only indexes those seen so far
+        self.page_size: int = config.get("EXAM_CATALOG", "page_size")
+        # Answers are saved in the background as each question is answered
+        self.answer_writer: AnswerWriter = AnswerWriter.from_settings(
+            database_manager,
+            config.section("ANSWER_WRITER"),
+        )
+        # Completed attempts update the results aggregates as they commit
+        self.analytics: ResultsAnalytics = ResultsAnalytics(database_manager)
+        self.exam_sessions: ExamSessionManager = ExamSessionManager(
+            database_manager, self.answer_writer, self.id_allocator, self.analytics
+        )
+        # Published exams are served from memory-mapped snapshot files
+        self.snapshots: SnapshotStore = SnapshotStore(
+            config.get("SNAPSHOTS", "path")
+        )
+
+    @staticmethod
+    def _row_to_exam(row: tuple) -> Exam:
+        exam_dict = {
+            "exam_id": row[0],
+            "name": row[1],
+            "date": row[2],
+            "duration": row[3],
+            "questions_count": row[4],
+            "created_by": row[5],
+        }
+        return Exam.from_dict(exam_dict)
 
     def load_exams(self) -> None:
         """Load all exams from the database."""
@@ -39,17 +84,9 @@ class ExamManager:
                 db.execute("SELECT * FROM exams")
                 exam_rows = db.fetchall()
 
-            self.exams = []
+            self.exams.clear()
             for row in exam_rows:
-                exam_dict = {
-                    "exam_id": row[0],
-                    "name": row[1],
-                    "date": row[2],
-                    "duration": row[3],
-                    "questions_count": row[4],
-                    "created_by": row[5],
-                }
-                self.exams.append(Exam.from_dict(exam_dict))
+                self.exams.add(self._row_to_exam(row))
 
             self._logger.info(f"Loaded {len(self.exams)} exams from database")
         except Exception as e:
@@ -91,8 +128,11 @@ class ExamManager:
             for i in range(1, questions_count + 1):
                 self._add_question(exam_id, i)
 
-            # Reload exams to include the new one
-            self.load_exams()
+            # Index the new exam instead of reloading the whole table
+            self.exams.add(
+                Exam(exam_id, title, date, duration, questions_count, created_by)
+            )
+            self.question_cache.invalidate(exam_id)
             self.ui_manager.show_success(
                 f"Exam '{title}' with {questions_count} questions added successfully."
             )
@@ -106,9 +146,7 @@ class ExamManager:
 
     def _generate_new_exam_id(self) -> int:
         """Generate a new unique exam ID."""
-        if not self.exams:
-            return 1
-        return max(exam.exam_id for exam in self.exams) + 1
+        return self.id_allocator.next_id("exams")
 
     def _add_question(self, exam_id: int, question_number: int) -> None:
         """Add a question to an exam."""
@@ -149,17 +187,21 @@ class ExamManager:
         try:
             with self.database_manager as db:
                 db.execute(
-                    "INSERT INTO questions (question_id, text, options, correct_answer, points, exam_id) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    "INSERT INTO questions "
+                    "(question_id, text, options, options_packed, correct_answer, points, exam_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
                     (
                         question_id,
                         question_text,
                         json.dumps(options),
+                        Question.pack_options(options),
                         correct_answer_index,
                         1,
                         exam_id,
                     ),
                 )
+            self.question_cache.invalidate(exam_id)
+            refresh_snapshot(self.database_manager, self.snapshots, exam_id)
             self.ui.show_success(f"Question {question_number} added")
         except Exception as e:
             self.logger.error(f"Error adding question: {str(e)}")
@@ -167,24 +209,14 @@ class ExamManager:
 
     def _generate_new_question_id(self) -> int:
         """Generate a new unique question ID."""
-        try:
-            with self.database_manager as db:
-                db.execute("SELECT MAX(question_id) FROM questions")
-                result = db.fetchone()
-
-            max_id = result[0] if result and result[0] is not None else 0
-            return max_id + 1
-        except Exception as e:
-            self.logger.error(f"Error generating question ID: {str(e)}")
-            return int(datetime.now().timestamp())  # Fallback to timestamp
+        return self.id_allocator.next_id("questions")
 
     def remove_exam(self, exam_id: int) -> bool:
         """Remove an exam and all its questions."""
         try:
-            # Find the exam in memory
-            exam = next((e for e in self.exams if e.exam_id == exam_id), None)
+            exam = self.get_exam(exam_id)
             if not exam:
-                self.ui.show_error(f"Exam with ID {exam_id} not found.")
+                self.ui_manager.show_error_notification(f"Exam with ID {exam_id} not found.")
                 return False
 
             # Remove from database
@@ -195,61 +227,179 @@ class ExamManager:
                 db.execute("DELETE FROM exams WHERE exam_id = ?", (exam_id,))
 
             # Remove from memory
-            self.exams = [e for e in self.exams if e.exam_id != exam_id]
+            self.exams.remove(exam_id)
+            self.question_cache.invalidate(exam_id)
+            self.snapshots.remove(exam_id)
 
-            self.ui.show_success(f"Exam '{exam.name}' removed successfully.")
+            self.ui_manager.show_success_notification(f"Exam '{exam.name}' removed successfully.")
             return True
         except Exception as e:
-            self.logger.error(f"Error removing exam: {str(e)}")
-            self.ui.show_error(f"Failed to remove exam: {str(e)}")
+            self._logger.error(f"Error removing exam: {str(e)}")
+            self.ui_manager.show_error_notification(f"Failed to remove exam: {str(e)}")
             return False
 
-    def list_exams(self) -> None:
-        """List all available exams."""
-        if not self.exams:
-            self.ui_manager.show_info_notification("No exams available.")
-            return
+    def iter_exam_pages(
+        self,
+        page_size: Optional[int] = None,
+        after_id: int = 0,
+        created_by: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Iterator[list[Exam]]:
+        """
+        Yield exams a page at a time, ordered by exam_id.
+
+        Uses keyset pagination (exam_id > last seen id), so each page costs
+        the same no matter how deep into the catalog it is. Pages are only
+        queried as the caller asks for them.
+
+        Args:
+            page_size: Exams per page (defaults to the configured page size)
+            after_id: Start after this exam_id
+            created_by: Only exams created by this username
+            date_from: Only exams on or after this YYYY-MM-DD date
+            date_to: Only exams on or before this YYYY-MM-DD date
+        """
+        page_size = page_size or self.page_size
+        filters, params = [], []
+        if created_by is not None:
+            filters.append("created_by = ?")
+            params.append(created_by)
+        if date_from is not None:
+            filters.append("date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            filters.append("date <= ?")
+            params.append(date_to)
+        where = "".join(f" AND {condition}" for condition in filters)
+
+        last_id = after_id
+        while True:
+            with self.database_manager as db:
+                db.execute(
+                    f"SELECT * FROM exams WHERE exam_id > ?{where} ORDER BY exam_id LIMIT ?",
+                    (last_id, *params, page_size),
+                )
+                rows = db.fetchall()
+            if not rows:
+                return
+            page = [self._row_to_exam(row) for row in rows]
+            for exam in page:
+                self.exams.add(exam)
+            yield page
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+
+    def list_exams(self, **filters) -> int:
+        """
+        List available exams a page at a time.
+
+        Returns:
+            The number of exams shown
+        """
+        shown = 0
+        for page in self.iter_exam_pages(**filters):
+            if not shown:
+                self.ui_manager.print_title("Available Exams", color="blue")
+            for exam in page:
+                self.ui_manager.show_info_notification(
+                    f"ID: {exam.exam_id} - {exam.name} (Date: {exam.date}, Duration: {exam.duration} min, Questions: {exam.questions_count})"
+                )
+            shown += len(page)
+            if len(page) == self.page_size and not self.ui_manager.confirm_action(
+                "Show more exams?"
+            ):
+                break
 
-        self.ui_manager.print_title("Available Exams", color="blue")
-        for exam in self.exams:
-            self.ui_manager.show_info_notification(
-                f"ID: {exam.exam_id} - {exam.name} (Date: {exam.date}, Duration: {exam.duration} min, Questions: {exam.questions_count})"
-            )
+        if not shown:
+            self.ui_manager.show_info_notification("No exams available.")
+        return shown
 
     def get_exam(self, exam_id: int) -> Optional[Exam]:
-        """Get an exam by ID."""
-        return next((e for e in self.exams if e.exam_id == exam_id), None)
+        """Get an exam by ID, fetching it from the database on first use."""
+        exam = self.exams.get(exam_id)
+        if exam is not None:
+            return exam
+        with self.database_manager as db:
+            db.execute("SELECT * FROM exams WHERE exam_id = ?", (exam_id,))
+            row = db.fetchone()
+        if row is None:
+            return None
+        exam = self._row_to_exam(row)
+        self.exams.add(exam)
+        return exam
 
     def get_exam_questions(self, exam_id: int) -> list[Question]:
         """Get all questions for a specific exam."""
+        cached = self.question_cache.get(exam_id)
+        if cached is not None:
+            return cached
+
         questions = []
         try:
             with self.database_manager as db:
-                db.execute("SELECT * FROM questions WHERE exam_id = ?", (exam_id,))
+                db.execute(
+                    "SELECT question_id, text, options_packed, options, correct_answer, points "
+                    "FROM questions WHERE exam_id = ?",
+                    (exam_id,),
+                )
                 question_rows = db.fetchall()
 
-            for row in question_rows:
-                options = json.loads(row[2])
-                question_dict = {
-                    "question_id": row[0],
-                    "text": row[1],
-                    "options": options,
-                    "correct_answer": row[3],
-                    "points": row[4],
-                    "exam_id": row[5],
-                }
-                questions.append(Question.from_dict(question_dict))
+            unpack = Question.unpack_options
+            for question_id, text, packed, options_json, correct, points in question_rows:
+                questions.append(
+                    Question(
+                        question_id, text, unpack(packed, options_json), correct, points, exam_id
+                    )
+                )
 
+            self.question_cache.put(exam_id, questions)
             return questions
         except Exception as e:
             self.logger.error(f"Error getting exam questions: {str(e)}")
             self.ui.show_error(f"Failed to load exam questions: {str(e)}")
             return []
 
-    def take_exam(self, exam_id: int) -> None:
-        """Allow a user to take an exam."""
-        # Get the exam
+    def publish_exam(self, exam_id: int) -> Optional[str]:
+        """
+        Compile an exam into an immutable snapshot file for delivery.
+
+        Returns:
+            The snapshot path, or None if the exam has no questions
+        """
+        return publish_exam(self.database_manager, self.snapshots, exam_id)
+
+    def load_published_exam(self, exam_id: int) -> Optional[tuple[Exam, list[Question]]]:
+        """Read an exam and its questions from its snapshot, if published."""
+        try:
+            snapshot = self.snapshots.get(exam_id)
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Ignoring snapshot of exam {exam_id}: {e}")
+            return None
+        if snapshot is None:
+            return None
+        return snapshot.exam(), snapshot.questions()
+
+    def load_exam(self, exam_id: int) -> tuple[Optional[Exam], list[Question]]:
+        """
+        The exam and its questions for delivery: from the published snapshot
+        when there is one, otherwise from the question cache or database.
+        """
+        published = self.load_published_exam(exam_id)
+        if published is not None:
+            return published
         exam = self.get_exam(exam_id)
+        return exam, self.get_exam_questions(exam_id) if exam else []
+
+    def take_exam(self, exam_id: int) -> None:
+        """
+        Allow a user to take an exam.
+
+        Continues the user's unfinished attempt at the exam if there is one,
+        asking only the questions not answered yet.
+        """
+        exam, questions = self.load_exam(exam_id)
         if not exam:
             self.ui_manager.show_error(f"Exam with ID {exam_id} not found.")
             return
@@ -260,8 +410,6 @@ class ExamManager:
             self.ui_manager.show_error("You must be logged in to take an exam.")
             return
 
-        # Get all questions for this exam
-        questions = self.get_exam_questions(exam_id)
         if not questions:
             self.ui_manager.show_error("This exam has no questions.")
             return
@@ -272,17 +420,28 @@ class ExamManager:
         self.ui_manager.show_info_notification(f"Questions: {len(questions)}")
         self.ui_manager.print_divider()
 
-        # Record answers
+        session = self.exam_sessions.start(user.username, exam_id)
+        given = self.exam_sessions.answers(session) if session.answered else {}
+        if given:
+            self.ui_manager.show_info_notification(
+                f"Resuming: {len(given)} of {len(questions)} questions already answered"
+            )
+
+        # Record answers, checkpointing each one as soon as it is given
         answers = []
         for i, question in enumerate(questions, 1):
-            answer = self._present_question(question, i, len(questions))
+            answer = given.get(question.question_id)
+            if answer is None:
+                answer = self._present_question(question, i, len(questions))
+                self._save_answer(session, answer)
             answers.append(answer)
 
         # Calculate and show results
         self._show_exam_results(exam, questions, answers)
-
-        # Save answers to database
-        self._save_exam_answers(user.username, exam_id, answers)
+        self.exam_sessions.complete(session, questions, answers)
+        self._logger.info(
+            f"Queued {len(answers)} answers for user {user.username} on exam {exam_id}"
+        )
 
     def _present_question(self, question: Question, q_num: int, total: int) -> Answer:
         """Present a question to the user and get their answer."""
@@ -304,37 +463,37 @@ class ExamManager:
             except ValueError:
                 self.ui_manager.show_error("Please enter a valid number")
 
-        # Check if correct
-        is_correct = question.is_correct(user_answer)
+        return self.new_answer(
+            question, user_answer, self.auth_manager.get_current_user().username
+        )
 
-        # Create answer object
-        answer_id = int(datetime.now().timestamp())  # Simple unique ID
-        answer = Answer(
-            answer_id=answer_id,
+    def new_answer(self, question: Question, user_answer: int, username: str) -> Answer:
+        """Build a graded answer with a fresh ID; `user_answer` is zero-based."""
+        return Answer(
+            answer_id=self.id_allocator.next_id("answers"),
             question_id=question.question_id,
             user_answer=user_answer,
-            is_correct=is_correct,
+            is_correct=question.is_correct(user_answer),
             exam_id=question.exam_id,
-            user_id=self.auth_manager.get_current_user().username,
+            user_id=username,
         )
 
-        return answer
-
     def _show_exam_results(
         self, exam: Exam, questions: List[Question], answers: List[Answer]
     ) -> None:
         """Display exam results to the user."""
-        correct_count = sum(1 for answer in answers if answer.is_correct)
-        total_points = sum(q.points for q in questions)
-        earned_points = sum(
-            q.points for q, a in zip(questions, answers) if a.is_correct
+        report = grade(
+            AnswerKey.from_questions(questions), [[a.user_answer for a in answers]]
         )
+        correct_count = report.correct_counts[0]
+        total_points = report.total_points
+        earned_points = report.earned_points[0]
 
         self.ui_manager.print_title("Exam Results", color="blue")
         self.ui_manager.show_info_notification(f"Exam: {exam.name}")
         self.ui_manager.show_info_notification(f"Correct Answers: {correct_count}/{len(questions)}")
         self.ui_manager.show_info_notification(f"Points: {earned_points}/{total_points}")
-        self.ui_manager.show_info_notification(f"Score: {(earned_points / total_points) * 100:.1f}%")
+        self.ui_manager.show_info_notification(f"Score: {report.percentages[0]:.1f}%")
 
         # Detailed results
         self.ui_manager.print_title("Question Details", color="yellow")
@@ -347,29 +506,15 @@ class ExamManager:
             if not answer.is_correct:
                 self.ui_manager.show_info_notification(f"   Correct answer: {correct_choice}")
 
-    def _save_exam_answers(
-        self, username: str, exam_id: int, answers: list[Answer]
-    ) -> None:
-        """Save exam answers to the database."""
+    def _save_answer(self, session: ExamSession, answer: Answer) -> None:
+        """Checkpoint an answer through the write-behind writer; does not wait for SQLite."""
         try:
-            with self.database_manager as db:
-                for answer in answers:
-                    db.execute(
-                        "INSERT INTO answers (answer_id, question_id, user_answer, is_correct, exam_id, user_id, timestamp) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            answer.answer_id,
-                            answer.question_id,
-                            answer.user_answer,
-                            answer.is_correct,
-                            answer.exam_id,
-                            answer.user_id,
-                            answer.timestamp.isoformat(),
-                        ),
-                    )
-            self._logger.info(
-                f"Saved {len(answers)} answers for user {username} on exam {exam_id}"
-            )
+            self.exam_sessions.checkpoint(session, answer)
         except Exception as e:
-            self._logger.error(f"Error saving exam answers: {str(e)}")
-            self.ui_manager.show_error(f"Failed to save your answers: {str(e)}")
+            self._logger.error(f"Error saving answer: {str(e)}")
+            self.ui_manager.show_error_notification(f"Failed to save your answer: {str(e)}")
+
+    def close(self) -> None:
+        """Commit queued answers and release snapshot mappings."""
+        self.answer_writer.close()
+        self.snapshots.close()
@@ -0,0 +1,164 @@
+import sqlite3
+import time
+from datetime import datetime
+from typing import Optional, Sequence
+
+from .answer import Answer
+from .answer_writer import AnswerWriter
+from .question import Question
+from .results_analytics import ResultsAnalytics
+from src.storage.database_manager import DatabaseManager
+from src.storage.id_allocator import IdAllocator
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+ABANDONED = "abandoned"
+
+
+class ExamSession:
+    """One attempt at an exam, recorded in `exam_sessions`."""
+
+    __slots__ = ("session_id", "username", "exam_id", "answered", "started_at")
+
+    def __init__(
+        self, session_id: int, username: str, exam_id: int, answered: int, started_at: float
+    ) -> None:
+        self.session_id = session_id
+        self.username = username
+        self.exam_id = exam_id
+        self.answered = answered
+        self.started_at = started_at
+
+    def __repr__(self) -> str:
+        return (
+            f"ExamSession({self.session_id}, {self.username}, exam {self.exam_id}, "
+            f"{self.answered} answered)"
+        )
+
+
+class ExamSessionManager:
+    """
+    Tracks exam attempts so an interrupted one can be picked up again.
+
+    Each answer is checkpointed through the AnswerWriter as it is given, so
+    it is in the spool (fsynced according to its policy) before the next
+    question is shown; the writer also keeps `exam_sessions.answered` up to
+    date. Resuming reads the attempt's answers back from the database and
+    adds those the writer has not committed yet, so it never waits on the
+    writer (which may be busy with other users' answers).
+
+    Completing an attempt also folds it into the results aggregates, in the
+    same transaction that marks it completed.
+    """
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        answer_writer: AnswerWriter,
+        id_allocator: IdAllocator,
+        analytics: Optional[ResultsAnalytics] = None,
+    ) -> None:
+        self.database_manager = database_manager
+        self.answer_writer = answer_writer
+        self.id_allocator = id_allocator
+        self.analytics = analytics
+
+    def start(self, username: str, exam_id: int) -> ExamSession:
+        """Return the user's open attempt at an exam, or begin a new one."""
+        session = self.find_open(username, exam_id)
+        if session is not None:
+            return session
+        now = time.time()
+        session_id = self.id_allocator.next_id("exam_sessions")
+        session = ExamSession(session_id, username, exam_id, 0, now)
+        try:
+            with self.database_manager as db:
+                db.execute(
+                    "INSERT INTO exam_sessions "
+                    "(session_id, username, exam_id, status, answered, started_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, 0, ?, ?)",
+                    (session_id, username, exam_id, IN_PROGRESS, now, now),
+                )
+        except sqlite3.IntegrityError:
+            # Another login of the same user began the attempt in the meantime
+            session = self.find_open(username, exam_id)
+            if session is None:
+                raise
+        return session
+
+    def find_open(self, username: str, exam_id: Optional[int] = None) -> Optional[ExamSession]:
+        """The user's most recent attempt still in progress, if any."""
+        query = (
+            "SELECT session_id, username, exam_id, answered, started_at FROM exam_sessions "
+            "WHERE username = ? AND status = ?"
+        )
+        params: tuple = (username, IN_PROGRESS)
+        if exam_id is not None:
+            query += " AND exam_id = ?"
+            params += (exam_id,)
+        with self.database_manager as db:
+            db.execute(query + " ORDER BY updated_at DESC LIMIT 1", params)
+            row = db.fetchone()
+        if row is None:
+            return None
+        session = ExamSession(*row)
+        if self.answer_writer.unsaved(session.session_id):
+            # The stored count leaves out answers still on their way to the database
+            session.answered = len(self.answers(session))
+        return session
+
+    def checkpoint(self, session: ExamSession, answer: Answer) -> None:
+        """Durably record an answer as part of the attempt."""
+        answer.session_id = session.session_id
+        self.answer_writer.submit(answer)
+        session.answered += 1
+
+    def answers(self, session: ExamSession) -> dict[int, Answer]:
+        """The answers already given in an attempt, by question_id."""
+        # Taken first: a row may commit in between, but is then read twice, not missed
+        unsaved = self.answer_writer.unsaved(session.session_id)
+        with self.database_manager as db:
+            db.execute(
+                "SELECT answer_id, question_id, user_answer, is_correct, exam_id, user_id, "
+                "timestamp, session_id FROM answers WHERE session_id = ? ORDER BY answer_id",
+                (session.session_id,),
+            )
+            rows = db.fetchall() + unsaved
+        return {
+            row[1]: Answer(*row[:6], timestamp=datetime.fromisoformat(row[6]), session_id=row[7])
+            for row in rows
+        }
+
+    def complete(
+        self,
+        session: ExamSession,
+        questions: Sequence[Question] = (),
+        answers: Sequence[Answer] = (),
+    ) -> None:
+        """
+        Mark an attempt completed and count it in the results aggregates.
+
+        The answers are graded in memory, so this does not wait for the
+        writer to commit them. An attempt is only counted once, however
+        often it is completed.
+        """
+        with self.database_manager:
+            if self._set_status(session, COMPLETED) and self.analytics and questions:
+                self.analytics.record_attempt(
+                    session.username, session.exam_id, questions, answers
+                )
+
+    def abandon(self, session: ExamSession) -> None:
+        """Give up an attempt so the next start begins from scratch."""
+        self._set_status(session, ABANDONED)
+
+    def _set_status(self, session: ExamSession, status: str) -> bool:
+        """Close an attempt still in progress; False if it was already closed."""
+        with self.database_manager as db:
+            db.execute(
+                "UPDATE exam_sessions SET status = ?, updated_at = ? "
+                "WHERE session_id = ? AND status = ?",
+                (status, time.time(), session.session_id, IN_PROGRESS),
+            )
+            db.execute("SELECT changes()")
+            return db.fetchone()[0] > 0
@@ -0,0 +1,323 @@
+"""
+Precompiled, immutable exam snapshots.
+
+Publishing an exam writes its metadata, questions and a digest of its answer
+key into a single binary file. Exam starts then read that file through a
+shared memory map instead of querying SQLite, so every concurrent start is
+served from the OS page cache.
+
+File layout (little-endian):
+
+    header   magic, version, exam_id, duration, question count,
+             string lengths of name/date/created_by, answer key SHA-256
+    strings  name, date and created_by (UTF-8)
+    index    one fixed-size entry per question: question_id, offset and
+             length of its text and packed options, correct answer, points
+    heap     question texts and packed options (UTF-8)
+
+Reading a question is a `struct.unpack_from` on the index plus two slices of
+the heap; nothing is parsed.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Optional, Sequence
+
+from .exam import Exam
+from .question import OPTION_SEPARATOR, Question
+from src.storage.database_manager import DatabaseManager
+from src.utils.config import get_config
+
+MAGIC = b"PXSN"
+VERSION = 1
+# magic, version, exam_id, duration, question count, name/date/created_by lengths, key digest
+_HEADER = struct.Struct("<4sBxxxIIIHHH32s")
+# question_id, heap offset, text length, options length, correct answer, points
+_ENTRY = struct.Struct("<IIIIHH")
+_KEY_ENTRY = struct.Struct("<IHH")
+
+
+def answer_key_digest(questions: Sequence[tuple[int, int, int]]) -> bytes:
+    """SHA-256 over (question_id, correct_answer, points) in question order."""
+    digest = hashlib.sha256()
+    for entry in questions:
+        digest.update(_KEY_ENTRY.pack(*entry))
+    return digest.digest()
+
+
+def write_snapshot(path: str, exam: Exam, questions: Sequence[Question]) -> None:
+    """
+    Compile an exam into a snapshot file.
+
+    The file is written next to `path` and renamed into place, so readers
+    only ever see a complete snapshot.
+    """
+    name, date, created_by = (
+        str(value).encode() for value in (exam.name, exam.date, exam.created_by)
+    )
+    entries = []
+    heap = bytearray()
+    for question in questions:
+        text = question.text.encode()
+        options = Question.pack_options(question.options).encode()
+        entries.append(
+            _ENTRY.pack(
+                question.question_id,
+                len(heap),
+                len(text),
+                len(options),
+                question.correct_answer,
+                question.points,
+            )
+        )
+        heap += text + options
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        exam.exam_id,
+        exam.duration,
+        len(questions),
+        len(name),
+        len(date),
+        len(created_by),
+        answer_key_digest(
+            [(q.question_id, q.correct_answer, q.points) for q in questions]
+        ),
+    )
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(header + name + date + created_by)
+            file.writelines(entries)
+            file.write(heap)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ExamSnapshot:
+    """A read-only, memory-mapped view of one snapshot file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                version,
+                self.exam_id,
+                self.duration,
+                self.question_count,
+                name_len,
+                date_len,
+                creator_len,
+                self.key_digest,
+            ) = _HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} exam snapshot")
+            offset = _HEADER.size
+            self.name = self._map[offset : offset + name_len].decode()
+            offset += name_len
+            self.date = self._map[offset : offset + date_len].decode()
+            offset += date_len
+            self.created_by = self._map[offset : offset + creator_len].decode()
+            self._index = offset + creator_len
+            self._heap = self._index + self.question_count * _ENTRY.size
+            if answer_key_digest(self._key_entries()) != self.key_digest:
+                raise ValueError(f"Answer key digest mismatch in {path}")
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.question_count
+
+    def exam(self) -> Exam:
+        return Exam(
+            self.exam_id, self.name, self.date, self.duration, self.question_count, self.created_by
+        )
+
+    def question(self, index: int) -> Question:
+        question_id, offset, text_len, options_len, correct, points = _ENTRY.unpack_from(
+            self._map, self._index + index * _ENTRY.size
+        )
+        start = self._heap + offset
+        middle = start + text_len
+        return Question(
+            question_id,
+            self._map[start:middle].decode(),
+            self._map[middle : middle + options_len].decode().split(OPTION_SEPARATOR),
+            correct,
+            points,
+            self.exam_id,
+        )
+
+    def questions(self) -> list[Question]:
+        return [self.question(i) for i in range(self.question_count)]
+
+    def close(self) -> None:
+        self._map.close()
+
+    def _key_entries(self):
+        for i in range(self.question_count):
+            question_id, _, _, _, correct, points = _ENTRY.unpack_from(
+                self._map, self._index + i * _ENTRY.size
+            )
+            yield question_id, correct, points
+
+
+class SnapshotStore:
+    """
+    Publishes snapshots into a directory and keeps them mapped for reuse.
+
+    An open snapshot is shared by all callers until its file is replaced
+    (republished) or removed, which is detected from the file's inode and
+    modification time.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        # exam_id -> ((inode, mtime), snapshot)
+        self._open: dict[int, tuple[tuple[int, int], ExamSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, exam_id: int) -> str:
+        return os.path.join(self.directory, f"exam_{exam_id}.pxs")
+
+    def publish(self, exam: Exam, questions: Sequence[Question]) -> str:
+        path = self.path_for(exam.exam_id)
+        write_snapshot(path, exam, questions)
+        return path
+
+    def get(self, exam_id: int) -> Optional[ExamSnapshot]:
+        """
+        Return the mapped snapshot of an exam, or None if it has not been
+        published. Raises ValueError if the file is corrupt.
+        """
+        path = self.path_for(exam_id)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._forget(exam_id)
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns)
+
+        with self._lock:
+            entry = self._open.get(exam_id)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            snapshot = ExamSnapshot(path)
+            # The replaced map is left to the garbage collector: a reader
+            # may still be decoding questions from it
+            self._open[exam_id] = (version, snapshot)
+            return snapshot
+
+    def remove(self, exam_id: int) -> None:
+        self._forget(exam_id)
+        try:
+            os.remove(self.path_for(exam_id))
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            for _, snapshot in self._open.values():
+                snapshot.close()
+            self._open.clear()
+
+    def _forget(self, exam_id: int) -> None:
+        with self._lock:
+            self._open.pop(exam_id, None)
+
+
+def publish_exam(
+    database_manager: DatabaseManager, store: SnapshotStore, exam_id: int
+) -> Optional[str]:
+    """
+    Compile an exam from the database into the store.
+
+    Returns:
+        The snapshot path, or None if the exam is missing or has no questions
+    """
+    with database_manager as db:
+        db.execute(
+            "SELECT exam_id, name, date, duration, questions_count, created_by "
+            "FROM exams WHERE exam_id = ?",
+            (exam_id,),
+        )
+        row = db.fetchone()
+        if row is None:
+            return None
+        db.execute(
+            "SELECT question_id, text, options_packed, options, correct_answer, points "
+            "FROM questions WHERE exam_id = ? ORDER BY question_id",
+            (exam_id,),
+        )
+        rows = db.fetchall()
+    if not rows:
+        return None
+    questions = [
+        Question(
+            question_id, text, Question.unpack_options(packed, options), correct, points, exam_id
+        )
+        for question_id, text, packed, options, correct, points in rows
+    ]
+    return store.publish(Exam(*row), questions)
+
+
+def refresh_snapshot(
+    database_manager: DatabaseManager, store: SnapshotStore, exam_id: int
+) -> Optional[str]:
+    """
+    Republish an exam whose questions or answer key changed, if it was
+    published; a stale snapshot would keep serving the old ones.
+
+    Returns:
+        The new snapshot path, or None if the exam has no snapshot (any
+        left for an exam without questions is removed)
+    """
+    if not os.path.exists(store.path_for(exam_id)):
+        return None
+    path = publish_exam(database_manager, store, exam_id)
+    if path is None:
+        store.remove(exam_id)
+    return path
+
+
+def snapshot_directory() -> str:
+    return get_config().get("SNAPSHOTS", "path")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Publish exams as snapshot files.")
+    parser.add_argument("exam_ids", type=int, nargs="+")
+    args = parser.parse_args(argv)
+
+    database_manager = DatabaseManager()
+    store = SnapshotStore(snapshot_directory())
+    failed = 0
+    try:
+        for exam_id in args.exam_ids:
+            path = publish_exam(database_manager, store, exam_id)
+            if path is None:
+                print(f"Exam {exam_id} not found or has no questions")
+                failed += 1
+            else:
+                print(f"Published exam {exam_id} to {path}")
+    finally:
+        database_manager.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
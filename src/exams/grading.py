@@ -0,0 +1,240 @@
+"""
+Batch grading of exam responses.
+
+Responses are graded as an N students x M questions matrix against an
+answer key in one pass. NumPy is used for batches when it is installed;
+otherwise, and for a single student, the same results are computed with
+plain Python lists. NumPy is only imported the first time it is needed, as
+importing it takes longer than grading one exam.
+"""
+
+import argparse
+from typing import Optional, Sequence
+
+from .answer_batch import AnswerBatch
+from .exam_snapshot import SnapshotStore, refresh_snapshot, snapshot_directory
+from .question import Question
+from .results_analytics import ResultsAnalytics
+
+# The numpy module once _numpy() has loaded it; None before then or if it is
+# not installed
+np = None
+_numpy_checked = False
+
+# Marks a question the student did not answer
+UNANSWERED = -1
+
+
+def _numpy():
+    """The numpy module, or None if it is not installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - depends on the environment
+            np = None
+        _numpy_checked = True
+    return np
+
+
+class AnswerKey:
+    """Correct option index and point value for each question, in exam order."""
+
+    __slots__ = ("question_ids", "correct_answers", "points", "_positions")
+
+    def __init__(
+        self, question_ids: Sequence[int], correct_answers: Sequence[int], points: Sequence[int]
+    ) -> None:
+        if not len(question_ids) == len(correct_answers) == len(points):
+            raise ValueError("Answer key columns must have the same length")
+        self.question_ids = list(question_ids)
+        self.correct_answers = list(correct_answers)
+        self.points = list(points)
+        self._positions = {qid: i for i, qid in enumerate(self.question_ids)}
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    @classmethod
+    def from_questions(cls, questions: Sequence[Question]):
+        return cls(
+            [q.question_id for q in questions],
+            [q.correct_answer for q in questions],
+            [q.points for q in questions],
+        )
+
+    def position(self, question_id: int) -> Optional[int]:
+        """Column of a question in the response matrix, or None if unknown."""
+        return self._positions.get(question_id)
+
+    @property
+    def total_points(self) -> int:
+        return sum(self.points)
+
+
+class GradeReport:
+    """
+    Grading results for a response matrix.
+
+    Attributes:
+        correct: N x M correctness matrix (NumPy bool array or list of lists)
+        correct_counts (list[int]): Correct answers per student
+        earned_points (list[int]): Points earned per student
+        total_points (int): Points available on the exam
+        percentages (list[float]): Score per student, 0-100
+    """
+
+    __slots__ = ("correct", "correct_counts", "earned_points", "total_points", "percentages")
+
+    def __init__(self, correct, correct_counts, earned_points, total_points) -> None:
+        self.correct = correct
+        self.correct_counts = list(correct_counts)
+        self.earned_points = list(earned_points)
+        self.total_points = total_points
+        self.percentages = [
+            (earned / total_points) * 100 if total_points else 0.0
+            for earned in self.earned_points
+        ]
+
+    def __len__(self) -> int:
+        return len(self.earned_points)
+
+
+def grade(key: AnswerKey, responses, use_numpy: bool = True) -> GradeReport:
+    """
+    Grade every student's responses against the key.
+
+    Args:
+        key: The answer key for the exam's M questions
+        responses: N rows of M chosen option indexes (UNANSWERED for blanks)
+        use_numpy: Set to False to force the pure-Python path
+
+    Returns:
+        A GradeReport with one entry per row of `responses`
+    """
+    if use_numpy and len(key) and len(responses) > 1 and _numpy() is not None:
+        matrix = np.asarray(responses, dtype=np.int64).reshape(-1, len(key))
+        correct = matrix == np.asarray(key.correct_answers, dtype=np.int64)
+        earned = correct @ np.asarray(key.points, dtype=np.int64)
+        return GradeReport(
+            correct,
+            correct.sum(axis=1).tolist(),
+            earned.tolist(),
+            key.total_points,
+        )
+
+    answers_key = key.correct_answers
+    points = key.points
+    correct = [
+        [chosen == expected for chosen, expected in zip(row, answers_key)]
+        for row in responses
+    ]
+    earned = [
+        sum(value for hit, value in zip(row, points) if hit) for row in correct
+    ]
+    return GradeReport(correct, [sum(row) for row in correct], earned, key.total_points)
+
+
+def regrade_exam(
+    database_manager,
+    exam_id: int,
+    use_numpy: bool = True,
+    snapshots: Optional[SnapshotStore] = None,
+):
+    """
+    Re-mark every stored answer of an exam against its current answer key.
+
+    Rows whose `is_correct` flag changed are rewritten in one batched
+    transaction. The returned report has one row per counted attempt, as
+    defined by `AttemptTracker`: a completed exam session, or a run of
+    answers saved before sessions existed. Answers of unfinished sessions
+    are re-marked but not reported. If a question was answered more than
+    once in an attempt, the last answer counts. The exam's results
+    aggregates are rebuilt in the same transaction, and if the exam is
+    published in `snapshots` the snapshot is rebuilt so new attempts get
+    the fixed key.
+
+    Returns:
+        (username of each attempt, report, changed rows)
+    """
+    with database_manager as db:
+        db.execute(
+            "SELECT question_id, correct_answer, points FROM questions "
+            "WHERE exam_id = ? ORDER BY question_id",
+            (exam_id,),
+        )
+        key_rows = db.fetchall()
+        db.execute(
+            "SELECT answer_id, question_id, user_answer, is_correct, exam_id, user_id, "
+            "timestamp, session_id FROM answers WHERE exam_id = ? ORDER BY timestamp, answer_id",
+            (exam_id,),
+        )
+        answers = AnswerBatch()
+        while rows := db.fetchmany():
+            answers.add_rows(rows)
+        db.execute(
+            "SELECT session_id FROM exam_sessions WHERE exam_id = ? AND status != 'completed'",
+            (exam_id,),
+        )
+        unfinished = {session_id for session_id, in db.fetchall()}
+
+    key = AnswerKey(*zip(*key_rows)) if key_rows else AnswerKey([], [], [])
+    columns = [key.position(question_id) for question_id in answers.question_ids]
+    counted = [
+        column is not None and answers.session_ids[index] not in unfinished
+        for index, column in enumerate(columns)
+    ]
+    attempt_of, first_rows = answers.attempts(counted)
+
+    usernames = [answers.users[answers.user_indexes[index]] for index in first_rows]
+    responses = [[UNANSWERED] * len(key) for _ in first_rows]
+    updates: list[tuple[bool, int]] = []
+    for index, column in enumerate(columns):
+        if column is None:
+            continue
+        user_answer = answers.user_answers[index]
+        now_correct = user_answer == key.correct_answers[column]
+        if bool(answers.is_correct[index]) != now_correct:
+            updates.append((now_correct, answers.answer_ids[index]))
+        if attempt_of[index] >= 0:
+            # Rows are in the order saved, so the last answer to a question wins
+            responses[attempt_of[index]][column] = user_answer
+
+    with database_manager:
+        if updates:
+            database_manager.executemany(
+                "UPDATE answers SET is_correct = ? WHERE answer_id = ?", updates
+            )
+        # The aggregates are built from is_correct and the questions' points
+        ResultsAnalytics(database_manager).rebuild(exam_id)
+    if snapshots is not None:
+        refresh_snapshot(database_manager, snapshots, exam_id)
+    return usernames, grade(key, responses, use_numpy=use_numpy), len(updates)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from src.storage.database_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(
+        description="Regrade every stored answer of an exam against its current key."
+    )
+    parser.add_argument("exam_id", type=int)
+    parser.add_argument(
+        "--no-numpy", action="store_true", help="use the pure-Python grader"
+    )
+    args = parser.parse_args(argv)
+
+    users, report, changed = regrade_exam(
+        DatabaseManager(),
+        args.exam_id,
+        use_numpy=not args.no_numpy,
+        snapshots=SnapshotStore(snapshot_directory()),
+    )
+    print(f"Exam {args.exam_id}: {len(users)} attempts, {changed} answers re-marked")
+    for user, earned, percent in zip(users, report.earned_points, report.percentages):
+        print(f"{user}\t{earned}/{report.total_points}\t{percent:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
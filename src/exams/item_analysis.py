@@ -0,0 +1,259 @@
+"""
+Item analysis of stored exam answers.
+
+A batch job for psychometric reports: for each exam it computes every
+question's p-value, point-biserial correlation with the attempt score and
+how often each option was chosen (distractor frequency), plus the exam's
+KR-20 reliability.
+
+Answers are streamed from SQLite with `fetchmany` in chunks, ordered so
+each attempt's answers arrive together; only running sums are kept, so
+memory stays bounded by the number of questions rather than answers.
+Several exams can be analysed in parallel on worker processes, each with
+its own connection pool.
+
+An attempt is an exam session that was completed, or, for answers saved
+before sessions existed, all of a user's answers to the exam. If a
+question was answered more than once in an attempt the last answer counts.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from .attempts import AttemptTracker
+from .question import Question
+from .results_analytics import point_biserial
+from src.storage.database_manager import DatabaseManager
+
+
+class ItemStats:
+    """
+    Statistics of one question.
+
+    Attributes:
+        p_value (float): Share of attempts that answered correctly, 0-1
+        point_biserial (float | None): Correlation between answering
+            correctly and the attempt's points; None when undefined
+        distractors (list[int]): How many attempts chose each option index
+        omitted (int): Attempts that did not answer the question
+    """
+
+    __slots__ = (
+        "question_id",
+        "correct_answer",
+        "p_value",
+        "point_biserial",
+        "distractors",
+        "omitted",
+    )
+
+    def __init__(
+        self,
+        question_id: int,
+        correct_answer: int,
+        p_value: float,
+        point_biserial: Optional[float],
+        distractors: list[int],
+        omitted: int,
+    ) -> None:
+        self.question_id = question_id
+        self.correct_answer = correct_answer
+        self.p_value = p_value
+        self.point_biserial = point_biserial
+        self.distractors = distractors
+        self.omitted = omitted
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ItemReport:
+    """Item analysis of one exam."""
+
+    __slots__ = ("exam_id", "attempts", "kr20", "items", "elapsed")
+
+    def __init__(
+        self,
+        exam_id: int,
+        attempts: int,
+        kr20: Optional[float],
+        items: list[ItemStats],
+        elapsed: float,
+    ) -> None:
+        self.exam_id = exam_id
+        self.attempts = attempts
+        self.kr20 = kr20
+        self.items = items
+        self.elapsed = elapsed
+
+    def to_dict(self) -> dict:
+        return {
+            "exam_id": self.exam_id,
+            "attempts": self.attempts,
+            "kr20": self.kr20,
+            "items": [item.to_dict() for item in self.items],
+        }
+
+
+def kr20(item_count: int, pq_sum: float, variance: float) -> Optional[float]:
+    """Kuder-Richardson 20 from the items' p*q and the number-correct variance."""
+    if item_count < 2 or variance <= 1e-12:
+        return None
+    return item_count / (item_count - 1) * (1 - pq_sum / variance)
+
+
+class _Accumulator:
+    """Running sums over attempts; one list slot per question of the exam."""
+
+    def __init__(self, questions: list[Question]) -> None:
+        self.questions = questions
+        self.position = {q.question_id: i for i, q in enumerate(questions)}
+        self.attempts = 0
+        self.score_sum = self.score_sq_sum = 0
+        self.correct_count_sum = self.correct_count_sq_sum = 0
+        self.correct = [0] * len(questions)
+        self.correct_score_sum = [0] * len(questions)
+        self.chosen = [[0] * len(q.options) for q in questions]
+        self.omitted = [0] * len(questions)
+
+    def add(self, responses: dict[int, int]) -> None:
+        """Count one attempt given its user_answer per question position."""
+        score = correct_count = 0
+        right = []
+        for i, question in enumerate(self.questions):
+            choice = responses.get(i)
+            if choice is None:
+                self.omitted[i] += 1
+                continue
+            if 0 <= choice < len(question.options):
+                self.chosen[i][choice] += 1
+            if choice == question.correct_answer:
+                score += question.points
+                correct_count += 1
+                right.append(i)
+        for i in right:
+            self.correct[i] += 1
+            self.correct_score_sum[i] += score
+        self.attempts += 1
+        self.score_sum += score
+        self.score_sq_sum += score * score
+        self.correct_count_sum += correct_count
+        self.correct_count_sq_sum += correct_count * correct_count
+
+    def report(self, exam_id: int, elapsed: float) -> ItemReport:
+        n = self.attempts
+        items = []
+        pq_sum = 0.0
+        for i, question in enumerate(self.questions):
+            p = self.correct[i] / n if n else 0.0
+            pq_sum += p * (1 - p)
+            items.append(
+                ItemStats(
+                    question.question_id,
+                    question.correct_answer,
+                    p,
+                    point_biserial(
+                        n, self.correct[i], self.score_sum, self.score_sq_sum,
+                        self.correct_score_sum[i],
+                    ),
+                    self.chosen[i],
+                    self.omitted[i],
+                )
+            )
+        variance = 0.0
+        if n:
+            mean = self.correct_count_sum / n
+            variance = self.correct_count_sq_sum / n - mean * mean
+        return ItemReport(exam_id, n, kr20(len(items), pq_sum, variance), items, elapsed)
+
+
+def analyze_exam(
+    database_manager: DatabaseManager, exam_id: int, chunk_size: Optional[int] = None
+) -> ItemReport:
+    """
+    Analyse one exam's answers, streaming them `chunk_size` rows at a time.
+
+    Args:
+        database_manager: Database holding the exam and its answers
+        exam_id: The exam to analyse
+        chunk_size: Rows per fetchmany call (defaults to the configured batch size)
+    """
+    started = time.perf_counter()
+    with database_manager as db:
+        db.execute(
+            "SELECT question_id, text, options_packed, options, correct_answer, points "
+            "FROM questions WHERE exam_id = ? ORDER BY question_id",
+            (exam_id,),
+        )
+        questions = [
+            Question(
+                question_id, text, Question.unpack_options(packed, options_json),
+                correct_answer, points, exam_id,
+            )
+            for question_id, text, packed, options_json, correct_answer, points in db.fetchall()
+        ]
+        totals = _Accumulator(questions)
+
+        # Each attempt's answers are contiguous in this order, and a user's
+        # session-less answers come in the order they were saved, as
+        # AttemptTracker needs to split them into attempts
+        db.execute(
+            "SELECT a.user_id, a.session_id, a.question_id, a.user_answer "
+            "FROM answers a LEFT JOIN exam_sessions s ON s.session_id = a.session_id "
+            "WHERE a.exam_id = ? AND (a.session_id IS NULL OR s.status = 'completed') "
+            "ORDER BY a.user_id, a.session_id, a.timestamp, a.answer_id",
+            (exam_id,),
+        )
+        tracker = AttemptTracker()
+        attempt = None
+        responses: dict[int, int] = {}
+        while rows := db.fetchmany(chunk_size):
+            for user_id, session_id, question_id, user_answer in rows:
+                position = totals.position.get(question_id)
+                if position is None:
+                    continue
+                key = tracker.key(user_id, session_id, question_id)
+                if key != attempt:
+                    if attempt is not None:
+                        totals.add(responses)
+                    attempt, responses = key, {}
+                responses[position] = user_answer
+        if attempt is not None:
+            totals.add(responses)
+
+    return totals.report(exam_id, time.perf_counter() - started)
+
+
+def _analyze_in_process(database_path: str, exam_id: int, chunk_size: Optional[int]) -> ItemReport:
+    database_manager = DatabaseManager(database_path=database_path)
+    try:
+        return analyze_exam(database_manager, exam_id, chunk_size)
+    finally:
+        database_manager.close()
+
+
+def analyze_exams(
+    database_manager: DatabaseManager,
+    exam_ids: Iterable[int],
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+) -> Iterable[ItemReport]:
+    """
+    Analyse several exams, yielding reports in the order of `exam_ids`.
+
+    With `workers` > 1 the exams are spread over that many processes, each
+    opening its own pool on the same database file.
+    """
+    exam_ids = list(exam_ids)
+    if workers <= 1 or len(exam_ids) < 2:
+        for exam_id in exam_ids:
+            yield analyze_exam(database_manager, exam_id, chunk_size)
+        return
+    with ProcessPoolExecutor(min(workers, len(exam_ids))) as pool:
+        yield from pool.map(
+            _analyze_in_process,
+            [database_manager.database_path] * len(exam_ids),
+            exam_ids,
+            [chunk_size] * len(exam_ids),
+        )
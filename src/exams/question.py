@@ -1,4 +1,9 @@
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Optional
+
+# Separates options in the packed `questions.options_packed` column
+# (ASCII unit separator, which cannot be typed into an option)
+OPTION_SEPARATOR = "\x1f"
 
 
 class Question:
@@ -14,6 +19,8 @@ class Question:
         exam_id (int): ID of the exam this question belongs to
     """
 
+    __slots__ = ("question_id", "text", "options", "correct_answer", "points", "exam_id")
+
     def __init__(
         self,
         question_id: int,
@@ -59,3 +66,22 @@ class Question:
     def is_correct(self, answer_index: int) -> bool:
         """Checks if the provided answer index matches the correct answer."""
         return answer_index == self.correct_answer
+
+    @staticmethod
+    def pack_options(options: List[str]) -> str:
+        """Encodes options for the `options_packed` column."""
+        if any(OPTION_SEPARATOR in option for option in options):
+            raise ValueError("Options may not contain the unit separator character")
+        return OPTION_SEPARATOR.join(options)
+
+    @staticmethod
+    def unpack_options(packed: Optional[str], options_json: str) -> List[str]:
+        """
+        Decodes stored options, preferring the packed column.
+
+        A plain split is several times cheaper than `json.loads`; rows written
+        before the packed column existed still fall back to the JSON copy.
+        """
+        if packed is not None:
+            return packed.split(OPTION_SEPARATOR)
+        return json.loads(options_json)
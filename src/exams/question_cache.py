@@ -0,0 +1,106 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .question import Question
+
+# Rough per-question overhead (object, dict, ints) on top of its strings
+_QUESTION_OVERHEAD = 400
+
+
+class QuestionCache:
+    """
+    LRU cache of exam question sets keyed by exam_id.
+
+    Entries are evicted least-recently-used first once either the entry
+    count or the approximate byte size goes over its limit, and are dropped
+    on read once they are older than the TTL. Safe to share between threads.
+    """
+
+    def __init__(
+        self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024, ttl: float = 600
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # exam_id -> (questions, size in bytes, time stored)
+        self._entries: OrderedDict[int, tuple[list[Question], int, float]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, exam_id: int) -> Optional[list[Question]]:
+        """Return a copy of the cached question list, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(exam_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            questions, _, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._drop(exam_id)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(exam_id)
+            self.hits += 1
+            return list(questions)
+
+    def put(self, exam_id: int, questions: list[Question]) -> None:
+        size = self._estimate_size(questions)
+        with self._lock:
+            if exam_id in self._entries:
+                self._drop(exam_id)
+            if size > self.max_bytes:
+                # Would evict everything else and still not fit
+                return
+            self._entries[exam_id] = (list(questions), size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, exam_id: int) -> None:
+        """Forget the cached questions of one exam."""
+        with self._lock:
+            if exam_id in self._entries:
+                self._drop(exam_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _drop(self, exam_id: int) -> None:
+        _, size, _ = self._entries.pop(exam_id)
+        self._bytes -= size
+
+    @staticmethod
+    def _estimate_size(questions: list[Question]) -> int:
+        """Approximate memory held by a question list (strings dominate)."""
+        size = sys.getsizeof(questions)
+        for question in questions:
+            size += _QUESTION_OVERHEAD + sys.getsizeof(question.text)
+            size += sum(sys.getsizeof(option) for option in question.options)
+        return size
@@ -0,0 +1,551 @@
+"""
+Exam results analytics from precomputed aggregates.
+
+Every completed attempt is folded into a handful of small tables (see
+migration 8) in the same transaction that marks the attempt completed:
+
+    exam_stats             attempts and running sums of scores per exam
+    exam_score_histogram   attempts per 10% score band
+    question_stats         per question: attempts, correct, score sums
+    user_exam_stats        per user and exam: attempts, best and last score
+
+Reports then read a few rows instead of regrading every stored answer.
+The running sums are enough to derive the mean and standard deviation of
+the scores, each question's p-value (share answered correctly) and its
+discrimination as the point-biserial correlation between answering it
+correctly and the attempt's score.
+
+`rebuild` recomputes the tables from the answers table, for databases that
+collected answers before the aggregates existed.
+
+Usage:
+    python -m src.exams.results_analytics summary EXAM_ID [EXAM_ID ...]
+    python -m src.exams.results_analytics rebuild [--exam EXAM_ID]
+    python -m src.exams.results_analytics items EXAM_ID [...] [--workers N] [--json]
+    python -m src.exams.results_analytics export PATH [--format csv|jsonl] [--exam ID]
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
+
+from .answer import Answer
+from .answer_batch import AnswerBatch
+from .question import Question
+from src.storage.database_manager import DatabaseManager
+
+HISTOGRAM_BUCKETS = 10
+RESULT_FIELDS = (
+    "session_id",
+    "username",
+    "exam_id",
+    "completed_at",
+    "correct",
+    "score",
+    "max_points",
+    "percentage",
+)
+
+
+class ExamSummary:
+    """Score distribution of an exam's completed attempts."""
+
+    __slots__ = ("exam_id", "attempts", "max_points", "mean", "stdev", "histogram")
+
+    def __init__(
+        self,
+        exam_id: int,
+        attempts: int,
+        max_points: int,
+        mean: float,
+        stdev: float,
+        histogram: list[int],
+    ) -> None:
+        self.exam_id = exam_id
+        self.attempts = attempts
+        self.max_points = max_points
+        self.mean = mean
+        self.stdev = stdev
+        self.histogram = histogram
+
+    @property
+    def mean_percentage(self) -> float:
+        return self.mean / self.max_points * 100 if self.max_points else 0.0
+
+
+class QuestionStats:
+    """
+    Item statistics of one question.
+
+    Attributes:
+        p_value (float): Share of attempts that answered correctly, 0-1
+        discrimination (float | None): Point-biserial correlation between a
+            correct answer and the attempt's score; None until it is defined
+            (fewer than two attempts, everyone right or wrong, or no spread
+            in scores)
+    """
+
+    __slots__ = ("question_id", "attempts", "correct", "p_value", "discrimination")
+
+    def __init__(
+        self,
+        question_id: int,
+        attempts: int,
+        correct: int,
+        p_value: float,
+        discrimination: Optional[float],
+    ) -> None:
+        self.question_id = question_id
+        self.attempts = attempts
+        self.correct = correct
+        self.p_value = p_value
+        self.discrimination = discrimination
+
+
+class UserExamStats:
+    """A user's attempts at one exam."""
+
+    __slots__ = ("exam_id", "attempts", "best_score", "last_score", "last_attempt_at")
+
+    def __init__(
+        self,
+        exam_id: int,
+        attempts: int,
+        best_score: int,
+        last_score: int,
+        last_attempt_at: float,
+    ) -> None:
+        self.exam_id = exam_id
+        self.attempts = attempts
+        self.best_score = best_score
+        self.last_score = last_score
+        self.last_attempt_at = last_attempt_at
+
+
+def histogram_bucket(score: int, max_points: int) -> int:
+    """The 10% band a score falls in; a full score goes in the top band."""
+    if max_points <= 0:
+        return 0
+    return min(HISTOGRAM_BUCKETS - 1, score * HISTOGRAM_BUCKETS // max_points)
+
+
+def point_biserial(
+    attempts: int, correct: int, score_sum: int, score_sq_sum: int, correct_score_sum: int
+) -> Optional[float]:
+    """Point-biserial correlation from the running sums kept in question_stats."""
+    if attempts < 2 or correct in (0, attempts):
+        return None
+    mean = score_sum / attempts
+    variance = score_sq_sum / attempts - mean * mean
+    if variance <= 1e-12:
+        return None
+    p = correct / attempts
+    mean_correct = correct_score_sum / correct
+    mean_wrong = (score_sum - correct_score_sum) / (attempts - correct)
+    return (mean_correct - mean_wrong) / math.sqrt(variance) * math.sqrt(p * (1 - p))
+
+
+class ResultsAnalytics:
+    def __init__(self, database_manager: DatabaseManager) -> None:
+        self.database_manager = database_manager
+
+    # ----- Updating -----
+    def record_attempt(
+        self,
+        username: str,
+        exam_id: int,
+        questions: Sequence[Question],
+        answers: Iterable[Answer],
+        completed_at: Optional[float] = None,
+    ) -> None:
+        """
+        Fold one completed attempt into the aggregates.
+
+        Runs in the caller's transaction when there is one, so the attempt
+        is counted exactly when its completion commits.
+
+        Args:
+            username: Who took the exam
+            exam_id: The exam taken
+            questions: The exam's questions, for their points
+            answers: The attempt's answers; unanswered questions count as wrong
+        """
+        correct = {a.question_id for a in answers if a.is_correct}
+        items = [(q.question_id, q.question_id in correct, q.points) for q in questions]
+        self._record(username, exam_id, items, completed_at or time.time())
+
+    def _record(
+        self,
+        username: str,
+        exam_id: int,
+        items: list[tuple[int, bool, int]],
+        completed_at: float,
+    ) -> None:
+        """`items` holds (question_id, is_correct, points) per question of the exam."""
+        max_points = sum(points for _, _, points in items)
+        score = sum(points for _, is_correct, points in items if is_correct)
+        with self.database_manager as db:
+            db.execute(
+                "INSERT INTO exam_stats "
+                "(exam_id, attempts, max_points, score_sum, score_sq_sum) "
+                "VALUES (?, 1, ?, ?, ?) "
+                "ON CONFLICT (exam_id) DO UPDATE SET "
+                "attempts = attempts + 1, max_points = excluded.max_points, "
+                "score_sum = score_sum + excluded.score_sum, "
+                "score_sq_sum = score_sq_sum + excluded.score_sq_sum",
+                (exam_id, max_points, score, score * score),
+            )
+            db.execute(
+                "INSERT INTO exam_score_histogram (exam_id, bucket, attempts) "
+                "VALUES (?, ?, 1) "
+                "ON CONFLICT (exam_id, bucket) DO UPDATE SET attempts = attempts + 1",
+                (exam_id, histogram_bucket(score, max_points)),
+            )
+            db.executemany(
+                "INSERT INTO question_stats "
+                "(question_id, exam_id, attempts, correct, score_sum, score_sq_sum, "
+                "correct_score_sum) VALUES (?, ?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (question_id) DO UPDATE SET "
+                "attempts = attempts + 1, correct = correct + excluded.correct, "
+                "score_sum = score_sum + excluded.score_sum, "
+                "score_sq_sum = score_sq_sum + excluded.score_sq_sum, "
+                "correct_score_sum = correct_score_sum + excluded.correct_score_sum",
+                [
+                    (
+                        question_id,
+                        exam_id,
+                        int(is_correct),
+                        score,
+                        score * score,
+                        score if is_correct else 0,
+                    )
+                    for question_id, is_correct, _ in items
+                ],
+            )
+            db.execute(
+                "INSERT INTO user_exam_stats "
+                "(username, exam_id, attempts, best_score, last_score, last_attempt_at) "
+                "VALUES (?, ?, 1, ?, ?, ?) "
+                "ON CONFLICT (username, exam_id) DO UPDATE SET "
+                "attempts = attempts + 1, "
+                "best_score = max(best_score, excluded.best_score), "
+                "last_score = excluded.last_score, "
+                "last_attempt_at = excluded.last_attempt_at",
+                (username, exam_id, score, score, completed_at),
+            )
+
+    def rebuild(self, exam_id: Optional[int] = None) -> int:
+        """
+        Recompute the aggregates from stored answers.
+
+        Completed attempts are taken from exam_sessions; answers saved before
+        attempts were tracked are split into attempts by `AttemptTracker`,
+        the same way regrading counts them.
+
+        Returns:
+            The number of attempts counted
+        """
+        where, params = ("WHERE exam_id = ?", (exam_id,)) if exam_id is not None else ("", ())
+        counted = 0
+        with self.database_manager as db:
+            for table in ("exam_stats", "exam_score_histogram", "question_stats", "user_exam_stats"):
+                db.execute(f"DELETE FROM {table} {where}", params)
+            db.execute(
+                f"SELECT exam_id, question_id, points FROM questions {where} "
+                "ORDER BY exam_id, question_id",
+                params,
+            )
+            keys: dict[int, list[tuple[int, int]]] = {}
+            for key_exam_id, question_id, points in db.fetchall():
+                keys.setdefault(key_exam_id, []).append((question_id, points))
+
+            for key_exam_id, key in keys.items():
+                for username, completed_at, answered in self._attempts(db, key_exam_id, key):
+                    items = [
+                        (question_id, bool(answered.get(question_id)), points)
+                        for question_id, points in key
+                    ]
+                    self._record(username, key_exam_id, items, completed_at or time.time())
+                    counted += 1
+        return counted
+
+    @staticmethod
+    def _attempts(db, exam_id: int, key: list[tuple[int, int]]) -> list[tuple[str, float, dict]]:
+        """
+        One exam's counted attempts in the order they finished.
+
+        Returns:
+            (username, completed_at or 0, {question_id: is_correct}) per attempt
+        """
+        db.execute(
+            "SELECT a.answer_id, a.question_id, a.user_answer, a.is_correct, a.exam_id, "
+            "a.user_id, a.timestamp, a.session_id "
+            "FROM answers a LEFT JOIN exam_sessions s ON s.session_id = a.session_id "
+            "WHERE a.exam_id = ? AND (a.session_id IS NULL OR s.status = 'completed') "
+            "ORDER BY a.timestamp, a.answer_id",
+            (exam_id,),
+        )
+        answers = AnswerBatch()
+        while rows := db.fetchmany():
+            answers.add_rows(rows)
+        db.execute(
+            "SELECT session_id, updated_at FROM exam_sessions "
+            "WHERE exam_id = ? AND status = 'completed'",
+            (exam_id,),
+        )
+        completed_at = dict(db.fetchall())
+
+        questions = {question_id for question_id, _ in key}
+        attempt_of, first_rows = answers.attempts(
+            [question_id in questions for question_id in answers.question_ids]
+        )
+        answered: list[dict[int, bool]] = [{} for _ in first_rows]
+        last_rows = list(first_rows)
+        for index, attempt in enumerate(attempt_of):
+            if attempt < 0:
+                continue
+            # Rows are in the order saved, so the last answer to a question wins
+            answered[attempt][answers.question_ids[index]] = bool(answers.is_correct[index])
+            last_rows[attempt] = index
+        return [
+            (
+                answers.users[answers.user_indexes[first_rows[attempt]]],
+                completed_at.get(answers.session_ids[first_rows[attempt]], 0),
+                answered[attempt],
+            )
+            for attempt in sorted(range(len(first_rows)), key=last_rows.__getitem__)
+        ]
+
+    # ----- Reports -----
+    def exam_summary(self, exam_id: int) -> Optional[ExamSummary]:
+        """The exam's score distribution, or None before its first completed attempt."""
+        with self.database_manager as db:
+            db.execute(
+                "SELECT attempts, max_points, score_sum, score_sq_sum FROM exam_stats "
+                "WHERE exam_id = ?",
+                (exam_id,),
+            )
+            row = db.fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "SELECT bucket, attempts FROM exam_score_histogram WHERE exam_id = ?",
+                (exam_id,),
+            )
+            histogram = [0] * HISTOGRAM_BUCKETS
+            for bucket, count in db.fetchall():
+                histogram[bucket] = count
+
+        attempts, max_points, score_sum, score_sq_sum = row
+        mean = score_sum / attempts
+        stdev = math.sqrt(max(0.0, score_sq_sum / attempts - mean * mean))
+        return ExamSummary(exam_id, attempts, max_points, mean, stdev, histogram)
+
+    def question_stats(self, exam_id: int) -> list[QuestionStats]:
+        """Item statistics of the exam's questions that have been attempted."""
+        with self.database_manager as db:
+            db.execute(
+                "SELECT question_id, attempts, correct, score_sum, score_sq_sum, "
+                "correct_score_sum FROM question_stats WHERE exam_id = ? "
+                "ORDER BY question_id",
+                (exam_id,),
+            )
+            rows = db.fetchall()
+        return [
+            QuestionStats(
+                question_id,
+                attempts,
+                correct,
+                correct / attempts if attempts else 0.0,
+                point_biserial(attempts, correct, score_sum, score_sq_sum, correct_sum),
+            )
+            for question_id, attempts, correct, score_sum, score_sq_sum, correct_sum in rows
+        ]
+
+    def user_summary(self, username: str) -> list[UserExamStats]:
+        """The user's attempt summary for every exam they completed."""
+        with self.database_manager as db:
+            db.execute(
+                "SELECT exam_id, attempts, best_score, last_score, last_attempt_at "
+                "FROM user_exam_stats WHERE username = ? ORDER BY exam_id",
+                (username,),
+            )
+            rows = db.fetchall()
+        return [UserExamStats(*row) for row in rows]
+
+    # ----- Export -----
+    def iter_results(self, exam_ids: Optional[Sequence[int]] = None) -> Iterator[dict]:
+        """
+        Yield one record per completed attempt, oldest first.
+
+        Attempts are read in pages of the configured batch size, each in its
+        own short transaction, so exports of any size run in bounded memory
+        and no connection is held while the caller handles the records.
+        """
+        exam_filter, params = "", ()
+        if exam_ids:
+            exam_filter = f"AND s.exam_id IN ({', '.join('?' * len(exam_ids))})"
+            params = tuple(exam_ids)
+        page_size = self.database_manager.batch_size
+        # Keyset paging: each page starts after the last attempt of the one before
+        last: tuple = ()
+        while True:
+            after = "AND (s.updated_at, s.session_id) > (?, ?)" if last else ""
+            with self.database_manager as db:
+                db.execute(
+                    f"""
+                    SELECT s.session_id, s.username, s.exam_id, s.updated_at,
+                           count(q.question_id), coalesce(sum(q.points), 0),
+                           (SELECT coalesce(sum(points), 0) FROM questions
+                            WHERE exam_id = s.exam_id)
+                    FROM exam_sessions s
+                    LEFT JOIN answers a ON a.session_id = s.session_id AND a.is_correct
+                    LEFT JOIN questions q ON q.question_id = a.question_id
+                    WHERE s.status = 'completed' {exam_filter} {after}
+                    GROUP BY s.session_id
+                    ORDER BY s.updated_at, s.session_id
+                    LIMIT ?
+                    """,
+                    params + last + (page_size,),
+                )
+                rows = db.fetchall()
+            for row in rows:
+                record = dict(zip(RESULT_FIELDS, row))
+                score, max_points = record["score"], record["max_points"]
+                record["percentage"] = (
+                    round(score / max_points * 100, 1) if max_points else 0.0
+                )
+                yield record
+            if len(rows) < page_size:
+                return
+            last = (rows[-1][3], rows[-1][0])
+
+    def export_results(
+        self,
+        file: TextIO,
+        file_format: str = "csv",
+        exam_ids: Optional[Sequence[int]] = None,
+    ) -> int:
+        """Write completed attempts to `file` as CSV or JSONL; returns the row count."""
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported results format: {file_format}")
+        writer = None
+        if file_format == "csv":
+            writer = csv.DictWriter(file, RESULT_FIELDS)
+            writer.writeheader()
+        written = 0
+        for record in self.iter_results(exam_ids):
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                file.write(json.dumps(record) + "\n")
+            written += 1
+        return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report on exam results.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = commands.add_parser(
+        "summary", help="Score distribution and item statistics from the aggregates"
+    )
+    summary_parser.add_argument("exam_ids", type=int, nargs="+")
+
+    rebuild_parser = commands.add_parser(
+        "rebuild", help="Recompute the aggregates from stored answers"
+    )
+    rebuild_parser.add_argument("--exam", type=int, dest="exam_id")
+
+    export_parser = commands.add_parser(
+        "export", help="Write every completed attempt to a CSV or JSONL file"
+    )
+    export_parser.add_argument("path", help="output file, or - for stdout")
+    export_parser.add_argument("--format", choices=("csv", "jsonl"))
+    export_parser.add_argument("--exam", type=int, action="append", dest="exam_ids")
+
+    items_parser = commands.add_parser(
+        "items", help="Item analysis (point-biserial, distractors, KR-20) over stored answers"
+    )
+    items_parser.add_argument("exam_ids", type=int, nargs="+")
+    items_parser.add_argument("--workers", type=int, default=1, help="exams analysed in parallel")
+    items_parser.add_argument("--chunk-size", type=int, help="answers fetched per round trip")
+    items_parser.add_argument("--json", action="store_true", help="print one JSON report per line")
+    args = parser.parse_args(argv)
+
+    database_manager = DatabaseManager()
+    try:
+        if args.command == "rebuild":
+            counted = ResultsAnalytics(database_manager).rebuild(args.exam_id)
+            print(f"Rebuilt aggregates from {counted} attempts")
+        elif args.command == "export":
+            return _export(ResultsAnalytics(database_manager), args)
+        elif args.command == "items":
+            _print_item_reports(database_manager, args)
+        else:
+            _print_summaries(ResultsAnalytics(database_manager), args.exam_ids)
+    finally:
+        database_manager.close()
+    return 0
+
+
+def _export(analytics: ResultsAnalytics, args) -> int:
+    file_format = args.format or ("jsonl" if args.path.endswith(".jsonl") else "csv")
+    if args.path == "-":
+        analytics.export_results(sys.stdout, file_format, args.exam_ids)
+        return 0
+    with open(args.path, "w", encoding="utf-8", newline="") as file:
+        written = analytics.export_results(file, file_format, args.exam_ids)
+    print(f"Exported {written:,} results to {args.path}")
+    return 0
+
+
+def _print_summaries(analytics: ResultsAnalytics, exam_ids: Sequence[int]) -> None:
+    for exam_id in exam_ids:
+        summary = analytics.exam_summary(exam_id)
+        if summary is None:
+            print(f"Exam {exam_id}: no completed attempts")
+            continue
+        print(
+            f"Exam {exam_id}: {summary.attempts} attempts, mean {summary.mean:.2f}"
+            f"/{summary.max_points} ({summary.mean_percentage:.1f}%), sd {summary.stdev:.2f}"
+        )
+        for bucket, count in enumerate(summary.histogram):
+            print(f"  {bucket * 10:>3}-{bucket * 10 + 10:<3}% {count:>6}")
+        for stats in analytics.question_stats(exam_id):
+            discrimination = (
+                "-" if stats.discrimination is None else f"{stats.discrimination:+.2f}"
+            )
+            print(f"  Q{stats.question_id}\tp={stats.p_value:.2f}\tr_pb={discrimination}")
+
+
+def _print_item_reports(database_manager: DatabaseManager, args) -> None:
+    from .item_analysis import analyze_exams
+
+    for report in analyze_exams(database_manager, args.exam_ids, args.workers, args.chunk_size):
+        if args.json:
+            print(json.dumps(report.to_dict()))
+            continue
+        kr20 = "-" if report.kr20 is None else f"{report.kr20:.3f}"
+        print(
+            f"Exam {report.exam_id}: {report.attempts} attempts, KR-20 {kr20} "
+            f"({report.elapsed:.2f}s)"
+        )
+        for item in report.items:
+            r_pb = "-" if item.point_biserial is None else f"{item.point_biserial:+.2f}"
+            chosen = " ".join(
+                f"{'*' if option == item.correct_answer else ''}{option + 1}:{count}"
+                for option, count in enumerate(item.distractors)
+            )
+            print(
+                f"  Q{item.question_id}\tp={item.p_value:.2f}\tr_pb={r_pb}\t{chosen}"
+                f"\tomitted:{item.omitted}"
+            )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+"""
+Headless command line for scripted operations.
+
+Runs one command and exits with its status code, without the interactive
+rich UI, so cron jobs and provisioning scripts can drive PyExam:
+
+    pyexam db migrate
+    pyexam users import PATH [--format csv|jsonl]
+    pyexam exams import|export PATH [...]
+    pyexam exams publish EXAM_ID [...]
+    pyexam exams regrade EXAM_ID
+    pyexam results export PATH [--format csv|jsonl] [--exam ID]
+    pyexam results summary|items|rebuild [...]
+    pyexam serve [--host H] [--port P] [--unix PATH]
+    pyexam bench [NAME [ARGS ...]]
+
+Each command forwards its arguments to the `main()` of the module that
+implements it, which is imported only when that command runs. Installing
+the project provides this as the `pyexam` command; running main.py with
+arguments also goes through here, and without them it starts the
+interactive application.
+
+Exit status: 0 on success, 1 when the command reports failures or raises,
+2 on usage errors, 130 when interrupted.
+"""
+
+import argparse
+import importlib
+import os
+import runpy
+import sys
+from typing import Optional, Sequence
+
+BENCHMARKS = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks")
+)
+
+# group -> command -> (module, leading arguments, help)
+COMMANDS: dict[str, dict[str, tuple[str, list[str], str]]] = {
+    "users": {
+        "import": ("src.user.user_importer", [], "Bulk import users from CSV or JSONL"),
+    },
+    "exams": {
+        "import": ("src.exams.exam_bank", ["import"], "Load exams from a bank file"),
+        "export": ("src.exams.exam_bank", ["export"], "Write exams to a bank file"),
+        "publish": ("src.exams.exam_snapshot", [], "Publish exams as snapshot files"),
+        "regrade": ("src.exams.grading", [], "Regrade an exam against its current key"),
+    },
+    "results": {
+        "export": ("src.exams.results_analytics", ["export"], "Export completed attempts"),
+        "summary": ("src.exams.results_analytics", ["summary"], "Score distributions"),
+        "items": ("src.exams.results_analytics", ["items"], "Item analysis"),
+        "rebuild": ("src.exams.results_analytics", ["rebuild"], "Recompute aggregates"),
+    },
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pyexam", description="Run PyExam operations without the interactive UI."
+    )
+    groups = parser.add_subparsers(dest="group", required=True)
+
+    db_parser = groups.add_parser("db", help="Database maintenance")
+    db_commands = db_parser.add_subparsers(dest="command", required=True)
+    db_commands.add_parser("migrate", help="Create or upgrade the schema")
+
+    for group, commands in COMMANDS.items():
+        group_parser = groups.add_parser(group, help=f"{group.capitalize()} commands")
+        subcommands = group_parser.add_subparsers(dest="command", required=True)
+        for name, (_, _, help_text) in commands.items():
+            # The module's own parser handles the arguments, including --help
+            subcommands.add_parser(name, help=help_text, add_help=False)
+
+    groups.add_parser("serve", help="Run the exam server", add_help=False)
+    bench_parser = groups.add_parser(
+        "bench", help="Run a benchmark from benchmarks/", add_help=False
+    )
+    bench_parser.add_argument("name", nargs="?", help="e.g. exam_load; omit to list them")
+    return parser
+
+
+def list_benchmarks() -> list[str]:
+    if not os.path.isdir(BENCHMARKS):
+        return []
+    return sorted(
+        name[len("bench_"):-len(".py")]
+        for name in os.listdir(BENCHMARKS)
+        if name.startswith("bench_") and name.endswith(".py")
+    )
+
+
+def _exit_code(code) -> int:
+    """Map a main() return value or SystemExit code to a process status."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_module(module_name: str, argv: list[str]) -> int:
+    module = importlib.import_module(module_name)
+    try:
+        return _exit_code(module.main(argv))
+    except SystemExit as e:
+        return _exit_code(e.code)
+
+
+def run_benchmark(name: Optional[str], argv: list[str]) -> int:
+    available = list_benchmarks()
+    if name is None:
+        print("\n".join(available))
+        return 0
+    if name not in available:
+        print(
+            f"pyexam: unknown benchmark {name!r}; choose from {', '.join(available)}",
+            file=sys.stderr,
+        )
+        return 2
+    path = os.path.join(BENCHMARKS, f"bench_{name}.py")
+    # Benchmarks parse sys.argv themselves
+    saved_argv = sys.argv
+    sys.argv = [path, *argv]
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        return _exit_code(e.code)
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = build_parser()
+    # Only the group and command are parsed here; the rest is forwarded as is,
+    # wherever it appeared on the command line
+    args, extra = parser.parse_known_args(argv)
+    if args.group == "db" and extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    try:
+        if args.group == "bench":
+            return run_benchmark(args.name, extra)
+
+        from src.utils.database_setup import setup_database
+
+        setup_database(verbose=args.group == "db")
+        if args.group == "db":
+            return 0
+        if args.group == "serve":
+            return run_module("src.interface.server", extra)
+        module_name, leading, _ = COMMANDS[args.group][args.command]
+        return run_module(module_name, leading + extra)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"pyexam: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
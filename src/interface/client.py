@@ -0,0 +1,138 @@
+"""
+Thin terminal client for the exam server.
+
+Speaks the server's JSON line protocol (see src.interface.server) and does
+nothing but prompt and print, so it starts instantly and holds no database
+connection, cache or engine of its own.
+
+Usage:
+    python -m src.interface.client [--host 127.0.0.1] [--port 8765] [--unix PATH]
+"""
+
+import argparse
+import getpass
+import json
+import socket
+from typing import Optional, Sequence
+
+from src.utils.config import get_config
+
+
+class ServerError(Exception):
+    """The server answered a request with ok = false."""
+
+
+class ExamClient:
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    @classmethod
+    def connect(
+        cls, host: Optional[str] = None, port: Optional[int] = None, unix: Optional[str] = None
+    ) -> "ExamClient":
+        if unix:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(unix)
+        else:
+            sock = socket.create_connection((host, port))
+        return cls(sock)
+
+    def request(self, op: str, **fields) -> dict:
+        self._file.write(json.dumps({"op": op, **fields}).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        response = json.loads(line)
+        if not response.pop("ok"):
+            raise ServerError(response["error"])
+        return response
+
+    def close(self) -> None:
+        try:
+            self.request("quit")
+        except (OSError, ServerError):
+            pass
+        self._file.close()
+        self._sock.close()
+
+
+def run(client: ExamClient, input_source=input) -> None:
+    """Interactive loop: log in, pick exams and answer their questions."""
+    while True:
+        username = input_source("Username: ").strip()
+        try:
+            client.request("login", username=username, password=getpass.getpass("Password: "))
+            break
+        except ServerError as e:
+            print(e)
+
+    while True:
+        after_id = 0
+        while True:
+            page = client.request("exams", after_id=after_id)
+            for exam in page["exams"]:
+                print(
+                    f"{exam['exam_id']:>5}  {exam['name']} ({exam['date']}, "
+                    f"{exam['duration']} min, {exam['questions_count']} questions)"
+                )
+            if not page["more"] or input_source("More exams? (y/n) ").lower() not in ("y", "yes"):
+                break
+            after_id = page["exams"][-1]["exam_id"]
+
+        choice = input_source("Exam ID to take (blank to quit): ").strip()
+        if not choice:
+            return
+        try:
+            response = client.request("start", exam_id=choice)
+        except ServerError as e:
+            print(e)
+            continue
+        print(f"\n{response['exam']['name']}: {response['total']} questions")
+        if response["answered"]:
+            print(f"Resuming, {response['answered']} already answered")
+
+        while "question" in response:
+            question = response["question"]
+            print(f"\nQ{question['number']}. {question['text']}")
+            for number, option in enumerate(question["options"], 1):
+                print(f"  {number}. {option}")
+            try:
+                response = client.request("answer", choice=input_source("Your answer: "))
+            except ServerError as e:
+                print(e)
+                response = {"question": question}
+
+        result = response["result"]
+        print(
+            f"\nCorrect: {result['correct']}/{result['total']}  "
+            f"Points: {result['points']}/{result['max_points']}  "
+            f"Score: {result['percentage']}%\n"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    settings = get_config().section("SERVER")
+    parser = argparse.ArgumentParser(description="Take exams on an exam server.")
+    parser.add_argument("--host", default=settings["host"])
+    parser.add_argument("--port", type=int, default=settings["port"])
+    parser.add_argument("--unix", default=settings["unix_socket"])
+    args = parser.parse_args(argv)
+
+    try:
+        client = ExamClient.connect(args.host, args.port, args.unix)
+    except OSError as e:
+        print(f"Could not reach the exam server: {e}")
+        return 1
+    try:
+        run(client)
+    except (KeyboardInterrupt, EOFError):
+        print()
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
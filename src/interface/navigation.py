@@ -1,30 +1,64 @@
-from typing import NoReturn, Optional, Dict, Any
+from functools import cached_property
+from typing import TYPE_CHECKING, NoReturn, Optional, Dict, Any
 from src.auth.auth_manager import AuthManager
 from src.interface.input_handler import InputHandler
-from src.exams.exam_manager import ExamManager
 from src.storage.database_manager import DatabaseManager
 from src.user.user_manager import UserManager
 from src.utils.logger import Logger
 from src.interface.ui_manager import UIManager
 
+if TYPE_CHECKING:
+    from src.exams.exam_manager import ExamManager
+
 
 class Navigation:
-    def __init__(self) -> None:
-        self.logger = Logger()
-        self.ui_manager = UIManager()
-        self.input_handler: InputHandler = InputHandler(input_source=input)
-        self.database_manager: DatabaseManager = DatabaseManager()
-        self.user_manager: UserManager = UserManager(
+    """
+    Interactive application flow.
+
+    The managers are built on first use rather than up front, so the first
+    menu appears before the database, exam caches and answer writer exist;
+    a student who only logs in never pays for the exam machinery.
+    """
+
+    @cached_property
+    def input_handler(self) -> InputHandler:
+        return InputHandler(input_source=input)
+
+    @cached_property
+    def logger(self) -> Logger:
+        return Logger()
+
+    @cached_property
+    def ui_manager(self) -> UIManager:
+        return UIManager()
+
+    @cached_property
+    def database_manager(self) -> DatabaseManager:
+        database_manager = DatabaseManager()
+        database_manager.check_performance_profile(self.logger)
+        return database_manager
+
+    @cached_property
+    def user_manager(self) -> UserManager:
+        return UserManager(
             ui_manager=self.ui_manager,
             database=self.database_manager,
             logger=self.logger,
         )
-        self.auth_manager: AuthManager = AuthManager(
+
+    @cached_property
+    def auth_manager(self) -> AuthManager:
+        return AuthManager(
             ui_manager=self.ui_manager,
             user_manager=self.user_manager,
             logger=self.logger,
         )
-        self.exam_manager: ExamManager = ExamManager(
+
+    @cached_property
+    def exam_manager(self) -> "ExamManager":
+        from src.exams.exam_manager import ExamManager
+
+        exam_manager = ExamManager(
             ui_manager=self.ui_manager,
             input_handler=self.input_handler,
             user_manager=self.user_manager,
@@ -32,7 +66,10 @@ class Navigation:
             logger=self.logger,
             auth_manager=self.auth_manager,
         )
-        self.logger.info("Navigation initialized.")
+        # Replays answers a previous run spooled but never committed
+        exam_manager.answer_writer.start()
+        self.logger.info("Exam manager initialized.")
+        return exam_manager
 
     def start(self) -> None:
         """Main application flow starting point"""
@@ -128,9 +165,7 @@ class Navigation:
 
     def add_exam(self) -> None:
         """Handle adding a new exam"""
-        user = self.auth_manager.get_current_user()
-
-        if not user or user.role != "admin":
+        if not self.auth_manager.has_role("admin"):
             self.ui_manager.show_error_notification(
                 "Only administrators can add exams."
             )
@@ -163,19 +198,70 @@ class Navigation:
 
     def view_exam_results(self) -> None:
         """View results of completed exams"""
-        # Implement exam results viewing logic here
-        # ...
-        pass
+        user = self.auth_manager.get_current_user()
+        if not user:
+            self.ui_manager.show_error_notification(
+                "You must be logged in to view results."
+            )
+            return
+
+        analytics = self.exam_manager.analytics
+        if user.role != "admin":
+            # Students see their own attempts
+            results = analytics.user_summary(user.username)
+            if not results:
+                self.ui_manager.show_info_notification("You have not completed any exams yet.")
+                return
+            for stats in results:
+                exam = self.exam_manager.get_exam(stats.exam_id)
+                name = exam.name if exam else f"Exam {stats.exam_id}"
+                self.ui_manager.show_info_notification(
+                    f"{name}: {stats.attempts} attempt(s), best {stats.best_score}, "
+                    f"last {stats.last_score} points"
+                )
+            return
+
+        # Administrators see an exam's score distribution and item statistics
+        try:
+            exam_id = int(self.input_handler.get_exam_id())
+        except ValueError:
+            self.ui_manager.show_error_notification("Please enter a valid exam ID.")
+            return
+        summary = analytics.exam_summary(exam_id)
+        if summary is None:
+            self.ui_manager.show_info_notification("No completed attempts for this exam yet.")
+            return
+        self.ui_manager.show_info_notification(
+            f"{summary.attempts} attempts, mean {summary.mean:.1f}/{summary.max_points} "
+            f"({summary.mean_percentage:.1f}%), standard deviation {summary.stdev:.1f}"
+        )
+        for bucket, count in enumerate(summary.histogram):
+            self.ui_manager.show_info_notification(
+                f"{bucket * 10:>3}-{bucket * 10 + 10}%: {'#' * count} {count}"
+            )
+        for stats in analytics.question_stats(exam_id):
+            discrimination = (
+                "n/a" if stats.discrimination is None else f"{stats.discrimination:+.2f}"
+            )
+            self.ui_manager.show_info_notification(
+                f"Question {stats.question_id}: {stats.p_value:.0%} correct, "
+                f"discrimination {discrimination}"
+            )
 
     def start_exam(self) -> None:
         """Start taking an exam"""
         # Check if user is logged in
-        if not self.auth_manager.get_current_user():
+        user = self.auth_manager.get_current_user()
+        if not user:
             self.ui_manager.show_error_notification(
                 "You must be logged in to take an exam."
             )
             return
 
+        # Offer to pick up an attempt that was interrupted
+        if self.resume_exam(user.username):
+            return
+
         # Display available exams
         exams = self.exam_manager.list_exams()
         if not exams:
@@ -199,6 +285,22 @@ class Navigation:
         if result_data:
             self.ui_manager.show_exam_results(result_data)
 
+    def resume_exam(self, username: str) -> bool:
+        """Resume the user's unfinished exam if they want to; True if resumed"""
+        sessions = self.exam_manager.exam_sessions
+        session = sessions.find_open(username)
+        if session is None:
+            return False
+        exam = self.exam_manager.get_exam(session.exam_id)
+        if exam and self.ui_manager.confirm_action(
+            f"You have an unfinished attempt at '{exam.name}' "
+            f"({session.answered} answered). Resume it?"
+        ):
+            self.exam_manager.take_exam(session.exam_id)
+            return True
+        sessions.abandon(session)
+        return False
+
     # ----- User Management Functions -----
 
     def register_admin_user(self) -> None:
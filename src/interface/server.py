@@ -0,0 +1,330 @@
+"""
+Multi-user exam server.
+
+One process hosts a single engine (database pool, caches, session and exam
+managers, password hasher) and serves many terminal clients over TCP or a
+Unix socket, instead of every student running their own cold copy of the
+application.
+
+The protocol is newline-delimited JSON. Each request is an object with an
+"op" field; each response has "ok" and, on failure, "error":
+
+    {"op": "login", "username": ..., "password": ...}  -> token, role
+    {"op": "resume", "token": ...}                     -> username, role
+    {"op": "exams", "after_id": 0}                     -> exams, more
+    {"op": "start", "exam_id": ...}                    -> exam, total, answered, question
+    {"op": "answer", "choice": 1}                      -> question, or result when done
+    {"op": "logout"} / {"op": "quit"}
+
+Blocking work (SQLite, password hashing) runs off the event loop, on the
+default executor and the hasher's worker pool respectively.
+
+Usage:
+    python -m src.interface.server [--host 127.0.0.1] [--port 8765] [--unix PATH]
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Optional, Sequence
+
+from src.auth.auth_manager import AuthManager
+from src.auth.password_hasher import PasswordHasher
+from src.auth.session_manager import SessionManager
+from src.exams.exam_manager import ExamManager
+from src.exams.exam_session import ExamSession
+from src.exams.grading import AnswerKey, grade
+from src.storage.database_manager import DatabaseManager
+from src.user.user import User
+from src.user.user_manager import UserManager
+from src.utils.config import get_config
+from src.utils.database_setup import setup_database
+from src.utils.logger import Logger
+
+# Longest request line accepted from a client
+MAX_LINE = 64 * 1024
+
+
+class RequestError(Exception):
+    """A request the server refuses; the message is sent to the client."""
+
+
+class Engine:
+    """The managers shared by every connection."""
+
+    def __init__(
+        self,
+        database_manager: Optional[DatabaseManager] = None,
+        hasher: Optional[PasswordHasher] = None,
+    ) -> None:
+        self.logger = Logger()
+        self.database_manager = database_manager or DatabaseManager()
+        self.hasher = hasher or PasswordHasher.from_settings(get_config().section("AUTH"))
+        # There is no terminal UI to report to in server mode
+        self.user_manager = UserManager(None, self.database_manager, self.logger)
+        self.sessions = SessionManager(
+            self.user_manager,
+            self.database_manager,
+            **get_config().section("SESSIONS"),
+        )
+        self.exam_manager = ExamManager(
+            ui_manager=None,
+            input_handler=None,
+            user_manager=self.user_manager,
+            database_manager=self.database_manager,
+            logger=self.logger,
+            auth_manager=None,
+        )
+
+    def close(self) -> None:
+        self.exam_manager.close()
+        self.hasher.shutdown()
+        self.database_manager.close()
+
+
+class Connection:
+    """Per-client state: who is logged in and the attempt in progress."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        # Logins go through AuthManager so hash upgrades live in one place
+        self.auth = AuthManager(
+            None, engine.user_manager, engine.logger, engine.hasher, engine.sessions
+        )
+        self.user: Optional[User] = None
+        self.token: Optional[str] = None
+        self.attempt: Optional[ExamSession] = None
+        self.questions: list = []
+        self.answers: dict = {}
+
+    async def handle(self, request: dict) -> dict:
+        handler = getattr(self, f"op_{request.get('op')}", None)
+        if handler is None:
+            raise RequestError(f"Unknown op: {request.get('op')!r}")
+        return await handler(request)
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def _require_user(self) -> User:
+        if self.user is None or self.engine.sessions.get(self.token) is None:
+            self.user = self.token = None
+            raise RequestError("Not logged in")
+        return self.user
+
+    # ----- Authentication -----
+    async def op_login(self, request: dict) -> dict:
+        username, password = request.get("username"), request.get("password")
+        if not isinstance(username, str) or not isinstance(password, str):
+            raise RequestError("username and password are required")
+        # The executor thread only waits: hashing runs on the hasher's pool
+        if not await self._run(self.auth.login, username, password):
+            raise RequestError("Invalid username or password")
+        self.user, self.token = self.auth.get_current_user(), self.auth.session_token
+        self.engine.logger.info(f"Server login: {username}")
+        return {"token": self.token, "role": self.user.role}
+
+    async def op_resume(self, request: dict) -> dict:
+        token = request.get("token")
+        if not isinstance(token, str) or not await self._run(self.auth.resume_session, token):
+            raise RequestError("Session expired or unknown")
+        self.user, self.token = self.auth.get_current_user(), token
+        return {"username": self.user.username, "role": self.user.role}
+
+    async def op_logout(self, request: dict) -> dict:
+        if self.token:
+            await self._run(self.auth.logout)
+        self.user = self.token = self.attempt = None
+        return {}
+
+    # ----- Exams -----
+    async def op_exams(self, request: dict) -> dict:
+        self._require_user()
+        try:
+            after_id = int(request.get("after_id", 0))
+        except (TypeError, ValueError):
+            raise RequestError("after_id must be an exam ID")
+        pages = self.engine.exam_manager.iter_exam_pages(after_id=after_id)
+        page = await self._run(next, pages, [])
+        return {
+            "exams": [_exam_dict(exam) for exam in page],
+            "more": len(page) == self.engine.exam_manager.page_size,
+        }
+
+    async def op_start(self, request: dict) -> dict:
+        user = self._require_user()
+        try:
+            exam_id = int(request.get("exam_id", 0))
+        except (TypeError, ValueError):
+            raise RequestError("exam_id must be an exam ID")
+        exam, questions = await self._run(self.engine.exam_manager.load_exam, exam_id)
+        if exam is None:
+            raise RequestError(f"Exam with ID {exam_id} not found")
+        if not questions:
+            raise RequestError("This exam has no questions")
+
+        exam_sessions = self.engine.exam_manager.exam_sessions
+        attempt = await self._run(exam_sessions.start, user.username, exam_id)
+        answers = await self._run(exam_sessions.answers, attempt) if attempt.answered else {}
+        self.attempt, self.questions, self.answers = attempt, questions, answers
+        return {
+            "exam": _exam_dict(exam),
+            "total": len(questions),
+            "answered": len(answers),
+            **await self._next_question(),
+        }
+
+    async def op_answer(self, request: dict) -> dict:
+        user = self._require_user()
+        if self.attempt is None:
+            raise RequestError("No exam in progress")
+        question = self._current_question()
+        try:
+            choice = int(request.get("choice"))
+        except (TypeError, ValueError):
+            raise RequestError("choice must be an option number")
+        if not 1 <= choice <= len(question.options):
+            raise RequestError(f"choice must be between 1 and {len(question.options)}")
+
+        manager = self.engine.exam_manager
+        answer = await self._run(manager.new_answer, question, choice - 1, user.username)
+        # Checkpointing only appends to the spool; the commit is write-behind
+        await self._run(manager.exam_sessions.checkpoint, self.attempt, answer)
+        self.answers[question.question_id] = answer
+        return await self._next_question()
+
+    async def op_quit(self, request: dict) -> dict:
+        return {"bye": True}
+
+    def _current_question(self):
+        for question in self.questions:
+            if question.question_id not in self.answers:
+                return question
+        return None
+
+    async def _next_question(self) -> dict:
+        question = self._current_question()
+        if question is not None:
+            return {
+                "question": {
+                    "number": self.questions.index(question) + 1,
+                    "text": question.text,
+                    "options": question.options,
+                }
+            }
+
+        report = grade(
+            AnswerKey.from_questions(self.questions),
+            [[self.answers[q.question_id].user_answer for q in self.questions]],
+        )
+        await self._run(
+            self.engine.exam_manager.exam_sessions.complete,
+            self.attempt,
+            self.questions,
+            list(self.answers.values()),
+        )
+        self.attempt = None
+        return {
+            "result": {
+                "correct": report.correct_counts[0],
+                "total": len(self.questions),
+                "points": report.earned_points[0],
+                "max_points": report.total_points,
+                "percentage": round(report.percentages[0], 1),
+            }
+        }
+
+
+def _exam_dict(exam) -> dict:
+    data = exam.to_dict()
+    # created_by may be a User rather than a username
+    data["created_by"] = str(getattr(data["created_by"], "username", data["created_by"]))
+    return data
+
+
+class ExamServer:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.connections = 0
+
+    async def serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = Connection(self.engine)
+        self.connections += 1
+        try:
+            while line := await reader.readline():
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise RequestError("Requests must be JSON objects")
+                    response = {"ok": True, **await connection.handle(request)}
+                except (RequestError, ValueError) as e:
+                    response = {"ok": False, "error": str(e)}
+                except Exception as e:
+                    self.engine.logger.error(f"Server request failed: {e}")
+                    response = {"ok": False, "error": "Internal error"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                if isinstance(request, dict) and request.get("op") == "quit":
+                    break
+        except ValueError:
+            # readline() raises this for a line over MAX_LINE; the stream cannot
+            # be resynchronised, so answer once and hang up
+            self.engine.logger.warning("Server request over the size limit; closing connection")
+            refusal = {"ok": False, "error": "Request too long"}
+            try:
+                writer.write(json.dumps(refusal).encode() + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(
+        self, host: Optional[str] = None, port: Optional[int] = None, unix: Optional[str] = None
+    ) -> asyncio.Server:
+        if unix:
+            return await asyncio.start_unix_server(self.serve_client, unix, limit=MAX_LINE)
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+
+
+async def serve(host: Optional[str], port: Optional[int], unix: Optional[str]) -> None:
+    engine = Engine()
+    # Replays answers a previous run spooled but never committed
+    engine.exam_manager.answer_writer.start()
+    server = await ExamServer(engine).start(host, port, unix)
+    where = unix or ", ".join(str(s.getsockname()) for s in server.sockets)
+    engine.logger.info(f"Exam server listening on {where}")
+    print(f"Exam server listening on {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        engine.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    settings = get_config().section("SERVER")
+    parser = argparse.ArgumentParser(description="Serve exams to many terminal clients.")
+    parser.add_argument("--host", default=settings["host"])
+    parser.add_argument("--port", type=int, default=settings["port"])
+    parser.add_argument(
+        "--unix", default=settings["unix_socket"], help="Listen on a Unix socket instead"
+    )
+    args = parser.parse_args(argv)
+
+    setup_database()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
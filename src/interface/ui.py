@@ -1,14 +1,8 @@
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
-from rich.text import Text
-from rich import box
-from rich.align import Align
-from rich.table import Table
-from rich.layout import Layout
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from datetime import datetime
 
+# rich is imported inside the methods that draw, so importing this module is
+# cheap and each widget is only loaded once a screen actually uses it
+
 MAIN_MENU_OPTIONS = {
     "1": "Login",
     "2": "Register",
@@ -59,11 +53,15 @@ class UI:
         return cls._isinstance
 
     def __init__(self) -> None:
+        from rich.console import Console
+
         self.console = Console()
         self.show_welcome_banner()
 
     def show_welcome_banner(self) -> None:
         """Display a welcome banner when the application starts"""
+        from rich.align import Align
+
         self.console.clear()
         self.console.print()
         banner = """
@@ -87,6 +85,10 @@ class UI:
 
     # ----- Section Headers -----
     def print_title(self, title: str, color="cyan") -> None:
+        from rich.panel import Panel
+        from rich.text import Text
+        from rich import box
+
         panel = Panel(
             Text(title, style="bold"),
             style=f"bold {color}",
@@ -97,6 +99,10 @@ class UI:
         self.console.print(panel)
 
     def print_title_center(self, title: str, color="cyan") -> None:
+        from rich.align import Align
+        from rich.panel import Panel
+        from rich import box
+
         panel = Panel(
             Align.center(f"[bold]{title}[/bold]"),
             style=f"bold {color}",
@@ -111,9 +117,13 @@ class UI:
 
     # ----- Input Prompts -----
     def ask_input(self, message: str) -> str:
+        from rich.prompt import Prompt
+
         return Prompt.ask(f"[bold magenta]{message}[/bold magenta]")
 
     def ask_password(self, message: str) -> str:
+        from rich.prompt import Prompt
+
         return Prompt.ask(f"[bold magenta]{message}[/bold magenta]", password=True)
 
     # ----- Standardized Messages -----
@@ -128,6 +138,8 @@ class UI:
 
     def show_loading(self, message: str) -> None:
         """Show a loading spinner with message"""
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]{task.description}"),
@@ -148,6 +160,8 @@ class UI:
         Returns:
             A Rich Table object formatted for menu display
         """
+        from rich.table import Table
+        from rich import box
 
         table = Table(show_header=False, box=box.ROUNDED, border_style="blue")
         table.add_column("Option", style="cyan")
@@ -159,6 +173,9 @@ class UI:
         return table
 
     def show_main_menu(self) -> None:
+        from rich.table import Table
+        from rich import box
+
         self.console.clear()
         self.print_title("Welcome to PyExam!", color="blue")
         table = Table(show_header=False, box=box.ROUNDED, border_style="blue")
@@ -172,6 +189,9 @@ class UI:
         self.print_divider()
 
     def show_post_login_menu(self, is_admin=False) -> None:
+        from rich.table import Table
+        from rich import box
+
         self.console.clear()
         role = "Administrator" if is_admin else "Student"
         self.print_title(f"{role} Menu", color="blue")
@@ -191,6 +211,8 @@ class UI:
         self.print_divider()
 
     def show_exit_message(self) -> None:
+        from rich.align import Align
+
         self.console.clear()
         farewell = """
         ┌───────────────────────────────────────┐
@@ -237,6 +259,11 @@ class UI:
     def get_mcq_question(
         self, question_no: int, total_questions: int, question: str, choices: list
     ) -> None:
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+        from rich import box
+
         self.console.clear()
         progress = f"{question_no}/{total_questions}"
         self.console.rule(
@@ -265,6 +292,9 @@ class UI:
         self.console.print(f"You chose: [bold yellow]{choice}[/bold yellow]")
 
     def get_navigation_between_questions(self) -> None:
+        from rich.panel import Panel
+        from rich import box
+
         nav_panel = Panel(
             "[P] Previous   [N] Next   [M] Mark for Review   [S] Submit",
             style="bold yellow",
@@ -274,6 +304,9 @@ class UI:
 
     # ----- User Profile -----
     def show_profile(self, user):
+        from rich.table import Table
+        from rich import box
+
         self.console.clear()
         self.print_title("User Profile", color="magenta")
 
@@ -299,6 +332,9 @@ class UI:
     def show_exam_results(
         self, exam_name, correct_count, total_questions, earned_points, total_points
     ):
+        from rich.table import Table
+        from rich import box
+
         self.console.clear()
         self.print_title("Exam Results", color="blue")
 
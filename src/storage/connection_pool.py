@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+
+from .sqllite_database import SQLiteDatabase
+
+
+class ConnectionPool:
+    """
+    A bounded pool of long-lived SQLite connections.
+
+    Connections are opened lazily, up to ``size`` of them, and handed back to
+    the pool when a transaction finishes instead of being closed. A thread
+    that re-enters the pool while it already holds a connection gets the same
+    one back, so nested ``with`` blocks share a single transaction.
+
+    Counters:
+    - opens: connections actually created with sqlite3.connect
+    - reuses: acquisitions served by an already open connection
+    - wait_time: total seconds spent blocked waiting for a free connection
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        db_path: str,
+        size: int = 5,
+        timeout: float = 30.0,
+        pragmas: dict | None = None,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_name = db_name
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[SQLiteDatabase] = queue.LifoQueue()
+        self._all: list[SQLiteDatabase] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.opens = 0
+        self.reuses = 0
+        self.wait_time = 0.0
+
+    def acquire(self) -> SQLiteDatabase:
+        """Check out a connection for the calling thread."""
+        held = getattr(self._local, "db", None)
+        if held is not None:
+            self._local.depth += 1
+            with self._lock:
+                self.reuses += 1
+            return held
+
+        db = self._checkout()
+        self._local.db = db
+        self._local.depth = 1
+        return db
+
+    def release(self, db: SQLiteDatabase) -> None:
+        """Give a connection back once the outermost scope using it is done."""
+        if getattr(self._local, "db", None) is not db:
+            raise RuntimeError("Connection released by a thread that does not hold it")
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.db = None
+        self._idle.put(db)
+
+    def held(self) -> SQLiteDatabase | None:
+        """Returns the connection held by the calling thread, if any."""
+        return getattr(self._local, "db", None)
+
+    def depth(self) -> int:
+        """Returns how many nested scopes the calling thread has open."""
+        return getattr(self._local, "depth", 0) if self.held() else 0
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the pool counters."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": len(self._all),
+                "idle": self._idle.qsize(),
+                "opens": self.opens,
+                "reuses": self.reuses,
+                "wait_time": self.wait_time,
+            }
+
+    def close(self) -> None:
+        """Close every idle connection; connections still checked out are left alone."""
+        with self._lock:
+            while True:
+                try:
+                    db = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                db.close()
+                self._all.remove(db)
+
+    def _checkout(self) -> SQLiteDatabase:
+        try:
+            db = self._idle.get_nowait()
+            with self._lock:
+                self.reuses += 1
+            return db
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.size:
+                db = SQLiteDatabase(self.db_name, self.db_path, self.pragmas)
+                db.connect()
+                self._all.append(db)
+                self.opens += 1
+                return db
+
+        # Pool exhausted: block until another thread releases a connection
+        started = time.perf_counter()
+        try:
+            db = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available after {self.timeout} seconds"
+            )
+        finally:
+            with self._lock:
+                self.wait_time += time.perf_counter() - started
+        with self._lock:
+            self.reuses += 1
+        return db
@@ -9,10 +9,18 @@ class Database(ABC):
     def execute(self, query: str, params: tuple = ()):
         pass
 
+    @abstractmethod
+    def executemany(self, query: str, params_seq):
+        pass
+
     @abstractmethod
     def fetchall(self):
         pass
 
+    @abstractmethod
+    def fetchmany(self, size: int):
+        pass
+
     @abstractmethod
     def fetchone(self):
         pass
@@ -21,6 +29,10 @@ class Database(ABC):
     def commit(self):
         pass
 
+    @abstractmethod
+    def rollback(self):
+        pass
+
     @abstractmethod
     def close(self):
         pass
@@ -1,39 +1,131 @@
-import json
-from .sqllite_database import SQLiteDatabase
+from itertools import batched
+from typing import Iterable
+from .connection_pool import ConnectionPool
+from src.utils.config import CONFIG_PATH, Config, get_config
+from src.utils.logger import Logger
 
-PATH = "config/database.json"
+PATH = CONFIG_PATH
+
+# How SQLite reports keyword pragmas when they are read back
+_PRAGMA_KEYWORDS = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
 
 
 class DatabaseManager:
-    def __init__(self):
-        self.database_name = self.retrieve_database_settings("db_name")
-        self.database_path = self.retrieve_database_settings("path")
-        self.db = SQLiteDatabase(self.database_name, self.database_path)
-        self.db.connect()
+    def __init__(self, database_path: str | None = None):
+        config = get_config()
+        settings = config.section("DATABASE")
+        self.database_name = settings["db_name"]
+        self.database_path = database_path or settings["path"]
+        self.pool = ConnectionPool(
+            self.database_name,
+            self.database_path,
+            size=settings["pool_size"],
+            timeout=settings["pool_timeout"],
+            pragmas=config.section("PERFORMANCE_PROFILE"),
+        )
+        self.batch_size = settings["batch_size"]
 
     def __enter__(self):
-        self.db.connect()
+        # Each outermost `with` block is one transaction on a pooled connection
+        self.pool.acquire()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if exc_type is None:
-            self.db.commit()
-        else:
-            print("An error occurred:", exc_value)
-        self.db.close()
+        db = self.db
+        # Only the outermost block ends the transaction
+        if self.pool.depth() == 1:
+            if exc_type is None:
+                db.commit()
+            else:
+                # The exception still propagates; this only records the rollback,
+                # away from stdout, which headless commands use for their output
+                Logger().warning(f"Transaction rolled back: {exc_value!r}")
+                db.rollback()
+        self.pool.release(db)
+
+    @property
+    def db(self):
+        """The connection held by the calling thread inside a `with` block."""
+        db = self.pool.held()
+        if db is None:
+            raise RuntimeError("DatabaseManager must be used inside a `with` block")
+        return db
 
     def execute(self, query: str, params: tuple = ()):
         self.db.execute(query, params)
 
+    def executemany(
+        self, query: str, rows: Iterable[tuple], batch_size: int | None = None
+    ) -> int:
+        """
+        Run one statement for many parameter rows in a single transaction.
+
+        Rows are consumed lazily and sent to SQLite in chunks of `batch_size`
+        (defaults to the configured batch size), so generators of any length
+        can be written without being materialised first.
+
+        Returns:
+            The number of rows SQLite reports as changed (rows skipped by
+            INSERT OR IGNORE are not counted).
+        """
+        batch_size = batch_size or self.batch_size
+        written = 0
+        with self:
+            for batch in batched(rows, batch_size):
+                written += self.db.executemany(query, batch)
+        return written
+
     def fetchall(self):
         return self.db.fetchall()
 
+    def fetchmany(self, size: int | None = None):
+        return self.db.fetchmany(size or self.batch_size)
+
     def fetchone(self):
         return self.db.fetchone()
 
+    def pool_stats(self) -> dict:
+        """Returns connection pool counters (opens, reuses, wait time)."""
+        return self.pool.stats()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def check_performance_profile(self, logger) -> dict:
+        """
+        Log the pragmas SQLite actually applied and warn where they differ
+        from the configured performance profile (e.g. WAL is unavailable
+        for in-memory databases, mmap_size is capped at compile time).
+        """
+        with self:
+            effective = self.db.effective_pragmas()
+
+        logger.info(f"SQLite performance profile in effect: {effective}")
+        for name, wanted in self.pool.pragmas.items():
+            actual = effective.get(name)
+            if isinstance(wanted, str):
+                wanted = _PRAGMA_KEYWORDS.get(name, {}).get(wanted.upper(), wanted.lower())
+            if isinstance(actual, str):
+                actual = actual.lower()
+            if actual != wanted:
+                logger.warning(
+                    f"PRAGMA {name} is {actual!r}, performance profile asked for {wanted!r}"
+                )
+        return effective
+
     @staticmethod
-    def retrieve_database_settings(key: str, file_path: str = PATH) -> str:
-        with open(file_path, "r") as file:
-            data = json.load(file)
-            data = data["DATABASE"][key]
-        return data
+    def retrieve_database_settings(
+        key: str | None = None, file_path: str = PATH, section: str = "DATABASE"
+    ):
+        """
+        One setting, or a whole section, from the shared configuration.
+
+        Kept for existing callers; new code should use src.utils.config.get_config().
+        Only a `file_path` other than the default is read from disk again.
+        """
+        config = get_config() if file_path == PATH else Config.load(file_path)
+        data = config.section(section)
+        return data[key] if key is not None else data
@@ -0,0 +1,62 @@
+import threading
+
+
+class IdAllocator:
+    """
+    Hands out unique, increasing integer IDs for named sequences.
+
+    IDs are reserved from the `id_sequences` table in blocks of `block_size`
+    and then served from memory, so only one write per block reaches the
+    database. The reservation is a single UPDATE, which takes SQLite's write
+    lock, so several processes sharing the database never receive overlapping
+    blocks. IDs left unused in a block when a process exits are skipped.
+    """
+
+    def __init__(self, database_manager, block_size: int = 100) -> None:
+        if block_size < 1:
+            raise ValueError("Block size must be at least 1")
+        self.database_manager = database_manager
+        self.block_size = block_size
+        # sequence name -> [next id to hand out, first id past the block]
+        self._blocks: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def next_id(self, sequence: str) -> int:
+        """Return the next unused ID of a sequence (e.g. "answers")."""
+        with self._lock:
+            block = self._blocks.get(sequence)
+            if block is None or block[0] >= block[1]:
+                block = self._blocks[sequence] = self._reserve(sequence)
+            allocated = block[0]
+            block[0] += 1
+            return allocated
+
+    def reserve_range(self, sequence: str, count: int) -> range:
+        """
+        Reserve `count` consecutive IDs in one database round trip.
+
+        For bulk loads; the IDs bypass the in-memory block, which is left as is.
+        """
+        if count < 1:
+            return range(0)
+        start, end = self._reserve(sequence, count)
+        return range(start, end)
+
+    def _reserve(self, sequence: str, count: int | None = None) -> list[int]:
+        count = count or self.block_size
+        # The reservation must commit on its own: if it rode along in a
+        # caller's transaction and that rolled back, IDs already handed out
+        # from the block would be given out again
+        if self.database_manager.pool.depth():
+            raise RuntimeError("IDs must be reserved outside an open transaction")
+        with self.database_manager as db:
+            db.execute(
+                "UPDATE id_sequences SET next_id = next_id + ? WHERE name = ?",
+                (count, sequence),
+            )
+            db.execute("SELECT next_id FROM id_sequences WHERE name = ?", (sequence,))
+            row = db.fetchone()
+        if row is None:
+            raise KeyError(f"Unknown ID sequence: {sequence}")
+        end = row[0]
+        return [end - count, end]
@@ -1,29 +1,76 @@
 import sqlite3
 from .database import Database
 
+# Pragmas a performance profile may set, applied in this order.
+# journal_mode goes first because it can't change inside a transaction.
+PERFORMANCE_PRAGMAS = (
+    "journal_mode",
+    "synchronous",
+    "mmap_size",
+    "cache_size",
+    "temp_store",
+    "busy_timeout",
+)
+
+
 class SQLiteDatabase(Database):
-    def __init__(self, db_name: str, db_path: str):
+    def __init__(self, db_name: str, db_path: str, pragmas: dict | None = None):
         self.db_name = db_name
         self.db_path = db_path
+        self.pragmas = pragmas or {}
         self.conn = None
         self.cursor = None
 
     def connect(self):
-        self.conn = sqlite3.connect(self.db_path)
+        # Pooled connections are handed between threads, one holder at a time
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.cursor = self.conn.cursor()
+        self.apply_pragmas(self.pragmas)
+
+    def apply_pragmas(self, pragmas: dict) -> None:
+        """Apply performance pragmas to the open connection."""
+        for name in PERFORMANCE_PRAGMAS:
+            if name not in pragmas:
+                continue
+            value = pragmas[name]
+            # Pragma values can't be bound as parameters, so only accept
+            # plain integers and keywords such as WAL or NORMAL
+            if not isinstance(value, int) and not str(value).isidentifier():
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+            self.cursor.execute(f"PRAGMA {name} = {value}")
+            self.cursor.fetchall()
+
+    def effective_pragmas(self) -> dict:
+        """Read back the performance pragmas SQLite is actually using."""
+        settings = {}
+        for name in PERFORMANCE_PRAGMAS:
+            self.cursor.execute(f"PRAGMA {name}")
+            row = self.cursor.fetchone()
+            settings[name] = row[0] if row else None
+        return settings
 
     def execute(self, query: str, params: tuple = ()):
         self.cursor.execute(query, params)
 
+    def executemany(self, query: str, params_seq) -> int:
+        self.cursor.executemany(query, params_seq)
+        return self.cursor.rowcount
+
     def fetchall(self):
         return self.cursor.fetchall()
 
+    def fetchmany(self, size: int):
+        return self.cursor.fetchmany(size)
+
     def fetchone(self):
         return self.cursor.fetchone()
 
     def commit(self):
         self.conn.commit()
 
+    def rollback(self):
+        self.conn.rollback()
+
     def close(self):
         self.cursor.close()
         self.conn.close()
@@ -3,6 +3,8 @@ class User:
 
     VALID_ROLES = {"student", "admin"}
 
+    __slots__ = ("username", "_role", "_password_hash")
+
     def __init__(self, username: str, password_hash: str, role: str = "student"):
         self.username = username
         if role not in User.VALID_ROLES:
@@ -0,0 +1,230 @@
+"""
+Streaming bulk import of users from CSV or JSONL files.
+
+Each row needs a username and password and may give a role (defaults to
+student). Rows are read lazily in chunks; each chunk has its passwords
+hashed in parallel and is written with one batched INSERT transaction.
+Duplicate and invalid rows are reported and skipped rather than aborting
+the import.
+"""
+
+import argparse
+import csv
+import json
+import time
+from itertools import batched
+from typing import Iterator, Optional, Sequence
+
+from src.auth.password_hasher import PasswordHasher
+from src.storage.database_manager import DatabaseManager
+from src.user.user import User
+from src.utils.config import get_config
+
+
+class ImportReport:
+    """Outcome of a bulk import."""
+
+    __slots__ = ("imported", "duplicates", "invalid", "elapsed")
+
+    def __init__(self) -> None:
+        self.imported: int = 0
+        self.duplicates: list[str] = []
+        # (row number, reason)
+        self.invalid: list[tuple[int, str]] = []
+        self.elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+
+class UnreadableRow:
+    """Stands in for a JSONL line that is not valid JSON."""
+
+    __slots__ = ("reason",)
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+
+def read_rows(
+    path: str, file_format: Optional[str] = None
+) -> Iterator[dict | UnreadableRow]:
+    """
+    Yield one dict per user row from a .csv or .jsonl file.
+
+    JSONL lines that cannot be decoded are yielded as UnreadableRow, and
+    lines holding something other than an object as they are, so the
+    importer can report them.
+    """
+    file_format = file_format or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    with open(path, "r", newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+        elif file_format == "jsonl":
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield UnreadableRow(f"line {number}: invalid JSON ({e})")
+        else:
+            raise ValueError(f"Unsupported import format: {file_format}")
+
+
+class UserImporter:
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        password_hasher: PasswordHasher,
+        chunk_size: int = 1000,
+    ) -> None:
+        self.database_manager = database_manager
+        self.password_hasher = password_hasher
+        self.chunk_size = chunk_size
+
+    def import_rows(self, rows: Iterator[dict], on_chunk=None) -> ImportReport:
+        """
+        Import users from an iterable of row dicts.
+
+        Args:
+            rows: Dicts with username, password and optional role; anything
+                else is reported as an invalid row
+            on_chunk: Optional callback(report) run after every chunk
+
+        Returns:
+            An ImportReport with counts, skipped usernames and invalid rows
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        seen: set[str] = set()
+        row_number = 0
+
+        for chunk in batched(rows, self.chunk_size):
+            valid: list[tuple[str, str, str]] = []
+            for row in chunk:
+                row_number += 1
+                try:
+                    username, password, role = self._parse_row(row)
+                except ValueError as e:
+                    report.invalid.append((row_number, str(e)))
+                    continue
+                if username in seen:
+                    report.duplicates.append(username)
+                else:
+                    seen.add(username)
+                    valid.append((username, password, role))
+
+            existing = self._existing_usernames([username for username, _, _ in valid])
+            report.duplicates.extend(u for u, _, _ in valid if u in existing)
+            valid = [row for row in valid if row[0] not in existing]
+
+            # Hash the whole chunk concurrently on the hasher's worker pool
+            futures = [self.password_hasher.submit_hash(password) for _, password, _ in valid]
+            # OR IGNORE covers users created by someone else since the check
+            report.imported += self.database_manager.executemany(
+                "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)",
+                (
+                    (username, future.result(), role)
+                    for (username, _, role), future in zip(valid, futures)
+                ),
+                batch_size=self.chunk_size,
+            )
+            report.elapsed = time.perf_counter() - started
+            if on_chunk:
+                on_chunk(report)
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def import_file(
+        self, path: str, file_format: Optional[str] = None, show_progress: bool = True
+    ) -> ImportReport:
+        """Import a CSV or JSONL file, optionally with a live progress display."""
+        rows = read_rows(path, file_format)
+        if not show_progress:
+            return self.import_rows(rows)
+
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[bold blue]{task.description}"),
+            TextColumn("{task.completed:,} users"),
+            TextColumn("[dim]{task.fields[rate]:,.0f} rows/s"),
+            TimeElapsedColumn(),
+        ) as progress:
+            task = progress.add_task(f"Importing {path}", total=None, rate=0.0)
+            return self.import_rows(
+                rows,
+                on_chunk=lambda report: progress.update(
+                    task, completed=report.imported, rate=report.rows_per_second
+                ),
+            )
+
+    @staticmethod
+    def _parse_row(row) -> tuple[str, str, str]:
+        """Username, password and role of a row, or ValueError with the reason."""
+        if isinstance(row, UnreadableRow):
+            raise ValueError(row.reason)
+        if not isinstance(row, dict):
+            raise ValueError("row is not an object")
+        username = row.get("username") or ""
+        password = row.get("password") or ""
+        role = row.get("role") or "student"
+        if not all(isinstance(value, str) for value in (username, password, role)):
+            raise ValueError("username, password and role must be text")
+        username, role = username.strip(), role.strip()
+        if not username or not password:
+            raise ValueError("missing username or password")
+        if role not in User.VALID_ROLES:
+            raise ValueError(f"invalid role '{role}'")
+        return username, password, role
+
+    def _existing_usernames(self, usernames: list[str]) -> set[str]:
+        if not usernames:
+            return set()
+        existing: set[str] = set()
+        with self.database_manager as db:
+            # Stay well under SQLite's bound-parameter limit
+            for group in batched(usernames, 500):
+                placeholders = ", ".join("?" * len(group))
+                db.execute(
+                    f"SELECT username FROM users WHERE username IN ({placeholders})",
+                    group,
+                )
+                existing.update(row[0] for row in db.fetchall())
+        return existing
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or JSONL.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--no-progress", action="store_true")
+    args = parser.parse_args(argv)
+
+    database_manager = DatabaseManager()
+    hasher = PasswordHasher.from_settings(get_config().section("AUTH"))
+    try:
+        report = UserImporter(database_manager, hasher, args.chunk_size).import_file(
+            args.path, args.format, show_progress=not args.no_progress
+        )
+    finally:
+        hasher.shutdown()
+
+    print(
+        f"Imported {report.imported:,} users in {report.elapsed:.1f}s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    if report.duplicates:
+        print(f"Skipped {len(report.duplicates):,} existing or repeated usernames")
+    for row_number, reason in report.invalid:
+        print(f"Row {row_number}: {reason}")
+    return 1 if report.invalid else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,7 @@ from src.storage.database_manager import DatabaseManager
 from src.interface.ui_manager import UIManager
 from src.utils.logger import Logger
 import sqlite3
+from collections.abc import Callable
 
 
 class UserManager:
@@ -12,6 +13,15 @@ class UserManager:
         self.database: DatabaseManager = database
         self.ui_manager: UIManager = ui_manager
         self._logger: Logger = logger
+        self._change_listeners: list[Callable[[str, bool], None]] = []
+
+    def add_change_listener(self, listener: Callable[[str, bool], None]) -> None:
+        """Register a callback run as listener(username, deleted) after a user changes."""
+        self._change_listeners.append(listener)
+
+    def _notify_changed(self, username: str, deleted: bool = False) -> None:
+        for listener in self._change_listeners:
+            listener(username, deleted)
 
     def create_user(self, username: str, password: str, role: str) -> User:
         try:
@@ -58,6 +68,7 @@ class UserManager:
                     "UPDATE users SET role = ? WHERE username = ?",
                     (role, username),
                 )
+        self._notify_changed(username)
         return True
 
     def delete_user(self, username) -> bool:
@@ -67,4 +78,5 @@ class UserManager:
                 "DELETE FROM users WHERE username = ?",
                 (username,),
             )
+        self._notify_changed(username, deleted=True)
         return True
@@ -0,0 +1,229 @@
+"""
+Application settings, parsed once and shared by every subsystem.
+
+config/database.json is read the first time `get_config()` is called and
+the parsed, type-checked result is reused from then on. Any setting can be
+overridden from the environment as PYEXAM_<SECTION>__<KEY>, for example:
+
+    PYEXAM_DATABASE__PATH=/srv/pyexam/exams.db
+    PYEXAM_AUTH__COST=12
+    PYEXAM_ANSWER_WRITER__FSYNC=interval
+
+Override values are converted to the type the setting is declared with in
+SCHEMA (JSON literals for settings without a declared type). PYEXAM_CONFIG
+points at a different settings file.
+
+Long-running processes can call `Config.watch()` to reload the file when it
+changes; the new values apply to whatever reads the settings afterwards.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Mapping, Optional
+
+CONFIG_PATH = "config/database.json"
+ENV_PREFIX = "PYEXAM_"
+
+_OPTIONAL_STR = (str, type(None))
+
+# Declared type of each known setting; sections or keys not listed here are
+# passed through as they appear in the file
+SCHEMA: dict[str, dict[str, Any]] = {
+    "DATABASE": {
+        "type": str,
+        "db_name": str,
+        "path": str,
+        "pool_size": int,
+        "pool_timeout": float,
+        "batch_size": int,
+        "id_block_size": int,
+    },
+    "QUESTION_CACHE": {"max_entries": int, "max_bytes": int, "ttl": float},
+    "EXAM_CATALOG": {"page_size": int},
+    "AUTH": {"scheme": str, "cost": int, "workers": int},
+    "SESSIONS": {"ttl": float, "user_cache_ttl": float, "persist": bool},
+    "SNAPSHOTS": {"path": str},
+    "ANSWER_WRITER": {
+        "spool_path": str,
+        "batch_size": int,
+        "flush_interval": float,
+        "fsync": str,
+    },
+    "SERVER": {"host": str, "port": int, "unix_socket": _OPTIONAL_STR},
+    "LOGGING": {"directory": str, "file_level": str, "console_level": str},
+}
+
+# Used when the settings file has no such section
+DEFAULTS: dict[str, dict[str, Any]] = {
+    "LOGGING": {"directory": "logs", "file_level": "INFO", "console_level": "ERROR"},
+}
+
+
+def _convert(value: Any, kind, name: str) -> Any:
+    """Check or convert a setting to its declared type; strings come from the environment."""
+    kinds = kind if isinstance(kind, tuple) else (kind,)
+    if isinstance(value, str) and str not in kinds:
+        text = value.strip()
+        if type(None) in kinds and text.lower() in ("", "null", "none"):
+            return None
+        if bool in kinds:
+            if text.lower() in ("1", "true", "yes", "on"):
+                return True
+            if text.lower() in ("0", "false", "no", "off"):
+                return False
+            raise ValueError(f"{name} must be true or false, got {value!r}")
+        try:
+            return kinds[0](text)
+        except ValueError:
+            raise ValueError(f"{name} must be {kinds[0].__name__}, got {value!r}") from None
+    if value is None and type(None) in kinds:
+        return None
+    if float in kinds and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, kinds) or (isinstance(value, bool) and bool not in kinds):
+        raise ValueError(f"{name} must be {kinds[0].__name__}, got {value!r}")
+    return value
+
+
+def _parse_override(value: str) -> Any:
+    """A setting without a declared type: a JSON literal, or else the raw string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class Config:
+    """
+    Parsed settings by section.
+
+    Sections are handed out as fresh dicts, so callers may splat or modify
+    them without affecting anyone else.
+    """
+
+    def __init__(
+        self,
+        sections: Mapping[str, Mapping[str, Any]],
+        path: Optional[str] = None,
+        environ: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.path = path
+        self._environ = environ or {}
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._sections = self._build(sections, self._environ)
+
+    @classmethod
+    def load(
+        cls, path: str = CONFIG_PATH, environ: Optional[Mapping[str, str]] = None
+    ) -> "Config":
+        """Read a settings file and apply overrides from `environ` (default os.environ)."""
+        environ = os.environ if environ is None else environ
+        with open(path, "r") as file:
+            config = cls(json.load(file), path, environ)
+        config._mtime_ns = os.stat(path).st_mtime_ns
+        return config
+
+    @staticmethod
+    def _build(
+        sections: Mapping[str, Mapping[str, Any]], environ: Mapping[str, str]
+    ) -> dict[str, dict[str, Any]]:
+        built = {name: dict(values) for name, values in DEFAULTS.items()}
+        for name, values in sections.items():
+            built.setdefault(name, {}).update(values)
+
+        for variable, value in environ.items():
+            if not variable.startswith(ENV_PREFIX) or "__" not in variable:
+                continue
+            section, _, key = variable[len(ENV_PREFIX):].partition("__")
+            section_values = built.setdefault(section, {})
+            # Keys are matched case-insensitively, since shells favour upper case
+            key = next((k for k in section_values if k.lower() == key.lower()), key.lower())
+            if key not in SCHEMA.get(section, {}):
+                value = _parse_override(value)
+            section_values[key] = value
+
+        for section, types in SCHEMA.items():
+            values = built.get(section, {})
+            for key, kind in types.items():
+                if key in values:
+                    values[key] = _convert(values[key], kind, f"{section}.{key}")
+        return built
+
+    def section(self, name: str) -> dict[str, Any]:
+        """A copy of one section's settings."""
+        with self._lock:
+            try:
+                return dict(self._sections[name])
+            except KeyError:
+                raise KeyError(f"No settings section {name!r}") from None
+
+    def get(self, section: str, key: str) -> Any:
+        return self.section(section)[key]
+
+    def __getitem__(self, name: str) -> dict[str, Any]:
+        return self.section(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    # ----- Reloading -----
+    def reload_if_changed(self) -> bool:
+        """Re-read the settings file if it changed on disk; True if it was reloaded."""
+        if self.path is None:
+            return False
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            if mtime_ns == self._mtime_ns:
+                return False
+            with open(self.path, "r") as file:
+                sections = self._build(json.load(file), self._environ)
+        except (OSError, ValueError):
+            # Keep the settings we have while the file is missing or half-written
+            return False
+        with self._lock:
+            self._sections, self._mtime_ns = sections, mtime_ns
+        return True
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Poll the settings file every `interval` seconds on a daemon thread."""
+        if self._watcher is not None or self.path is None:
+            return
+        self._stop.clear()
+
+        def poll() -> None:
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=poll, name="config-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+
+_config: Optional[Config] = None
+_config_lock = threading.Lock()
+
+
+def get_config() -> Config:
+    """The process-wide settings, loaded on first use."""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = Config.load(os.environ.get(ENV_PREFIX + "CONFIG", CONFIG_PATH))
+    return _config
+
+
+def set_config(config: Optional[Config]) -> None:
+    """Replace the process-wide settings; None makes the next get_config() reload."""
+    global _config
+    with _config_lock:
+        _config = config
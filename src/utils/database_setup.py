@@ -1,89 +1,312 @@
 import os
 import sqlite3
-import json
-import hashlib
+from datetime import datetime
 
+from src.auth.password_hasher import PasswordHasher
+from src.utils.config import get_config
 
-def setup_database():
-    """Set up the database with necessary tables if they don't exist."""
-    # Load database config
-    with open("config/database.json", "r") as f:
-        db_config = json.load(f)
+# Ordered schema migrations as (version, description, statements).
+# Every statement must be safe to run against a database that already has
+# the object it creates, so a half-recorded upgrade can simply be re-run.
+# The exception is ALTER TABLE, which SQLite cannot make conditional; it
+# relies on apply_migrations holding the write lock while it re-reads the
+# version, so two processes starting at once never apply the same migration.
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (
+        1,
+        "Base tables",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password TEXT NOT NULL,
+                role TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS exams (
+                exam_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                date TEXT NOT NULL,
+                duration INTEGER NOT NULL,
+                questions_count INTEGER NOT NULL,
+                created_by TEXT NOT NULL,
+                FOREIGN KEY (created_by) REFERENCES users (username)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                question_id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL,
+                options TEXT NOT NULL,
+                correct_answer INTEGER NOT NULL,
+                points INTEGER NOT NULL DEFAULT 1,
+                exam_id INTEGER NOT NULL,
+                FOREIGN KEY (exam_id) REFERENCES exams (exam_id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                answer_id INTEGER PRIMARY KEY,
+                question_id INTEGER NOT NULL,
+                user_answer INTEGER NOT NULL,
+                is_correct BOOLEAN NOT NULL,
+                exam_id INTEGER NOT NULL,
+                user_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                FOREIGN KEY (question_id) REFERENCES questions (question_id),
+                FOREIGN KEY (exam_id) REFERENCES exams (exam_id),
+                FOREIGN KEY (user_id) REFERENCES users (username)
+            )
+            """,
+        ],
+    ),
+    (
+        2,
+        "Secondary indexes for exam and result lookups",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_questions_exam_id ON questions (exam_id)",
+            "CREATE INDEX IF NOT EXISTS idx_answers_user_exam ON answers (user_id, exam_id)",
+            "CREATE INDEX IF NOT EXISTS idx_answers_exam_question ON answers (exam_id, question_id)",
+        ],
+    ),
+    (
+        3,
+        "Block-reserved ID sequences for questions and answers",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS id_sequences (
+                name TEXT PRIMARY KEY,
+                next_id INTEGER NOT NULL
+            )
+            """,
+            # Continue after whatever IDs are already in use
+            "INSERT OR IGNORE INTO id_sequences (name, next_id) "
+            "SELECT 'questions', COALESCE(MAX(question_id), 0) + 1 FROM questions",
+            "INSERT OR IGNORE INTO id_sequences (name, next_id) "
+            "SELECT 'answers', COALESCE(MAX(answer_id), 0) + 1 FROM answers",
+        ],
+    ),
+    (
+        4,
+        "Exam ID sequence and indexes for paginated catalog filters",
+        [
+            "INSERT OR IGNORE INTO id_sequences (name, next_id) "
+            "SELECT 'exams', COALESCE(MAX(exam_id), 0) + 1 FROM exams",
+            "CREATE INDEX IF NOT EXISTS idx_exams_creator ON exams (created_by, exam_id)",
+            "CREATE INDEX IF NOT EXISTS idx_exams_date ON exams (date, exam_id)",
+        ],
+    ),
+    (
+        5,
+        "Persistent login sessions",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                token_hash TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                FOREIGN KEY (username) REFERENCES users (username)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions (username)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)",
+        ],
+    ),
+    (
+        6,
+        "Packed question options alongside the JSON copy",
+        [
+            "ALTER TABLE questions ADD COLUMN options_packed TEXT",
+            # char(31) is Question.OPTION_SEPARATOR
+            """
+            UPDATE questions SET options_packed = (
+                SELECT group_concat(value, char(31))
+                FROM (SELECT value FROM json_each(questions.options) ORDER BY key)
+            )
+            WHERE options_packed IS NULL
+            """,
+        ],
+    ),
+    (
+        7,
+        "Resumable exam sessions",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS exam_sessions (
+                session_id INTEGER PRIMARY KEY,
+                username TEXT NOT NULL,
+                exam_id INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'in_progress',
+                answered INTEGER NOT NULL DEFAULT 0,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                FOREIGN KEY (username) REFERENCES users (username),
+                FOREIGN KEY (exam_id) REFERENCES exams (exam_id)
+            )
+            """,
+            # At most one attempt in progress per user and exam
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_exam_sessions_open "
+            "ON exam_sessions (username, exam_id) WHERE status = 'in_progress'",
+            "INSERT OR IGNORE INTO id_sequences (name, next_id) VALUES ('exam_sessions', 1)",
+            "ALTER TABLE answers ADD COLUMN session_id INTEGER REFERENCES exam_sessions (session_id)",
+            "CREATE INDEX IF NOT EXISTS idx_answers_session ON answers (session_id)",
+        ],
+    ),
+    (
+        8,
+        "Incrementally maintained results aggregates",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS exam_stats (
+                exam_id INTEGER PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_points INTEGER NOT NULL DEFAULT 0,
+                score_sum INTEGER NOT NULL DEFAULT 0,
+                score_sq_sum INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (exam_id) REFERENCES exams (exam_id)
+            )
+            """,
+            # Attempts per 10% band of the score (bucket 9 includes 100%)
+            """
+            CREATE TABLE IF NOT EXISTS exam_score_histogram (
+                exam_id INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (exam_id, bucket)
+            ) WITHOUT ROWID
+            """,
+            # Sums of the attempt scores let the point-biserial
+            # discrimination be derived without rescanning answers
+            """
+            CREATE TABLE IF NOT EXISTS question_stats (
+                question_id INTEGER PRIMARY KEY,
+                exam_id INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                score_sum INTEGER NOT NULL DEFAULT 0,
+                score_sq_sum INTEGER NOT NULL DEFAULT 0,
+                correct_score_sum INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (question_id) REFERENCES questions (question_id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_question_stats_exam ON question_stats (exam_id)",
+            """
+            CREATE TABLE IF NOT EXISTS user_exam_stats (
+                username TEXT NOT NULL,
+                exam_id INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER NOT NULL DEFAULT 0,
+                last_score INTEGER NOT NULL DEFAULT 0,
+                last_attempt_at REAL NOT NULL,
+                PRIMARY KEY (username, exam_id)
+            ) WITHOUT ROWID
+            """,
+        ],
+    ),
+]
 
-    db_path = db_config["DATABASE"]["path"]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
 
-    # Create the directory if it doesn't exist
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
-    # Create users table
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    """Return the highest applied migration version (0 for a fresh database)."""
     cursor.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        username TEXT PRIMARY KEY,
-        password TEXT NOT NULL,
-        role TEXT NOT NULL
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TEXT NOT NULL
     )
     """)
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    version = cursor.fetchone()[0]
+    return version or 0
 
-    # Create exams table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS exams (
-        exam_id INTEGER PRIMARY KEY,
-        name TEXT NOT NULL,
-        date TEXT NOT NULL,
-        duration INTEGER NOT NULL,
-        questions_count INTEGER NOT NULL,
-        created_by TEXT NOT NULL,
-        FOREIGN KEY (created_by) REFERENCES users (username)
-    )
-    """)
 
-    # Create questions table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS questions (
-        question_id INTEGER PRIMARY KEY,
-        text TEXT NOT NULL,
-        options TEXT NOT NULL,
-        correct_answer INTEGER NOT NULL,
-        points INTEGER NOT NULL DEFAULT 1,
-        exam_id INTEGER NOT NULL,
-        FOREIGN KEY (exam_id) REFERENCES exams (exam_id)
-    )
-    """)
+def apply_migrations(conn: sqlite3.Connection, target: int = SCHEMA_VERSION) -> list[int]:
+    """
+    Bring the schema up to `target`, one transaction per migration.
 
-    # Create answers table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS answers (
-        answer_id INTEGER PRIMARY KEY,
-        question_id INTEGER NOT NULL,
-        user_answer INTEGER NOT NULL,
-        is_correct BOOLEAN NOT NULL,
-        exam_id INTEGER NOT NULL,
-        user_id TEXT NOT NULL,
-        timestamp TEXT NOT NULL,
-        FOREIGN KEY (question_id) REFERENCES questions (question_id),
-        FOREIGN KEY (exam_id) REFERENCES exams (exam_id),
-        FOREIGN KEY (user_id) REFERENCES users (username)
-    )
-    """)
+    Each migration takes the write lock with BEGIN IMMEDIATE and re-reads the
+    version inside that transaction, so a migration another process applied
+    in the meantime is skipped rather than run twice.
+
+    Args:
+        conn: An open SQLite connection
+        target: The version to stop at (defaults to the latest)
+
+    Returns:
+        The versions that were applied by this call
+    """
+    cursor = conn.cursor()
+    current = get_schema_version(cursor)
+    conn.commit()
+
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            current = get_schema_version(cursor)
+            if version <= current:
+                conn.rollback()
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now().isoformat()),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    cursor.close()
+    return applied
+
+
+def setup_database(verbose: bool = True):
+    """
+    Set up the database with necessary tables if they don't exist.
+
+    Pass verbose=False to keep stdout clean for scripted use.
+    """
+    db_path = get_config().get("DATABASE", "path")
+
+    # Create the directory if it doesn't exist
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    # Connect to database
+    conn = sqlite3.connect(db_path)
+
+    # Create or upgrade tables and indexes
+    applied = apply_migrations(conn)
+    if applied and verbose:
+        print(f"Applied schema migrations: {', '.join(map(str, applied))}")
+
+    cursor = conn.cursor()
 
     # Add default admin user if it doesn't exist
     cursor.execute("SELECT COUNT(*) FROM users WHERE username = 'admin'")
     if cursor.fetchone()[0] == 0:
-        admin_password = hashlib.sha256("admin".encode()).hexdigest()
+        hasher = PasswordHasher.from_settings(get_config().section("AUTH"))
+        try:
+            admin_password = hasher.hash("admin")
+        finally:
+            hasher.shutdown()
         cursor.execute(
-            "INSERT INTO users (username, password, email, role) VALUES (?, ?, ?, ?)",
-            ("admin", admin_password, "admin@example.com", "admin"),
+            "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+            ("admin", admin_password, "admin"),
         )
 
     # Commit changes and close connection
     conn.commit()
     conn.close()
 
-    print("Database setup complete.")
+    if verbose:
+        print("Database setup complete.")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,8 @@ import logging
 import os
 from datetime import datetime
 
+from src.utils.config import get_config
+
 class Logger:
     """
     A singleton logger class that handles different log levels and outputs.
@@ -34,9 +36,12 @@ class Logger:
         Sets up the logging system with multiple handlers for different output destinations
         and log levels.
         """
+        settings = get_config().section("LOGGING")
         # Create logs directory if it doesn't exist
-        # Navigate up three directory levels from the current file to find the project root
-        logs_dir: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
+        # Relative directories are taken from the project root, three levels up from this file
+        logs_dir: str = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))), settings["directory"]
+        )
         os.makedirs(logs_dir, exist_ok=True)
         
         # Set up the main logger object
@@ -62,12 +67,12 @@ class Logger:
         # Create file handler for general log messages (INFO and above)
         log_file = os.path.join(logs_dir, f"pyexam_{datetime.now().strftime('%Y%m%d')}.log")
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
+        file_handler.setLevel(settings["file_level"].upper())
         
         # === CONSOLE HANDLER ===
         # Create console handler for displaying error messages in the terminal
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.ERROR)
+        console_handler.setLevel(settings["console_level"].upper())
         
         # Create formatters for the handlers
         file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
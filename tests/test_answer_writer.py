@@ -0,0 +1,183 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from src.exams.answer import Answer
+from src.exams.answer_writer import AnswerWriter
+from src.storage.database_manager import DatabaseManager
+from src.utils.database_setup import apply_migrations
+
+
+class TestAnswerWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.spool_path = os.path.join(self.tmpdir.name, "answers.spool")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        conn.close()
+        self.database_manager = DatabaseManager(database_path=self.db_path)
+        self.writer = AnswerWriter(
+            self.database_manager, self.spool_path, batch_size=50, fsync="never"
+        )
+
+    def tearDown(self):
+        self.writer.close()
+        self.database_manager.close()
+        self.tmpdir.cleanup()
+
+    def answer_ids(self):
+        with self.database_manager as db:
+            db.execute("SELECT answer_id FROM answers ORDER BY answer_id")
+            return [row[0] for row in db.fetchall()]
+
+    def test_concurrent_submits_are_committed_in_batches(self):
+        def take_exam(offset):
+            for i in range(100):
+                self.writer.submit(Answer(offset + i, i, 0, True, 1, f"user{offset}"))
+
+        threads = [threading.Thread(target=take_exam, args=(n * 1000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(self.writer.flush(timeout=10))
+
+        self.assertEqual(len(self.answer_ids()), 400)
+        metrics = self.writer.metrics()
+        self.assertEqual((metrics["queue_depth"], metrics["committed"]), (0, 400))
+        self.assertLess(metrics["batches"], 400)
+        self.assertEqual(os.path.getsize(self.writer.spool_file), 0)
+        self.writer.close()
+        self.assertFalse(os.path.exists(self.writer.spool_file))
+
+    def test_spool_left_by_a_crash_is_replayed(self):
+        row = [7, 1, 2, False, 1, "alice", "2026-01-01T10:00:00", None]
+        with open(self.spool_path, "w") as spool:
+            spool.write(json.dumps(row) + "\n")
+            spool.write(json.dumps([8] + row[1:]) + "\n")
+            spool.write('[9, 1, 2, fal')  # torn write
+        # An orphaned per-process spool
+        with open(os.path.join(self.tmpdir.name, "answers-1-dead.spool"), "w") as spool:
+            spool.write(json.dumps([10] + row[1:]) + "\n")
+        self.writer.start()
+        self.assertEqual(self.answer_ids(), [7, 8, 10])
+        self.assertEqual(
+            os.listdir(self.tmpdir.name).count("answers-1-dead.spool"), 0
+        )
+        self.assertFalse(os.path.exists(self.spool_path))
+
+    def test_spools_of_live_writers_are_left_alone(self):
+        self.writer.start()
+        self.writer.submit(Answer(1, 1, 0, True, 1, "alice"))
+        self.assertTrue(self.writer.flush(timeout=10))
+        # Simulate an uncommitted answer in the first writer's spool
+        row = [2, 1, 0, True, 1, "bob", "2026-01-01T10:00:00", None]
+        with open(self.writer.spool_file, "a") as spool:
+            spool.write(json.dumps(row) + "\n")
+
+        other = AnswerWriter(self.database_manager, self.spool_path, fsync="never")
+        other.start()
+        try:
+            self.assertNotEqual(other.spool_file, self.writer.spool_file)
+            self.assertEqual(self.answer_ids(), [1])
+            self.assertGreater(os.path.getsize(self.writer.spool_file), 0)
+        finally:
+            other.close()
+
+    def test_committed_prefix_is_trimmed_while_answers_are_pending(self):
+        writer = AnswerWriter(
+            self.database_manager, self.spool_path, batch_size=5, fsync="never"
+        )
+        commit, calls, release = writer._commit, [], threading.Semaphore(0)
+
+        def held_commit(rows):
+            calls.append(len(rows))
+            release.acquire(timeout=10)
+            commit(rows)
+
+        writer._commit = held_commit
+        try:
+            for i in range(10):
+                writer.submit(Answer(i, i, 0, True, 1, "alice"))
+            line_size = os.path.getsize(writer.spool_file) // 10
+            release.release()
+            # The second batch is waiting: only its five lines are left
+            for _ in range(100):
+                if len(calls) == 2:
+                    break
+                threading.Event().wait(0.05)
+            self.assertEqual(calls, [5, 5])
+            self.assertEqual(os.path.getsize(writer.spool_file), 5 * line_size)
+            release.release()
+            self.assertTrue(writer.flush(timeout=10))
+            self.assertEqual(os.path.getsize(writer.spool_file), 0)
+        finally:
+            release.release()
+            writer.close()
+        self.assertEqual(len(self.answer_ids()), 10)
+
+    def test_locked_database_is_retried(self):
+        commit, failures = self.writer._commit, []
+
+        def locked_twice(rows):
+            if len(failures) < 2:
+                error = sqlite3.OperationalError("database is locked")
+                error.sqlite_errorcode = sqlite3.SQLITE_BUSY
+                failures.append(error)
+                raise error
+            commit(rows)
+
+        self.writer._commit = locked_twice
+        self.writer.submit(Answer(1, 1, 0, True, 1, "alice"))
+        self.assertTrue(self.writer.flush(timeout=10))
+        self.assertEqual(self.answer_ids(), [1])
+        self.assertEqual((self.writer.errors, self.writer.rejected), (2, 0))
+
+    @patch("src.exams.answer_writer.Logger")
+    def test_failing_rows_are_rejected_without_stalling(self, logger):
+        commit = self.writer._commit
+
+        def reject_13(rows):
+            if any(row[0] == 13 for row in rows):
+                raise sqlite3.IntegrityError("constraint failed")
+            commit(rows)
+
+        self.writer._commit = reject_13
+        for i in (12, 13, 14):
+            self.writer.submit(Answer(i, i, 0, True, 1, "alice"))
+        self.assertTrue(self.writer.flush(timeout=10))
+        self.assertEqual(self.answer_ids(), [12, 14])
+        metrics = self.writer.metrics()
+        self.assertEqual((metrics["committed"], metrics["rejected"]), (2, 1))
+        with open(os.path.join(self.tmpdir.name, "answers.rejected")) as rejected:
+            entry = json.loads(rejected.readline())
+        self.assertEqual((entry["row"][0], entry["error"]), (13, "constraint failed"))
+        logger.return_value.error.assert_called_once()
+
+    def test_close_keeps_the_spool_when_answers_are_not_committed(self):
+        release = threading.Event()
+        commit = self.writer._commit
+
+        def stuck(rows):
+            release.wait(10)
+            commit(rows)
+
+        self.writer._commit = stuck
+        self.writer.submit(Answer(1, 1, 0, True, 1, "alice"))
+        self.writer.close(timeout=0.1)
+        self.assertGreater(os.path.getsize(self.writer.spool_file), 0)
+        release.set()
+        self.writer._thread.join(10)
+        # The late commit leaves the spool for the next writer to replay
+        self.assertGreater(os.path.getsize(self.writer.spool_file), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import importlib
+import io
+import subprocess
+import tomllib
+import unittest
+from contextlib import redirect_stderr
+from unittest.mock import patch
+from src.interface import cli
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@patch("src.utils.database_setup.setup_database")
+class TestCli(unittest.TestCase):
+    def test_forwards_arguments_and_exit_code(self, setup_database):
+        with patch("src.exams.exam_snapshot.main", return_value=1) as publish:
+            self.assertEqual(cli.main(["exams", "publish", "3", "4"]), 1)
+        publish.assert_called_once_with(["3", "4"])
+        setup_database.assert_called_once_with(verbose=False)
+
+        with patch("src.exams.results_analytics.main", return_value=0) as results:
+            self.assertEqual(cli.main(["results", "export", "out.csv", "--exam", "2"]), 0)
+        results.assert_called_once_with(["export", "out.csv", "--exam", "2"])
+
+    def test_failures_become_exit_codes(self, setup_database):
+        with patch("src.user.user_importer.main", side_effect=OSError("no such file")):
+            with redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(cli.main(["users", "import", "missing.csv"]), 1)
+        self.assertIn("no such file", stderr.getvalue())
+
+        with patch("src.exams.grading.main", side_effect=SystemExit(2)):
+            self.assertEqual(cli.main(["exams", "regrade", "x"]), 2)
+
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as raised:
+            cli.main(["exams", "frobnicate"])
+        self.assertEqual(raised.exception.code, 2)
+
+    def test_headless_run_skips_the_terminal_ui(self, setup_database):
+        script = (
+            "import sys, main\n"
+            "code = main.main(['bench'])\n"
+            "sys.exit(99 if 'rich' in sys.modules else code)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("exam_load", result.stdout.split())
+
+
+class TestEntryPoint(unittest.TestCase):
+    def test_pyexam_script_runs_the_cli(self):
+        with open(os.path.join(ROOT, "pyproject.toml"), "rb") as file:
+            scripts = tomllib.load(file)["project"]["scripts"]
+        module_name, _, function = scripts["pyexam"].partition(":")
+        self.assertIs(getattr(importlib.import_module(module_name), function), cli.main)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.storage.database_manager import DatabaseManager
+from src.utils import config
+from src.utils.config import Config
+
+SETTINGS = {
+    "DATABASE": {"path": "data/a.db", "pool_size": 5, "pool_timeout": 30},
+    "PERFORMANCE_PROFILE": {"journal_mode": "WAL", "cache_size": -2000},
+    "SERVER": {"host": "127.0.0.1", "port": 8765, "unix_socket": None},
+    "SESSIONS": {"persist": True},
+}
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "settings.json")
+        self.write(SETTINGS)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, settings):
+        with open(self.path, "w") as file:
+            json.dump(settings, file)
+
+    def test_types_and_defaults(self):
+        settings = Config.load(self.path, environ={})
+        self.assertEqual(settings.get("DATABASE", "pool_timeout"), 30.0)
+        self.assertIsInstance(settings.get("DATABASE", "pool_timeout"), float)
+        self.assertEqual(settings.get("LOGGING", "console_level"), "ERROR")
+        self.assertIsNone(settings.get("SERVER", "unix_socket"))
+
+        with self.assertRaises(ValueError):
+            Config({"SERVER": {"port": [8765]}})
+        with self.assertRaises(ValueError):
+            Config({"SESSIONS": {"persist": 1}})
+
+    def test_environment_overrides(self):
+        settings = Config.load(
+            self.path,
+            environ={
+                "PYEXAM_DATABASE__POOL_SIZE": "12",
+                "PYEXAM_SERVER__UNIX_SOCKET": "/tmp/pyexam.sock",
+                "PYEXAM_SESSIONS__PERSIST": "false",
+                "PYEXAM_PERFORMANCE_PROFILE__CACHE_SIZE": "-65536",
+                "PYEXAM_PERFORMANCE_PROFILE__JOURNAL_MODE": "DELETE",
+                "OTHER__IGNORED": "1",
+            },
+        )
+        self.assertEqual(settings.get("DATABASE", "pool_size"), 12)
+        self.assertEqual(settings.get("SERVER", "unix_socket"), "/tmp/pyexam.sock")
+        self.assertIs(settings.get("SESSIONS", "persist"), False)
+        self.assertEqual(
+            settings.section("PERFORMANCE_PROFILE"), {"journal_mode": "DELETE", "cache_size": -65536}
+        )
+
+        with self.assertRaises(ValueError):
+            Config.load(self.path, environ={"PYEXAM_DATABASE__POOL_SIZE": "many"})
+
+    def test_sections_are_copies(self):
+        settings = Config.load(self.path, environ={})
+        settings.section("DATABASE")["pool_size"] = 1
+        self.assertEqual(settings.get("DATABASE", "pool_size"), 5)
+
+    def test_reload_if_changed(self):
+        settings = Config.load(self.path, environ={})
+        self.assertFalse(settings.reload_if_changed())
+
+        self.write({**SETTINGS, "DATABASE": {**SETTINGS["DATABASE"], "pool_size": 9}})
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1_000_000))
+        self.assertTrue(settings.reload_if_changed())
+        self.assertEqual(settings.get("DATABASE", "pool_size"), 9)
+
+        # A half-written file keeps the settings already loaded
+        with open(self.path, "w") as file:
+            file.write("{")
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 2_000_000))
+        self.assertFalse(settings.reload_if_changed())
+        self.assertEqual(settings.get("DATABASE", "pool_size"), 9)
+
+    def test_settings_file_is_parsed_once(self):
+        config.set_config(None)
+        try:
+            with patch.object(Config, "load", wraps=Config.load) as load:
+                first = DatabaseManager(database_path=os.path.join(self.tmpdir.name, "a.db"))
+                second = DatabaseManager(database_path=os.path.join(self.tmpdir.name, "b.db"))
+                DatabaseManager.retrieve_database_settings(section="AUTH")
+            self.assertEqual(load.call_count, 1)
+            first.close()
+            second.close()
+        finally:
+            config.set_config(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
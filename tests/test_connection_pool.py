@@ -0,0 +1,83 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from src.storage.connection_pool import ConnectionPool
+from src.storage.database_manager import DatabaseManager
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.pool = ConnectionPool("test.db", self.db_path, size=2, timeout=1)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def test_connection_is_reused_after_release(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+        second = self.pool.acquire()
+        self.pool.release(second)
+        self.assertIs(first, second)
+        self.assertEqual(self.pool.stats()["opens"], 1)
+        self.assertEqual(self.pool.stats()["reuses"], 1)
+
+    def test_nested_acquire_shares_connection(self):
+        outer = self.pool.acquire()
+        inner = self.pool.acquire()
+        self.assertIs(outer, inner)
+        self.assertEqual(self.pool.depth(), 2)
+        self.pool.release(inner)
+        self.assertIs(self.pool.held(), outer)
+        self.pool.release(outer)
+        self.assertIsNone(self.pool.held())
+
+    def test_exhausted_pool_times_out(self):
+        barrier = threading.Barrier(3)
+
+        def hold():
+            db = self.pool.acquire()
+            barrier.wait()
+            barrier.wait()
+            self.pool.release(db)
+
+        threads = [threading.Thread(target=hold) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire()
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.pool.stats()["opens"], 2)
+        self.assertGreater(self.pool.stats()["wait_time"], 0)
+
+
+class TestDatabaseManagerRollback(unittest.TestCase):
+    @patch("src.storage.database_manager.Logger")
+    def test_rollback_is_logged_not_printed(self, logger):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            database_manager = DatabaseManager(database_path=os.path.join(tmpdir, "test.db"))
+            stdout = io.StringIO()
+            with redirect_stdout(stdout), self.assertRaises(KeyError):
+                with database_manager as db:
+                    db.execute("CREATE TABLE t (x INTEGER)")
+                    raise KeyError("boom")
+            database_manager.close()
+        self.assertEqual(stdout.getvalue(), "")
+        logger.return_value.warning.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.auth.password_hasher import PasswordHasher
+from src.exams.question import Question
+from src.utils.config import Config, set_config
+from src.utils.database_setup import (
+    SCHEMA_VERSION, apply_migrations, get_schema_version, setup_database,
+)
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_fresh_database_is_migrated_to_latest(self):
+        applied = apply_migrations(self.conn)
+        self.assertEqual(applied, list(range(1, SCHEMA_VERSION + 1)))
+        self.assertEqual(get_schema_version(self.conn.cursor()), SCHEMA_VERSION)
+
+    def test_migrations_are_idempotent(self):
+        apply_migrations(self.conn)
+        self.assertEqual(apply_migrations(self.conn), [])
+
+    def test_indexes_are_used_for_exam_lookups(self):
+        apply_migrations(self.conn)
+        plan = self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM questions WHERE exam_id = ?", (1,)
+        ).fetchall()
+        self.assertIn("idx_questions_exam_id", plan[0][3])
+
+    def test_upgrade_from_partial_version(self):
+        apply_migrations(self.conn, target=1)
+        self.assertEqual(get_schema_version(self.conn.cursor()), 1)
+        self.assertEqual(apply_migrations(self.conn), list(range(2, SCHEMA_VERSION + 1)))
+
+    def test_options_are_packed_on_upgrade(self):
+        apply_migrations(self.conn, target=5)
+        options = [f"option {i}" for i in range(12)] + ['é "x"']
+        self.conn.execute(
+            "INSERT INTO questions VALUES (1, 'Q', ?, 0, 1, 1)", (json.dumps(options),)
+        )
+        apply_migrations(self.conn)
+        packed, options_json = self.conn.execute(
+            "SELECT options_packed, options FROM questions"
+        ).fetchone()
+        self.assertEqual(Question.unpack_options(packed, None), options)
+        self.assertEqual(Question.unpack_options(None, options_json), options)
+
+    def test_concurrent_upgrades_apply_each_migration_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "test.db")
+            conn = sqlite3.connect(path)
+            apply_migrations(conn, target=5)
+            conn.close()
+
+            barrier = threading.Barrier(6)
+            applied, errors = [], []
+
+            def upgrade():
+                conn = sqlite3.connect(path, timeout=30)
+                try:
+                    barrier.wait()
+                    applied.extend(apply_migrations(conn))
+                except Exception as error:
+                    errors.append(error)
+                finally:
+                    conn.close()
+
+            threads = [threading.Thread(target=upgrade) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(sorted(applied), list(range(6, SCHEMA_VERSION + 1)))
+
+
+class TestSetupDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "data", "test.db")
+        set_config(Config({
+            "DATABASE": {"path": self.db_path},
+            "AUTH": {"scheme": "scrypt", "cost": 10, "workers": 1},
+        }))
+
+    def tearDown(self):
+        set_config(None)
+        self.tmpdir.cleanup()
+
+    def test_admin_is_seeded_with_a_salted_hash(self):
+        setup_database(verbose=False)
+        with sqlite3.connect(self.db_path) as conn:
+            (stored,) = conn.execute(
+                "SELECT password FROM users WHERE username = 'admin'"
+            ).fetchone()
+        conn.close()
+        hasher = PasswordHasher("scrypt", cost=10, workers=1)
+        self.assertTrue(stored.startswith("scrypt$10$"))
+        self.assertTrue(hasher.verify("admin", stored))
+        self.assertFalse(hasher.needs_rehash(stored))
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import sqlite3
+import tempfile
+import unittest
+from src.exams.exam_bank import (
+    ExamBank, read_bank, read_binary, read_jsonl, write_binary, write_jsonl,
+)
+from src.storage.database_manager import DatabaseManager
+from src.storage.id_allocator import IdAllocator
+from src.utils.database_setup import apply_migrations
+
+
+def make_bank(exams=2, questions=3):
+    for e in range(exams):
+        yield "exam", {
+            "name": f"Exam {e}",
+            "date": "2026-01-0%d" % (e + 1),
+            "duration": 30,
+            "created_by": "admin",
+        }
+        for q in range(questions):
+            yield "question", {
+                "text": f"Question {e}.{q} — ü",
+                "options": ["a", "b", "c"],
+                "correct_answer": q % 3,
+                "points": q + 1,
+            }
+
+
+class TestExamBank(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        conn.execute("INSERT INTO users VALUES ('admin', 'hash', 'admin')")
+        conn.commit()
+        conn.close()
+        self.database_manager = DatabaseManager(database_path=self.db_path)
+        self.bank = ExamBank(
+            self.database_manager, IdAllocator(self.database_manager), chunk_size=2
+        )
+
+    def tearDown(self):
+        self.database_manager.close()
+        self.tmpdir.cleanup()
+
+    def test_binary_round_trip(self):
+        records = list(make_bank())
+        buffer = io.BytesIO()
+        self.assertEqual(write_binary(records, buffer), len(records))
+        buffer.seek(0)
+        self.assertEqual(list(read_binary(buffer)), records)
+
+    def test_import_spans_chunks_and_exports_in_both_formats(self):
+        report = self.bank.import_records(make_bank(exams=3, questions=3))
+        self.assertEqual((report.exams, report.questions, report.invalid), (3, 9, []))
+
+        with self.database_manager as db:
+            db.execute("SELECT questions_count FROM exams ORDER BY exam_id")
+            self.assertEqual([row[0] for row in db.fetchall()], [3, 3, 3])
+
+        for name in ("bank.jsonl", "bank.pxb"):
+            path = os.path.join(self.tmpdir.name, name)
+            self.bank.export_file(path)
+            self.assertEqual(list(read_bank(path)), list(make_bank(exams=3, questions=3)))
+
+    def test_invalid_exam_skips_its_questions(self):
+        records = list(make_bank(exams=2, questions=2))
+        records[0] = ("exam", {**records[0][1], "date": "tomorrow"})
+        records[4] = ("question", {**records[4][1], "correct_answer": 7})
+        report = self.bank.import_records(records)
+        self.assertEqual((report.exams, report.questions), (1, 1))
+        self.assertEqual([number for number, _ in report.invalid], [1, 2, 3, 5])
+
+
+    def test_unreadable_jsonl_lines_are_reported(self):
+        buffer = io.StringIO()
+        write_jsonl(make_bank(exams=2, questions=2), buffer)
+        lines = buffer.getvalue().splitlines()
+        lines[1] = '{"type": "question", "text": '  # torn
+        lines[3] = '["not", "an", "object"]'  # in place of the second exam
+        report = self.bank.import_records(read_jsonl(io.StringIO("\n".join(lines))))
+        # The torn question is dropped alone; the second exam takes its questions along
+        self.assertEqual((report.exams, report.questions), (1, 1))
+        self.assertEqual(
+            [(number, reason.split(":")[0]) for number, reason in report.invalid],
+            [(2, "line 2"), (4, "line 4"), (5, "question after an unreadable record"),
+             (6, "question after an unreadable record")],
+        )
+
+    def test_oversized_fields_are_rejected_clearly(self):
+        records = list(make_bank(exams=1, questions=1))
+        records[0] = ("exam", {**records[0][1], "name": "x" * 70000})
+        report = self.bank.import_records(records)
+        self.assertEqual(report.exams, 0)
+        self.assertIn("at most 65535 bytes", report.invalid[0][1])
+
+        question = ("question", {**records[1][1], "points": 70000})
+        with self.assertRaisesRegex(ValueError, "record 2 .* does not fit"):
+            write_binary([next(make_bank()), question], io.BytesIO())
+
+    def test_exams_without_questions_are_flushed_in_chunks(self):
+        chunks = []
+        records = list(make_bank(exams=5, questions=0))
+        report = self.bank.import_records(records, on_chunk=lambda r: chunks.append(r.exams))
+        self.assertEqual(report.exams, 5)
+        self.assertEqual(chunks, [2, 4, 5])
+
+    def test_truncated_binary_bank_stops_cleanly(self):
+        buffer = io.BytesIO()
+        write_binary(make_bank(exams=2, questions=2), buffer)
+        truncated = io.BytesIO(buffer.getvalue()[:-5])
+        report = self.bank.import_records(read_binary(truncated))
+        self.assertEqual((report.exams, report.questions), (2, 3))
+        ((number, reason),) = report.invalid
+        self.assertEqual(number, 6)
+        self.assertIn("file ends inside a record", reason)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+from src.exams.exam import Exam
+from src.exams.exam_catalog import ExamCatalog
+
+
+class TestExamCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = ExamCatalog(
+            [
+                Exam(1, "Math", "2025-05-01", 60, 10, "admin"),
+                Exam(2, "Physics", "2025-05-01", 90, 20, "teacher"),
+                Exam(3, "Chemistry", "2025-05-02", 45, 15, "admin"),
+            ]
+        )
+
+    def test_lookup_by_id(self):
+        self.assertEqual(self.catalog.get(2).name, "Physics")
+        self.assertIsNone(self.catalog.get(42))
+
+    def test_secondary_indexes(self):
+        self.assertEqual([e.exam_id for e in self.catalog.by_creator("admin")], [1, 3])
+        self.assertEqual([e.exam_id for e in self.catalog.by_date("2025-05-01")], [1, 2])
+
+    def test_remove_keeps_indexes_consistent(self):
+        removed = self.catalog.remove(1)
+        self.assertEqual(removed.name, "Math")
+        self.assertNotIn(1, self.catalog)
+        self.assertEqual([e.exam_id for e in self.catalog.by_creator("admin")], [3])
+        self.assertEqual(len(self.catalog), 2)
+        self.assertIsNone(self.catalog.remove(1))
+
+    def test_replacing_exam_moves_index_entries(self):
+        self.catalog.add(Exam(2, "Physics II", "2025-06-01", 90, 20, "admin"))
+        self.assertEqual(self.catalog.by_date("2025-05-01")[0].exam_id, 1)
+        self.assertEqual(len(self.catalog.by_creator("teacher")), 0)
+        self.assertEqual(len(self.catalog), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,310 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import csv
+import io
+import logging
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src.exams.answer import Answer
+from src.exams.exam_manager import ExamManager
+from src.exams.exam_session import ExamSession
+from src.exams.exam_snapshot import _HEADER
+from src.exams.grading import regrade_exam
+from src.storage.database_manager import DatabaseManager
+from src.utils.config import CONFIG_PATH, Config, set_config
+from src.utils.database_setup import apply_migrations
+from src.utils.logger import Logger
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class ExamManagerTestCase(unittest.TestCase):
+    """Builds an ExamManager on a throwaway database with mocked UI and auth."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        conn.executemany(
+            "INSERT INTO exams VALUES (?, ?, ?, 60, 2, ?)",
+            [
+                (i, f"Exam {i}", f"2025-05-{i:02d}", "admin" if i % 2 else "teacher")
+                for i in range(1, 8)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO questions (question_id, text, options, correct_answer, points, exam_id) "
+            "VALUES (?, ?, '[\"a\", \"b\", \"c\"]', ?, 1, 1)",
+            [(1, "First", 0), (2, "Second", 2)],
+        )
+        conn.commit()
+        conn.close()
+
+        # Keep logs of rolled-back transactions out of the working tree
+        set_config(Config.load(os.path.join(ROOT, CONFIG_PATH), environ={
+            "PYEXAM_LOGGING__DIRECTORY": self.tmpdir.name,
+            "PYEXAM_DATABASE__PATH": self.db_path,
+            "PYEXAM_SNAPSHOTS__PATH": os.path.join(self.tmpdir.name, "snapshots"),
+            "PYEXAM_ANSWER_WRITER__SPOOL_PATH": os.path.join(self.tmpdir.name, "answers.spool"),
+        }))
+        Logger._instance = None
+        self.database_manager = DatabaseManager(database_path=self.db_path)
+        self.auth_manager = MagicMock()
+        self.auth_manager.get_current_user.return_value.username = "alice"
+        self.exam_manager = ExamManager(
+            ui_manager=MagicMock(),
+            input_handler=MagicMock(),
+            user_manager=MagicMock(),
+            database_manager=self.database_manager,
+            logger=MagicMock(),
+            auth_manager=self.auth_manager,
+        )
+
+    def tearDown(self):
+        self.exam_manager.close()
+        self.database_manager.close()
+        for handler in logging.getLogger("pyexam").handlers:
+            handler.close()
+        Logger._instance = None
+        set_config(None)
+        self.tmpdir.cleanup()
+
+
+class TestExamCatalogPaging(ExamManagerTestCase):
+    def test_nothing_is_loaded_at_startup(self):
+        self.assertEqual(len(self.exam_manager.exams), 0)
+
+    def test_keyset_pages(self):
+        pages = list(self.exam_manager.iter_exam_pages(page_size=3))
+        self.assertEqual(
+            [[e.exam_id for e in page] for page in pages], [[1, 2, 3], [4, 5, 6], [7]]
+        )
+
+    def test_filters(self):
+        exams = [
+            e
+            for page in self.exam_manager.iter_exam_pages(
+                created_by="admin", date_from="2025-05-02", date_to="2025-05-06"
+            )
+            for e in page
+        ]
+        self.assertEqual([e.exam_id for e in exams], [3, 5])
+
+    def test_get_exam_loads_on_demand(self):
+        self.assertEqual(self.exam_manager.get_exam(4).name, "Exam 4")
+        self.assertIn(4, self.exam_manager.exams)
+        self.assertIsNone(self.exam_manager.get_exam(99))
+
+    def test_list_exams_stops_when_declined(self):
+        self.exam_manager.page_size = 3
+        self.exam_manager.ui_manager.confirm_action.return_value = False
+        self.assertEqual(self.exam_manager.list_exams(), 3)
+
+
+class TestExamSnapshots(ExamManagerTestCase):
+    def test_published_exam_is_read_without_the_database(self):
+        self.assertTrue(os.path.exists(self.exam_manager.publish_exam(1)))
+        self.assertIsNone(self.exam_manager.publish_exam(2))  # no questions
+
+        with patch.object(DatabaseManager, "__enter__", side_effect=AssertionError):
+            exam, questions = self.exam_manager.load_published_exam(1)
+        self.assertEqual((exam.name, exam.questions_count), ("Exam 1", 2))
+        self.assertEqual(
+            [(q.question_id, q.text, q.options, q.correct_answer) for q in questions],
+            [(1, "First", ["a", "b", "c"], 0), (2, "Second", ["a", "b", "c"], 2)],
+        )
+
+    def test_tampered_snapshot_is_ignored_and_removed_with_exam(self):
+        path = self.exam_manager.publish_exam(1)
+        with open(path, "r+b") as file:
+            # Last byte of the answer key digest in the header
+            file.seek(_HEADER.size - 1)
+            last = file.read(1)[0]
+            file.seek(_HEADER.size - 1)
+            file.write(bytes([last ^ 0xFF]))
+        self.assertIsNone(self.exam_manager.load_published_exam(1))
+
+        self.exam_manager.remove_exam(1)
+        self.assertFalse(os.path.exists(path))
+
+    def test_snapshot_follows_new_questions_and_fixed_keys(self):
+        self.exam_manager.publish_exam(1)
+        self.exam_manager.ui = MagicMock()
+        self.exam_manager.ui.ask_input.side_effect = ["Third", "a", "b", "c", "d", "2"]
+        with patch.object(self.exam_manager, "_generate_new_question_id", return_value=3):
+            self.exam_manager._add_question(1, 3)
+        _, questions = self.exam_manager.load_exam(1)
+        self.assertEqual([q.text for q in questions], ["First", "Second", "Third"])
+
+        with self.database_manager as db:
+            db.execute("UPDATE questions SET correct_answer = 1 WHERE question_id = 1")
+        regrade_exam(self.database_manager, 1, snapshots=self.exam_manager.snapshots)
+        _, questions = self.exam_manager.load_exam(1)
+        self.assertEqual(questions[0].correct_answer, 1)
+
+
+class TestExamSessions(ExamManagerTestCase):
+    def answer(self, question, q_num, total):
+        return Answer(100 + q_num, question.question_id, 0, question.is_correct(0), 1, "alice")
+
+    def test_interrupted_attempt_resumes_at_next_question(self):
+        def crash_on_second(question, q_num, total):
+            if q_num == 2:
+                raise KeyboardInterrupt
+            return self.answer(question, q_num, total)
+
+        with patch.object(self.exam_manager, "_present_question", crash_on_second):
+            with self.assertRaises(KeyboardInterrupt):
+                self.exam_manager.take_exam(1)
+
+        sessions = self.exam_manager.exam_sessions
+        session = sessions.find_open("alice", 1)
+        self.assertEqual(session.answered, 1)
+
+        with patch.object(self.exam_manager, "_present_question", side_effect=self.answer) as ask:
+            self.exam_manager.take_exam(1)
+        self.assertEqual([call.args[0].question_id for call in ask.call_args_list], [2])
+        self.assertIsNone(sessions.find_open("alice", 1))
+
+        self.exam_manager.answer_writer.flush()
+        with self.database_manager as db:
+            db.execute("SELECT question_id, session_id FROM answers ORDER BY question_id")
+            self.assertEqual(db.fetchall(), [(1, session.session_id), (2, session.session_id)])
+            db.execute("SELECT status, answered FROM exam_sessions")
+            self.assertEqual(db.fetchall(), [("completed", 2)])
+
+    def test_resume_includes_answers_the_writer_has_not_committed(self):
+        sessions = self.exam_manager.exam_sessions
+        writer = self.exam_manager.answer_writer
+        session = sessions.start("alice", 1)
+        release = threading.Event()
+        commit = writer._commit
+
+        def held_commit(rows):
+            release.wait(10)
+            commit(rows)
+
+        writer._commit = held_commit
+        try:
+            sessions.checkpoint(session, Answer(101, 1, 0, True, 1, "alice"))
+            resumed = sessions.find_open("alice", 1)
+            self.assertEqual(resumed.answered, 1)
+            self.assertEqual(list(sessions.answers(resumed)), [1])
+        finally:
+            release.set()
+
+    def test_concurrent_start_returns_the_open_attempt(self):
+        sessions = self.exam_manager.exam_sessions
+        first = sessions.start("alice", 1)
+        # The other login checked for an open attempt before this one existed
+        with patch.object(sessions, "find_open", side_effect=[None, first]):
+            second = sessions.start("alice", 1)
+        self.assertEqual(second.session_id, first.session_id)
+
+
+class TestResultsAnalytics(ExamManagerTestCase):
+    def take_exam(self, username, choices):
+        self.auth_manager.get_current_user.return_value.username = username
+
+        def answer(question, q_num, total):
+            choice = choices[q_num - 1]
+            return Answer(
+                self.exam_manager.id_allocator.next_id("answers"),
+                question.question_id, choice, question.is_correct(choice), 1, username,
+            )
+
+        with patch.object(self.exam_manager, "_present_question", side_effect=answer):
+            self.exam_manager.take_exam(1)
+
+    def test_completed_attempts_update_aggregates(self):
+        self.take_exam("alice", [0, 0])  # 1 of 2 points
+        self.take_exam("bob", [0, 2])  # 2 of 2 points
+        analytics = self.exam_manager.analytics
+
+        summary = analytics.exam_summary(1)
+        self.assertEqual((summary.attempts, summary.max_points), (2, 2))
+        self.assertAlmostEqual(summary.mean, 1.5)
+        self.assertAlmostEqual(summary.stdev, 0.5)
+        self.assertEqual(summary.histogram[5], 1)
+        self.assertEqual(summary.histogram[9], 1)
+
+        first, second = analytics.question_stats(1)
+        self.assertEqual((first.p_value, first.discrimination), (1.0, None))
+        self.assertEqual(second.p_value, 0.5)
+        self.assertAlmostEqual(second.discrimination, 1.0)
+
+        (alice,) = analytics.user_summary("alice")
+        self.assertEqual((alice.attempts, alice.best_score, alice.last_score), (1, 1, 1))
+
+    def test_attempt_is_counted_once_and_rebuild_matches(self):
+        self.take_exam("alice", [0, 0])
+        self.take_exam("alice", [0, 2])
+        sessions = self.exam_manager.exam_sessions
+        with self.database_manager as db:
+            db.execute("SELECT session_id, started_at FROM exam_sessions LIMIT 1")
+            session_id, started_at = db.fetchone()
+        attempt = ExamSession(session_id, "alice", 1, 2, started_at)
+        sessions.complete(attempt, self.exam_manager.get_exam_questions(1), [])
+
+        analytics = self.exam_manager.analytics
+        (alice,) = analytics.user_summary("alice")
+        self.assertEqual((alice.attempts, alice.best_score, alice.last_score), (2, 2, 2))
+
+        self.exam_manager.answer_writer.flush()
+        self.assertEqual(analytics.rebuild(), 2)
+        summary = analytics.exam_summary(1)
+        self.assertEqual((summary.attempts, summary.histogram[5], summary.histogram[9]), (2, 1, 1))
+        self.assertEqual([s.correct for s in analytics.question_stats(1)], [2, 1])
+
+    def test_export_results(self):
+        self.take_exam("alice", [0, 0])
+        self.take_exam("bob", [0, 2])
+        self.exam_manager.answer_writer.flush()
+
+        file = io.StringIO()
+        self.assertEqual(self.exam_manager.analytics.export_results(file, "csv"), 2)
+        rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+        self.assertEqual(
+            [(r["username"], r["score"], r["max_points"], r["percentage"]) for r in rows],
+            [("alice", "1", "2", "50.0"), ("bob", "2", "2", "100.0")],
+        )
+
+        file = io.StringIO()
+        self.exam_manager.analytics.export_results(file, "jsonl", exam_ids=[2])
+        self.assertEqual(file.getvalue(), "")
+
+    def test_results_are_paged_without_holding_a_connection(self):
+        for username in ("alice", "bob", "carol"):
+            self.take_exam(username, [0, 2])
+        self.exam_manager.answer_writer.flush()
+        self.database_manager.batch_size = 2
+
+        records = self.exam_manager.analytics.iter_results()
+        self.assertEqual(next(records)["username"], "alice")
+        # A consumer that stops early leaves no transaction open
+        self.assertIsNone(self.database_manager.pool.held())
+        self.assertEqual([r["username"] for r in records], ["bob", "carol"])
+
+    def test_regrade_updates_aggregates(self):
+        self.take_exam("alice", [0, 0])
+        self.exam_manager.answer_writer.flush()
+        with self.database_manager as db:
+            db.execute("UPDATE questions SET correct_answer = 0 WHERE question_id = 2")
+        regrade_exam(self.database_manager, 1)
+
+        analytics = self.exam_manager.analytics
+        self.assertEqual(analytics.exam_summary(1).histogram[9], 1)
+        self.assertEqual([s.correct for s in analytics.question_stats(1)], [1, 1])
+        (alice,) = analytics.user_summary("alice")
+        self.assertEqual(alice.best_score, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+import tempfile
+import unittest
+from src.exams import grading
+from src.exams.grading import UNANSWERED, AnswerKey, grade, regrade_exam
+from src.exams.results_analytics import ResultsAnalytics
+from src.storage.database_manager import DatabaseManager
+from src.utils.database_setup import apply_migrations
+
+RESPONSES = [
+    [0, 1, 2],
+    [0, 0, UNANSWERED],
+    [3, 1, 2],
+]
+
+
+class TestGrading(unittest.TestCase):
+    def setUp(self):
+        self.key = AnswerKey([10, 11, 12], [0, 1, 2], [1, 2, 3])
+
+    def check_report(self, report):
+        self.assertEqual(report.correct_counts, [3, 1, 2])
+        self.assertEqual(report.earned_points, [6, 1, 5])
+        self.assertEqual(report.total_points, 6)
+        self.assertAlmostEqual(report.percentages[2], 5 / 6 * 100)
+
+    def test_pure_python_grader(self):
+        self.check_report(grade(self.key, RESPONSES, use_numpy=False))
+
+    @unittest.skipIf(grading._numpy() is None, "NumPy is not installed")
+    def test_numpy_grader_matches_pure_python(self):
+        report = grade(self.key, RESPONSES)
+        self.check_report(report)
+        self.assertEqual(report.correct.tolist(), grade(self.key, RESPONSES, use_numpy=False).correct)
+
+    def test_empty_key_scores_zero(self):
+        report = grade(AnswerKey([], [], []), [[]])
+        self.assertEqual(report.percentages, [0.0])
+
+    def test_position_lookup(self):
+        self.assertEqual(self.key.position(12), 2)
+        self.assertIsNone(self.key.position(99))
+
+
+
+class TestRegradeExam(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(db_path)
+        apply_migrations(conn)
+        conn.execute("INSERT INTO exams VALUES (1, 'Exam', '2026-01-01', 30, 2, 'admin')")
+        conn.executemany(
+            "INSERT INTO questions (question_id, text, options, correct_answer, points, exam_id) "
+            "VALUES (?, 'Q', '[\"a\", \"b\"]', ?, 1, 1)",
+            [(1, 0), (2, 1)],
+        )
+        conn.executemany(
+            "INSERT INTO exam_sessions VALUES (?, 'alice', 1, 'completed', 2, 0, 0)", [(1,), (2,)]
+        )
+        # (answer_id, question_id, user_answer, user_id, minute, session_id)
+        answers = [
+            (1, 1, 0, "alice", 1, 1), (2, 2, 0, "alice", 2, 1),
+            (3, 1, 0, "alice", 3, 2), (4, 2, 1, "alice", 4, 2),
+            # Before sessions: bob took the exam twice
+            (5, 1, 1, "bob", 5, None), (6, 2, 1, "bob", 6, None),
+            (7, 1, 0, "bob", 7, None), (8, 2, 1, "bob", 8, None),
+        ]
+        conn.executemany(
+            "INSERT INTO answers VALUES (?, ?, ?, 0, 1, ?, '2026-01-01T10:0' || ? || ':00', ?)",
+            answers,
+        )
+        conn.commit()
+        conn.close()
+        self.database_manager = DatabaseManager(database_path=db_path)
+
+    def tearDown(self):
+        self.database_manager.close()
+        self.tmpdir.cleanup()
+
+    def test_attempts_are_graded_separately(self):
+        users, report, changed = regrade_exam(self.database_manager, 1)
+        self.assertEqual(users, ["alice", "alice", "bob", "bob"])
+        self.assertEqual(report.earned_points, [1, 2, 1, 2])
+        self.assertEqual(changed, 6)
+
+    def test_aggregates_count_the_same_attempts(self):
+        users, report, _ = regrade_exam(self.database_manager, 1)
+        analytics = ResultsAnalytics(self.database_manager)
+        summary = analytics.exam_summary(1)
+        self.assertEqual(summary.attempts, len(users))
+        self.assertAlmostEqual(summary.mean, sum(report.earned_points) / len(users))
+        (bob,) = analytics.user_summary("bob")
+        self.assertEqual((bob.attempts, bob.best_score, bob.last_score), (2, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.storage.database_manager import DatabaseManager
+from src.storage.id_allocator import IdAllocator
+from src.utils.database_setup import apply_migrations
+
+
+class TestIdAllocator(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        conn.close()
+        self.managers = []
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.close()
+        self.tmpdir.cleanup()
+
+    def make_allocator(self, block_size=10):
+        manager = DatabaseManager(database_path=self.db_path)
+        self.managers.append(manager)
+        return IdAllocator(manager, block_size=block_size)
+
+    def test_ids_increase_within_and_across_blocks(self):
+        allocator = self.make_allocator(block_size=3)
+        self.assertEqual([allocator.next_id("answers") for _ in range(7)], list(range(1, 8)))
+
+    def test_separate_allocators_never_overlap(self):
+        first, second = self.make_allocator(), self.make_allocator()
+        ids = []
+
+        def draw(allocator):
+            for _ in range(50):
+                ids.append(allocator.next_id("questions"))
+
+        threads = [threading.Thread(target=draw, args=(a,)) for a in (first, second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(ids)), 100)
+
+    def test_unknown_sequence(self):
+        with self.assertRaises(KeyError):
+            self.make_allocator().next_id("nope")
+
+    def test_reserving_inside_a_transaction_is_refused(self):
+        allocator = self.make_allocator()
+        with allocator.database_manager:
+            with self.assertRaises(RuntimeError):
+                allocator.next_id("answers")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+import tempfile
+import unittest
+from src.exams.grading import regrade_exam
+from src.exams.item_analysis import analyze_exam, analyze_exams
+from src.storage.database_manager import DatabaseManager
+from src.utils.database_setup import apply_migrations
+
+# Rows of user_answer per attempt; the key is [0, 1, 2, 0]
+RESPONSES = [
+    [0, 1, 2, 0],
+    [0, 1, 2, 1],
+    [0, 1, 0, 1],
+    [0, 2, 0, 2],
+    [1, 2, 0, 2],
+]
+KEY = [0, 1, 2, 0]
+
+
+class TestItemAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        for exam_id in (1, 2):
+            conn.execute(
+                "INSERT INTO exams VALUES (?, 'Exam', '2026-01-01', 30, 4, 'admin')", (exam_id,)
+            )
+            conn.executemany(
+                "INSERT INTO questions "
+                "(question_id, text, options, options_packed, correct_answer, points, exam_id) "
+                "VALUES (?, 'Q', '[\"a\", \"b\", \"c\"]', 'a\x1fb\x1fc', ?, 1, ?)",
+                [(exam_id * 10 + q, KEY[q], exam_id) for q in range(4)],
+            )
+        answer_id = 0
+        for exam_id in (1, 2):
+            for student, row in enumerate(RESPONSES):
+                # Even students answered through a completed session, odd ones before sessions
+                session_id = exam_id * 100 + student if student % 2 == 0 else None
+                if session_id:
+                    conn.execute(
+                        "INSERT INTO exam_sessions VALUES (?, ?, ?, 'completed', 4, 0, 0)",
+                        (session_id, f"s{student}", exam_id),
+                    )
+                for q, choice in enumerate(row):
+                    answer_id += 1
+                    conn.execute(
+                        "INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, '2026-01-01T00:00:00', ?)",
+                        (
+                            answer_id, exam_id * 10 + q, choice, choice == KEY[q],
+                            exam_id, f"s{student}", session_id,
+                        ),
+                    )
+        # An abandoned attempt is not counted
+        conn.execute("INSERT INTO exam_sessions VALUES (999, 'quitter', 1, 'abandoned', 1, 0, 0)")
+        conn.execute(
+            "INSERT INTO answers VALUES (9999, 10, 2, 0, 1, 'quitter', '2026-01-01T00:00:00', 999)"
+        )
+        conn.commit()
+        conn.close()
+        self.database_manager = DatabaseManager(database_path=self.db_path)
+
+    def tearDown(self):
+        self.database_manager.close()
+        self.tmpdir.cleanup()
+
+    def test_statistics(self):
+        report = analyze_exam(self.database_manager, 1, chunk_size=3)
+        self.assertEqual(report.attempts, 5)
+        self.assertEqual([item.p_value for item in report.items], [0.8, 0.6, 0.4, 0.2])
+        self.assertEqual(report.items[1].distractors, [0, 3, 2])
+        self.assertEqual(report.items[0].omitted, 0)
+
+        # KR-20 and point-biserial computed directly from the response matrix
+        scores = [sum(c == k for c, k in zip(row, KEY)) for row in RESPONSES]
+        mean = sum(scores) / len(scores)
+        variance = sum((s - mean) ** 2 for s in scores) / len(scores)
+        pq = sum(p * (1 - p) for p in (0.8, 0.6, 0.4, 0.2))
+        self.assertAlmostEqual(report.kr20, 4 / 3 * (1 - pq / variance))
+
+        right = [s for s, row in zip(scores, RESPONSES) if row[0] == KEY[0]]
+        wrong = [s for s, row in zip(scores, RESPONSES) if row[0] != KEY[0]]
+        expected = (
+            (sum(right) / len(right) - sum(wrong) / len(wrong))
+            / variance ** 0.5 * (0.8 * 0.2) ** 0.5
+        )
+        self.assertAlmostEqual(report.items[0].point_biserial, expected)
+
+    def test_repeated_legacy_answers_are_a_new_attempt(self):
+        # s1 answered before sessions existed and later took the exam again
+        with self.database_manager as db:
+            db.executemany(
+                "INSERT INTO answers VALUES (?, ?, ?, ?, 1, 's1', '2026-01-02T00:00:00', NULL)",
+                [(5000 + q, 10 + q, KEY[q], 1) for q in range(4)],
+            )
+        report = analyze_exam(self.database_manager, 1, chunk_size=2)
+        self.assertEqual(report.attempts, 6)
+        self.assertEqual(report.attempts, len(regrade_exam(self.database_manager, 1)[0]))
+
+    def test_chunk_size_and_workers_do_not_change_results(self):
+        baseline = analyze_exam(self.database_manager, 1, chunk_size=1000).to_dict()
+        self.assertEqual(analyze_exam(self.database_manager, 1, chunk_size=1).to_dict(), baseline)
+
+        reports = list(analyze_exams(self.database_manager, [1, 2], workers=2))
+        self.assertEqual([r.exam_id for r in reports], [1, 2])
+        self.assertEqual(reports[0].to_dict(), baseline)
+        self.assertEqual(reports[1].to_dict()["items"][0]["p_value"], 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+from datetime import datetime
+from src.exams.answer import Answer
+from src.exams.answer_batch import AnswerBatch
+from src.exams.question import Question
+
+
+class TestSlottedModels(unittest.TestCase):
+    def test_models_have_no_instance_dict(self):
+        question = Question(1, "What?", ["a", "b"], 0, exam_id=1)
+        with self.assertRaises(AttributeError):
+            question.__dict__
+
+    def test_answer_timestamp_is_built_lazily(self):
+        answer = Answer(1, 2, 0, True, 3, "alice", timestamp=0.0)
+        self.assertEqual(answer.epoch, 0.0)
+        self.assertEqual(answer.timestamp, datetime.fromtimestamp(0.0))
+
+    def test_answer_dict_round_trip(self):
+        answer = Answer(1, 2, 0, True, 3, "alice", timestamp=datetime(2025, 5, 9, 12, 0))
+        data = answer.to_dict()
+        self.assertEqual(data["timestamp"], "2025-05-09T12:00:00")
+        self.assertEqual(Answer.from_dict(data).to_dict(), data)
+
+
+class TestAnswerBatch(unittest.TestCase):
+    def setUp(self):
+        self.answers = [
+            Answer(1, 10, 0, True, 5, "alice", timestamp=1.0),
+            Answer(2, 11, 3, False, 5, "alice", timestamp=2.0),
+            Answer(3, 10, 1, False, 5, "bob", timestamp=3.0),
+        ]
+        self.batch = AnswerBatch(self.answers)
+
+    def test_columns_and_interned_users(self):
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(self.batch.users, ["alice", "bob"])
+        self.assertEqual(self.batch.correct_count(), 1)
+
+    def test_rows_read_back_as_answers(self):
+        self.assertEqual(
+            [a.to_dict() for a in self.batch], [a.to_dict() for a in self.answers]
+        )
+
+    def test_dict_round_trip(self):
+        data = self.batch.to_dict()
+        self.assertEqual(AnswerBatch.from_dict(data).to_dict(), data)
+
+    def test_rows_are_grouped_into_attempts(self):
+        batch = AnswerBatch()
+        batch.add_rows([
+            (1, 10, 0, True, 5, "alice", "2026-01-01T10:00:00", 7),
+            (2, 10, 1, False, 5, "bob", "2026-01-01T10:01:00", None),
+            (3, 11, 0, True, 5, "alice", "2026-01-01T10:02:00", 7),
+            (4, 10, 0, True, 5, "bob", "2026-01-01T10:03:00", None),
+            (5, 12, 0, True, 5, "bob", "2026-01-01T10:04:00", None),
+        ])
+        self.assertEqual(batch[0].session_id, 7)
+        self.assertIsNone(batch[1].session_id)
+        # bob answering question 10 again starts his second attempt
+        attempt_of, first_rows = batch.attempts()
+        self.assertEqual((attempt_of.tolist(), first_rows), ([0, 1, 0, 2, 2], [0, 1, 3]))
+        attempt_of, first_rows = batch.attempts([True, True, True, False, True])
+        self.assertEqual((attempt_of.tolist(), first_rows), ([0, 1, 0, -1, 1], [0, 1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,18 +3,40 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import logging
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 from src.interface.navigation import Navigation
+from src.utils.config import CONFIG_PATH, Config, set_config
+from src.utils.logger import Logger
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 
 class TestNavigation(unittest.TestCase):
     def setUp(self):
+        # Keep logs and the database out of the working tree
+        self.tmpdir = tempfile.TemporaryDirectory()
+        set_config(Config.load(os.path.join(ROOT, CONFIG_PATH), environ={
+            "PYEXAM_LOGGING__DIRECTORY": self.tmpdir.name,
+            "PYEXAM_DATABASE__PATH": os.path.join(self.tmpdir.name, "test.db"),
+            "PYEXAM_SNAPSHOTS__PATH": self.tmpdir.name,
+            "PYEXAM_ANSWER_WRITER__SPOOL_PATH": os.path.join(self.tmpdir.name, "answers.spool"),
+        }))
+        Logger._instance = None
         self.navigation = Navigation()
         self.navigation.ui = MagicMock()
         self.navigation.input_handler = MagicMock()
         self.navigation.auth = MagicMock()
 
+    def tearDown(self):
+        for handler in logging.getLogger("pyexam").handlers:
+            handler.close()
+        Logger._instance = None
+        set_config(None)
+        self.tmpdir.cleanup()
+
     def test_exit_calls_show_exit_message_and_quit(self):
         with patch("builtins.quit") as mock_quit:
             self.navigation.exit()
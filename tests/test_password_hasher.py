@@ -0,0 +1,81 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import hashlib
+import unittest
+from unittest.mock import MagicMock
+from src.auth.auth_manager import AuthManager
+from src.auth.password_hasher import PasswordHasher
+from src.user.user import User
+
+LEGACY_HASH = hashlib.sha256(b"secret").hexdigest()
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher("scrypt", cost=10, workers=2)
+
+    def tearDown(self):
+        self.hasher.shutdown()
+
+    def test_hash_is_salted_and_verifies(self):
+        first, second = self.hasher.hash("secret"), self.hasher.hash("secret")
+        self.assertNotEqual(first, second)
+        self.assertTrue(self.hasher.verify("secret", first))
+        self.assertFalse(self.hasher.verify("wrong", first))
+        self.assertFalse(self.hasher.needs_rehash(first))
+
+    def test_legacy_sha256_is_accepted_but_needs_rehash(self):
+        self.assertTrue(self.hasher.verify("secret", LEGACY_HASH))
+        self.assertTrue(self.hasher.needs_rehash(LEGACY_HASH))
+
+    def test_cost_change_needs_rehash(self):
+        pbkdf2 = PasswordHasher("pbkdf2_sha256", cost=1000, workers=1)
+        stored = pbkdf2.hash("secret")
+        pbkdf2.shutdown()
+        self.assertTrue(self.hasher.verify("secret", stored))
+        self.assertTrue(self.hasher.needs_rehash(stored))
+
+    def test_malformed_stored_hash_fails_verification(self):
+        for stored in (
+            "scrypt$ten$00ff$00ff",
+            "scrypt$10$not-hex$00ff",
+            "scrypt$99999$00ff$00ff",
+            "pbkdf2_sha256$0$00ff$00ff",
+            "legacy-hash-é",
+        ):
+            with self.subTest(stored=stored):
+                self.assertFalse(self.hasher.verify("secret", stored))
+
+
+class TestLoginUpgradesHash(unittest.TestCase):
+    def test_legacy_hash_is_replaced_on_login(self):
+        hasher = PasswordHasher("scrypt", cost=10, workers=1)
+        user_manager = MagicMock()
+        user_manager.get_user.return_value = User("alice", LEGACY_HASH)
+        auth_manager = AuthManager(MagicMock(), user_manager, MagicMock(), hasher)
+
+        self.assertTrue(auth_manager.login("alice", "secret"))
+        new_hash = user_manager.update_user.call_args.kwargs["password"]
+        self.assertTrue(new_hash.startswith("scrypt$10$"))
+        self.assertTrue(hasher.verify("secret", new_hash))
+        hasher.shutdown()
+
+    def test_password_changed_elsewhere_takes_effect_at_once(self):
+        hasher = PasswordHasher("scrypt", cost=10, workers=1)
+        user_manager = MagicMock()
+        user_manager.get_user.return_value = User("alice", hasher.hash("old"))
+        auth_manager = AuthManager(MagicMock(), user_manager, MagicMock(), hasher)
+        self.assertTrue(auth_manager.login("alice", "old"))
+
+        # Changed by another process, so this one's user cache was not told
+        user_manager.get_user.return_value = User("alice", hasher.hash("new"))
+        self.assertFalse(auth_manager.login("alice", "old"))
+        self.assertTrue(auth_manager.login("alice", "new"))
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
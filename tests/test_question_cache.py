@@ -0,0 +1,63 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+from unittest.mock import patch
+from src.exams.question import Question
+from src.exams.question_cache import QuestionCache
+
+
+def make_questions(exam_id, count=3):
+    return [
+        Question(i, f"Question {i}", ["a", "b", "c", "d"], 0, exam_id=exam_id)
+        for i in range(count)
+    ]
+
+
+class TestQuestionCache(unittest.TestCase):
+    def test_hit_and_miss_are_counted(self):
+        cache = QuestionCache()
+        self.assertIsNone(cache.get(1))
+        cache.put(1, make_questions(1))
+        self.assertEqual(len(cache.get(1)), 3)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = QuestionCache(max_entries=2)
+        cache.put(1, make_questions(1))
+        cache.put(2, make_questions(2))
+        cache.get(1)
+        cache.put(3, make_questions(3))
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(1))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_byte_limit_evicts(self):
+        one_exam = QuestionCache._estimate_size(make_questions(1))
+        cache = QuestionCache(max_bytes=one_exam * 2 - 1)
+        cache.put(1, make_questions(1))
+        cache.put(2, make_questions(2))
+        self.assertIsNone(cache.get(1))
+        self.assertLessEqual(cache.stats()["bytes"], cache.max_bytes)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = QuestionCache(ttl=10)
+        with patch("src.exams.question_cache.time.monotonic", return_value=100):
+            cache.put(1, make_questions(1))
+        with patch("src.exams.question_cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_invalidate(self):
+        cache = QuestionCache()
+        cache.put(1, make_questions(1))
+        cache.invalidate(1)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
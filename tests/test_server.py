@@ -0,0 +1,147 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import tempfile
+import unittest
+from src.auth.password_hasher import PasswordHasher
+from src.interface.server import MAX_LINE, Engine, ExamServer
+from src.storage.database_manager import DatabaseManager
+from src.utils.config import CONFIG_PATH, Config, set_config
+from src.utils.database_setup import apply_migrations
+from src.utils.logger import Logger
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestExamServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, "test.db")
+        hasher = PasswordHasher("scrypt", cost=4, workers=2)
+        conn = sqlite3.connect(db_path)
+        apply_migrations(conn)
+        conn.executemany(
+            "INSERT INTO users VALUES (?, ?, 'student')",
+            [(f"user{i}", hasher.hash("secret")) for i in range(3)],
+        )
+        conn.execute("INSERT INTO exams VALUES (1, 'Exam', '2025-05-01', 60, 2, 'admin')")
+        conn.executemany(
+            "INSERT INTO questions (question_id, text, options, correct_answer, points, exam_id) "
+            "VALUES (?, ?, '[\"a\", \"b\"]', ?, 1, 1)",
+            [(1, "First", 0), (2, "Second", 1)],
+        )
+        conn.commit()
+        conn.close()
+
+        # Keep logs and any default-path data out of the working tree
+        set_config(Config.load(os.path.join(ROOT, CONFIG_PATH), environ={
+            "PYEXAM_LOGGING__DIRECTORY": self.tmpdir.name,
+            "PYEXAM_DATABASE__PATH": db_path,
+            "PYEXAM_SNAPSHOTS__PATH": self.tmpdir.name,
+            "PYEXAM_ANSWER_WRITER__SPOOL_PATH": os.path.join(self.tmpdir.name, "answers.spool"),
+        }))
+        Logger._instance = None
+        self.engine = Engine(DatabaseManager(database_path=db_path), hasher)
+        self.server = await ExamServer(self.engine).start(
+            unix=os.path.join(self.tmpdir.name, "server.sock")
+        )
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.engine.close()
+        for handler in logging.getLogger("pyexam").handlers:
+            handler.close()
+        Logger._instance = None
+        set_config(None)
+        self.tmpdir.cleanup()
+
+    async def client(self):
+        reader, writer = await asyncio.open_unix_connection(
+            os.path.join(self.tmpdir.name, "server.sock")
+        )
+
+        async def request(op, **fields):
+            writer.write(json.dumps({"op": op, **fields}).encode() + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        return request, writer
+
+    async def take_exam(self, username):
+        request, writer = await self.client()
+        self.assertFalse((await request("exams"))["ok"])
+        self.assertTrue((await request("login", username=username, password="secret"))["ok"])
+        self.assertEqual([e["exam_id"] for e in (await request("exams"))["exams"]], [1])
+        response = await request("start", exam_id=1)
+        self.assertEqual(response["question"]["text"], "First")
+        self.assertFalse((await request("answer", choice=9))["ok"])
+        await request("answer", choice=1)
+        result = (await request("answer", choice=1))["result"]
+        await request("quit")
+        writer.close()
+        return result
+
+    async def test_concurrent_clients_share_one_engine(self):
+        results = await asyncio.gather(*(self.take_exam(f"user{i}") for i in range(3)))
+        self.assertEqual([r["correct"] for r in results], [1, 1, 1])
+
+        self.engine.exam_manager.answer_writer.flush()
+        with self.engine.database_manager as db:
+            db.execute("SELECT COUNT(*) FROM answers")
+            self.assertEqual(db.fetchone()[0], 6)
+            db.execute("SELECT DISTINCT status FROM exam_sessions")
+            self.assertEqual(db.fetchall(), [("completed",)])
+
+    async def test_bad_requests_get_errors(self):
+        request, writer = await self.client()
+        self.assertEqual(await request("nope"), {"ok": False, "error": "Unknown op: 'nope'"})
+        response = await request("login", username="user0", password="wrong")
+        self.assertFalse(response["ok"])
+        self.assertTrue((await request("login", username="user0", password="secret"))["ok"])
+        self.assertEqual(
+            await request("exams", after_id=None),
+            {"ok": False, "error": "after_id must be an exam ID"},
+        )
+        self.assertEqual(
+            await request("start", exam_id=[1]),
+            {"ok": False, "error": "exam_id must be an exam ID"},
+        )
+        writer.close()
+
+    async def test_oversized_request_is_refused(self):
+        reader, writer = await asyncio.open_unix_connection(
+            os.path.join(self.tmpdir.name, "server.sock")
+        )
+        writer.write(b'{"op": "login", "username": "' + b"x" * (MAX_LINE + 1) + b'"}\n')
+        await writer.drain()
+        self.assertEqual(
+            json.loads(await reader.readline()), {"ok": False, "error": "Request too long"}
+        )
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+
+    async def test_login_upgrades_legacy_hashes(self):
+        with self.engine.database_manager as db:
+            db.execute(
+                "UPDATE users SET password = ? WHERE username = 'user0'",
+                (hashlib.sha256(b"secret").hexdigest(),),
+            )
+        request, writer = await self.client()
+        self.assertTrue((await request("login", username="user0", password="secret"))["ok"])
+        self.assertTrue((await request("logout"))["ok"])
+        writer.close()
+        with self.engine.database_manager as db:
+            db.execute("SELECT password FROM users WHERE username = 'user0'")
+            self.assertTrue(db.fetchone()[0].startswith("scrypt$4$"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from src.auth.session_manager import SessionManager
+from src.storage.database_manager import DatabaseManager
+from src.user.user_manager import UserManager
+from src.utils.database_setup import apply_migrations
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        conn.execute("INSERT INTO users VALUES ('alice', 'hash', 'admin')")
+        conn.commit()
+        conn.close()
+
+        self.database_manager = DatabaseManager(database_path=self.db_path)
+        self.user_manager = UserManager(MagicMock(), self.database_manager, MagicMock())
+        self.sessions = SessionManager(self.user_manager, self.database_manager)
+
+    def tearDown(self):
+        self.database_manager.close()
+        self.tmpdir.cleanup()
+
+    def test_cached_user_skips_database(self):
+        self.sessions.get_user("alice")
+        with patch.object(self.user_manager, "get_user") as get_user:
+            self.assertEqual(self.sessions.get_user("alice").role, "admin")
+            get_user.assert_not_called()
+
+    def test_update_user_invalidates_cache(self):
+        session = self.sessions.create(self.sessions.get_user("alice"))
+        self.user_manager.update_user("alice", role="student")
+        self.assertEqual(self.sessions.user_for(session.token).role, "student")
+
+    def test_delete_user_revokes_sessions(self):
+        session = self.sessions.create(self.sessions.get_user("alice"))
+        self.user_manager.delete_user("alice")
+        self.assertIsNone(self.sessions.get(session.token))
+        self.assertIsNone(self.sessions.resume(session.token))
+
+    def test_session_survives_restart(self):
+        session = self.sessions.create(self.sessions.get_user("alice"))
+        restarted = SessionManager(self.user_manager, self.database_manager)
+        self.assertEqual(restarted.resume(session.token).username, "alice")
+        self.assertIsNone(restarted.resume("not-a-token"))
+
+    def test_expired_session_is_rejected(self):
+        session = self.sessions.create(self.sessions.get_user("alice"))
+        with patch("src.auth.session_manager.time.time", return_value=session.expires_at):
+            self.assertIsNone(self.sessions.get(session.token))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import subprocess
+import unittest
+from src.interface.navigation import Navigation
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Nothing of these may load before the first menu is drawn
+DEFERRED = ("rich", "numpy", "src.exams.exam_manager", "src.exams.answer_writer")
+
+
+def import_times() -> dict[str, int]:
+    """Modules imported to build a Navigation, with their -X importtime cumulative times."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from src.interface.navigation import Navigation; Navigation()",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    def test_heavy_modules_are_deferred(self):
+        loaded = [
+            name
+            for name in import_times()
+            if any(name == d or name.startswith(d + ".") for d in DEFERRED)
+        ]
+        self.assertEqual(loaded, [])
+
+    def test_managers_are_built_on_first_use(self):
+        navigation = Navigation()
+        self.assertEqual(vars(navigation), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
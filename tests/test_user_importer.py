@@ -0,0 +1,90 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sqlite3
+import tempfile
+import unittest
+from src.auth.password_hasher import PasswordHasher
+from src.storage.database_manager import DatabaseManager
+from src.user.user_importer import UserImporter
+from src.utils.database_setup import apply_migrations
+
+
+class TestUserImporter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        conn = sqlite3.connect(self.db_path)
+        apply_migrations(conn)
+        conn.execute("INSERT INTO users VALUES ('admin', 'hash', 'admin')")
+        conn.commit()
+        conn.close()
+        self.database_manager = DatabaseManager(database_path=self.db_path)
+        self.hasher = PasswordHasher("scrypt", cost=4, workers=2)
+        self.importer = UserImporter(self.database_manager, self.hasher, chunk_size=2)
+
+    def tearDown(self):
+        self.hasher.shutdown()
+        self.database_manager.close()
+        self.tmpdir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def stored_users(self):
+        with self.database_manager as db:
+            db.execute("SELECT username, password, role FROM users ORDER BY username")
+            return db.fetchall()
+
+    def test_csv_import_reports_duplicates_and_invalid_rows(self):
+        path = self.write(
+            "users.csv",
+            "username,password,role\n"
+            "alice,pw1,student\n"
+            "admin,pw2,admin\n"
+            "bob,pw3,\n"
+            "alice,pw4,student\n"
+            "carol,,student\n"
+            "dave,pw5,teacher\n",
+        )
+        report = self.importer.import_file(path, show_progress=False)
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(sorted(report.duplicates), ["admin", "alice"])
+        self.assertEqual([row for row, _ in report.invalid], [5, 6])
+
+        users = {name: (password, role) for name, password, role in self.stored_users()}
+        self.assertEqual(users["bob"][1], "student")
+        self.assertTrue(self.hasher.verify("pw1", users["alice"][0]))
+
+    def test_jsonl_import(self):
+        path = self.write(
+            "users.jsonl",
+            '{"username": "erin", "password": "pw"}\n\n'
+            '{"username": "frank", "password": "pw", "role": "admin"}\n',
+        )
+        report = self.importer.import_file(path, show_progress=False)
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(len(self.stored_users()), 3)
+
+    def test_unreadable_jsonl_rows_do_not_abort_the_import(self):
+        path = self.write(
+            "users.jsonl",
+            '{"username": "gina", "password": "pw"}\n'
+            '{"username": "hal", "pass\n'
+            '["ivan", "pw"]\n'
+            '{"username": 7, "password": "pw"}\n'
+            '{"username": "judy", "password": "pw"}\n',
+        )
+        report = self.importer.import_file(path, show_progress=False)
+        self.assertEqual(report.imported, 2)
+        self.assertEqual([row for row, _ in report.invalid], [2, 3, 4])
+        self.assertTrue(report.invalid[0][1].startswith("line 2: invalid JSON"))
+
+
+if __name__ == "__main__":
+    unittest.main()